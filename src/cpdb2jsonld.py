@@ -1,20 +1,86 @@
 from __future__ import annotations
 
+import copy
 import gzip
+import hashlib
+import io
 import json
 import os
 import shutil
-from concurrent.futures import ThreadPoolExecutor
-from typing import Any
+import time
+from collections import deque
+from contextlib import ExitStack, nullcontext
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from dataclasses import replace
+from functools import partial
+from itertools import chain, islice
+from typing import IO, Any, Callable, Iterable, Iterator
 
 import requests
 import settings
 import typer
 from pyld import jsonld
+from requests.adapters import HTTPAdapter
+from rich.progress import TaskID
 from typing_extensions import Annotated
-from utils.custom_exception import JsonldConversionResultTypeException
+from utils.custom_exception import (
+    JsonldConversionResultTypeException,
+    UnsupportedJsonldContextException,
+    UnsupportedJsonldValueException,
+)
+from utils.checkpoint import (
+    ConversionCheckpoint,
+    load_checkpoint,
+    save_checkpoint,
+)
+from utils.compressed_file import (
+    GZIP_MAGIC_NUMBER,
+    check_compression,
+    compressed_file_path,
+    open_compressed_output_file,
+    open_compressed_text_stream,
+    strip_compression_extension,
+)
+from utils.column_parser import (
+    ColumnParser,
+    ColumnSchema,
+    infer_column_type,
+    load_column_mapper,
+)
+from utils.conversion_plan import ConversionPlan
+from utils.download_cache import DownloadMetadataCache
+from utils.incremental_index import IncrementalIndex, row_fingerprint
+from utils.json_serializer import JsonSerializer, create_json_serializer
+from utils.jsonld_emitter import JsonldEmitter
+from utils.jsonld_shard_writer import (
+    JsonldShardWriter,
+    check_jsonld_format,
+    graph_item_str,
+)
+from utils.prefetch_reader import PrefetchReader
+from utils.rdf_serializer import (
+    OUTPUT_FORMAT_EXTENSIONS,
+    RdfLiteral,
+    RdfTerm,
+    check_output_format,
+    nquad_lines_str,
+)
 from utils.rich_loguru import _log_formatter, console, logger
 from utils.rich_progress import RichProgress
+from utils.shard_manifest import ShardManifest, read_shard_paths
+from utils.shard_writer import TextShardWriter
+from utils.table_writer import (
+    TABLE_FORMAT_EXTENSIONS,
+    InteractionTableWriter,
+    check_table_format,
+)
+from utils.tsv_partition import iter_byte_ranges, read_byte_range
+from utils.turtle_serializer import TurtleSerializer, context_prefixes
 
 logger.remove()
 
@@ -37,7 +103,6 @@ else:
 
 logger.add(settings.ERROR_LOG_FILE_PATH, level="ERROR")
 
-
 # typer
 app = typer.Typer()
 
@@ -65,6 +130,128 @@ def exec_flow(
     skip_download: Annotated[
         bool, typer.Option(help="If specified, TSV downloading is skipped.")
     ] = False,
+    decompress: Annotated[
+        bool,
+        typer.Option(
+            help="If --no-decompress is specified, the downloaded gzip files "
+            + "are converted directly without writing decompressed TSV files."
+        ),
+    ] = True,
+    use_pyld: Annotated[
+        bool,
+        typer.Option(
+            help="If specified, each row is converted with pyld "
+            + "expand/compact (reference implementation)."
+        ),
+    ] = False,
+    workers: Annotated[
+        int,
+        typer.Option(
+            help="Number of worker processes used for conversion. "
+            + "If 1, rows are converted in the main process."
+        ),
+    ] = 1,
+    chunk_size: Annotated[
+        int,
+        typer.Option(help="Number of rows converted together as one task."),
+    ] = settings.CHUNK_SIZE,
+    mmap: Annotated[
+        bool,
+        typer.Option(
+            help="If specified, the input TSV is memory-mapped and split into "
+            + "byte ranges that are read directly by each worker."
+        ),
+    ] = False,
+    chunk_bytes: Annotated[
+        int,
+        typer.Option(
+            help="Size in bytes of each byte range when --mmap is used, "
+            + "and the maximum size of each block of rows otherwise."
+        ),
+    ] = settings.CHUNK_BYTES,
+    stream: Annotated[
+        bool,
+        typer.Option(
+            help="If specified, each TSV file is converted while it is "
+            + "downloaded, without writing it to disk."
+        ),
+    ] = False,
+    max_downloads: Annotated[
+        int,
+        typer.Option(help="Maximum number of files downloaded concurrently."),
+    ] = settings.MAX_CONCURRENT_DOWNLOADS,
+    parallel_files: Annotated[
+        bool,
+        typer.Option(
+            help="If specified, the downloaded files are converted "
+            + "concurrently, sharing the --workers processes in proportion "
+            + "to their sizes. Up to --workers files are converted at a time."
+        ),
+    ] = False,
+    force_download: Annotated[
+        bool,
+        typer.Option(
+            help="If specified, files are downloaded even if they are "
+            + "unchanged since the last download."
+        ),
+    ] = False,
+    download_segments: Annotated[
+        int,
+        typer.Option(
+            help="Number of byte ranges each large file is downloaded as "
+            + "in parallel."
+        ),
+    ] = 1,
+    incremental: Annotated[
+        bool,
+        typer.Option(
+            help="If specified, only the rows that changed since the previous "
+            + "conversion are converted, and the other lines are reused."
+        ),
+    ] = False,
+    compression: Annotated[
+        str,
+        typer.Option(
+            help="Compression format of the output files: "
+            + "none, gzip or zstd."
+        ),
+    ] = "none",
+    jsonld_format: Annotated[
+        str,
+        typer.Option(
+            help="Format of the JSON-LD files: indented or compact "
+            + "(without indentation and whitespace)."
+        ),
+    ] = "indented",
+    output_format: Annotated[
+        str,
+        typer.Option(
+            help="Format of the output files: jsonl, ntriples, nquads "
+            + "(one named graph per data source) or turtle."
+        ),
+    ] = "jsonl",
+    max_file_size: Annotated[
+        int,
+        typer.Option(
+            help="If greater than 0, each output is split into files of "
+            + "at most this size in bytes, named <name>_001<ext> and so on."
+        ),
+    ] = 0,
+    table_output: Annotated[
+        str,
+        typer.Option(
+            help="If parquet or arrow, the interactions are also written as "
+            + "a table in Parquet or Arrow IPC format, in the same pass."
+        ),
+    ] = "none",
+    manifest: Annotated[
+        bool,
+        typer.Option(
+            help="If specified with --max-file-size, a manifest listing "
+            + "the path, size, number of records and SHA-256 checksum "
+            + "of each file is written as <name>.manifest.json."
+        ),
+    ] = False,
 ):
     """Reads a list of specified URLs, downloads TSV files,
     and converts them to JSONL or JSON-LD.
@@ -77,44 +264,397 @@ def exec_flow(
     """
     logger.info("Start flow execution...")
 
+    check_output_format(output_format)
+
+    # 出力ファイルの拡張子は出力形式に合わせる
+    output_extension = OUTPUT_FORMAT_EXTENSIONS[output_format]
+
     with open(input_urls_file) as f:
         urls = f.read().split()
 
     logger.info(f"Number of targets: {len(urls)} files")
 
-    for url in urls:
-        tsv_file_path = tsv_download(url, output_dir, skip_download)
-
-        output_file_path = os.path.join(
-            output_dir,
-            f"{os.path.splitext(os.path.basename(tsv_file_path))[0]}.jsonl",
+    if stream and (skip_download or mmap or parallel_files):
+        logger.warning(
+            "--skip-download, --mmap and --parallel-files are not available "
+            + "with --stream and are ignored."
         )
 
-        tsv2jsonld(
-            tsv_file_path,
-            output_file_path,
-            hide_progress=hide_progress,
-            jsonld_output=jsonld_output,
-        )
+    # 全ファイルのダウンロードで接続を共有する
+    with create_http_session(
+        max_downloads * max(download_segments, 1)
+    ) as session:
+        if stream:
+            for url in urls:
+                # ダウンロードしながら変換し、TSVファイルはディスクに書き込まない
+                base_name = os.path.splitext(url.split("/")[-1])[0]
+
+                output_file_path = os.path.join(
+                    output_dir, f"{base_name}{output_extension}"
+                )
+
+                url2jsonld(
+                    url,
+                    output_file_path,
+                    hide_progress=hide_progress,
+                    jsonld_output=jsonld_output,
+                    use_pyld=use_pyld,
+                    workers=workers,
+                    chunk_size=chunk_size,
+                    chunk_bytes=chunk_bytes,
+                    session=session,
+                    incremental=incremental,
+                    compression=compression,
+                    jsonld_format=jsonld_format,
+                    output_format=output_format,
+                    max_file_size=max_file_size,
+                    table_output=table_output,
+                    manifest=manifest,
+                )
+
+        else:
+            # --parallel-filesの場合に変換する(入力ファイル, 出力ファイル)
+            conversion_jobs: list[tuple[str, str]] = []
+
+            # ダウンロードを並行して実行し、完了したファイルから順に変換する
+            with ThreadPoolExecutor(
+                max_workers=max(max_downloads, 1)
+            ) as executor:
+                download_futures = [
+                    executor.submit(
+                        tsv_download,
+                        url,
+                        output_dir,
+                        skip_download,
+                        decompress,
+                        session,
+                        not force_download,
+                        download_segments,
+                    )
+                    for url in urls
+                ]
+
+                try:
+                    for download_future in download_futures:
+                        tsv_file_path = download_future.result()
+
+                        base_name = os.path.splitext(
+                            os.path.basename(tsv_file_path)
+                        )[0]
+
+                        output_file_path = os.path.join(
+                            output_dir, f"{base_name}{output_extension}"
+                        )
+
+                        if parallel_files:
+                            # 全ファイルのダウンロード後にまとめて変換する
+                            conversion_jobs.append(
+                                (tsv_file_path, output_file_path)
+                            )
+
+                            continue
+
+                        tsv2jsonld(
+                            tsv_file_path,
+                            output_file_path,
+                            hide_progress=hide_progress,
+                            jsonld_output=jsonld_output,
+                            use_pyld=use_pyld,
+                            workers=workers,
+                            chunk_size=chunk_size,
+                            mmap=mmap,
+                            chunk_bytes=chunk_bytes,
+                            incremental=incremental,
+                            compression=compression,
+                            jsonld_format=jsonld_format,
+                            output_format=output_format,
+                            max_file_size=max_file_size,
+                            table_output=table_output,
+                            manifest=manifest,
+                        )
+
+                except Exception:
+                    # 開始前のダウンロードは中止する
+                    for download_future in download_futures:
+                        download_future.cancel()
+
+                    raise
+
+            if conversion_jobs:
+                convert_files_in_parallel(
+                    conversion_jobs,
+                    total_workers=workers,
+                    hide_progress=hide_progress,
+                    jsonld_output=jsonld_output,
+                    use_pyld=use_pyld,
+                    chunk_size=chunk_size,
+                    mmap=mmap,
+                    chunk_bytes=chunk_bytes,
+                    incremental=incremental,
+                    compression=compression,
+                    jsonld_format=jsonld_format,
+                    output_format=output_format,
+                    max_file_size=max_file_size,
+                    table_output=table_output,
+                    manifest=manifest,
+                )
 
     logger.info("Flow execution completed!")
 
 
-def tsv_download(url: str, data_dir: str, skip_download: bool = False) -> str:
+def allocate_workers(file_sizes: list[int], total_workers: int) -> list[int]:
+    """
+    Distribute worker processes among files in proportion to their sizes.
+
+    Each file gets at least one worker process. If there are at least as
+    many worker processes as files, the allocations add up to
+    total_workers. Otherwise each file gets one worker process, and at most
+    total_workers files can be converted at a time.
+
+    Args:
+        file_sizes (list[int]): Size of each file in bytes.
+        total_workers (int): Number of worker processes to distribute.
+
+    Returns:
+        list[int]: Number of worker processes of each file.
+    """
+    if total_workers <= len(file_sizes):
+        return [1] * len(file_sizes)
+
+    # 1ファイル1プロセスを確保し、残りをサイズに比例して割り当てる
+    total_size = sum(file_sizes)
+
+    weights = file_sizes if total_size > 0 else [1] * len(file_sizes)
+
+    shares = [
+        (total_workers - len(file_sizes)) * weight / sum(weights)
+        for weight in weights
+    ]
+
+    allocations = [1 + int(share) for share in shares]
+
+    # 端数の大きいファイルから順に余りを割り当てる
+    remainders = sorted(
+        range(len(shares)),
+        key=lambda i: shares[i] - int(shares[i]),
+        reverse=True,
+    )
+
+    for i in remainders[: total_workers - sum(allocations)]:
+        allocations[i] += 1
+
+    return allocations
+
+
+def max_concurrent_jobs(allocations: list[int], total_workers: int) -> int:
+    """
+    Get the number of files that can be converted at a time.
+
+    The allocations must be in descending order, as they are when the files
+    are sorted by size, so that the files converted at any time use at most
+    as many worker processes as the first ones.
+
+    Args:
+        allocations (list[int]): Number of worker processes of each file,
+            in descending order.
+        total_workers (int): Number of worker processes shared by the files.
+
+    Returns:
+        int: The largest number of files whose worker processes add up to
+        at most total_workers, and at least 1.
+    """
+    max_jobs = 0
+    used_workers = 0
+
+    for allocation in allocations:
+        if used_workers + allocation > total_workers:
+            break
+
+        used_workers += allocation
+        max_jobs += 1
+
+    return max(max_jobs, 1)
+
+
+def convert_files_in_parallel(
+    conversion_jobs: list[tuple[str, str]],
+    total_workers: int,
+    hide_progress: bool = False,
+    jsonld_output: bool = False,
+    use_pyld: bool = False,
+    chunk_size: int = settings.CHUNK_SIZE,
+    mmap: bool = False,
+    chunk_bytes: int = settings.CHUNK_BYTES,
+    incremental: bool = False,
+    compression: str = "none",
+    jsonld_format: str = "indented",
+    output_format: str = "jsonl",
+    max_file_size: int = 0,
+    table_output: str = "none",
+    manifest: bool = False,
+) -> None:
+    """
+    Convert several TSV files concurrently.
+
+    The files are started from the largest one, and the worker processes
+    are distributed among the files in proportion to their sizes, so that
+    the conversions finish at about the same time. The progress of all
+    files is shown in one progress display.
+
+    Args:
+        conversion_jobs (list[tuple[str, str]]): Pairs of the input TSV file
+            path and the output file path.
+        total_workers (int): Number of worker processes shared by the files.
+        hide_progress (bool): Whether to hide the progress bar or not.
+        jsonld_output (bool): If True, JSON-LD files are also generated.
+        use_pyld (bool): If True, each row is converted with pyld.
+        chunk_size (int): Number of rows converted together as one task.
+        mmap (bool): If True, the input files are memory-mapped and split
+            into byte ranges.
+        chunk_bytes (int): Size in bytes of each byte range if mmap is True,
+            and the maximum size of the rows converted together as one task
+            otherwise.
+        incremental (bool): If True, only the rows that changed since the
+            previous conversion are converted.
+        compression (str): Compression format of the output files.
+        jsonld_format (str): Format of the JSON-LD files.
+        output_format (str): Format of the output files.
+        max_file_size (int): If greater than 0, each output is split into
+            files of at most this size in bytes.
+        table_output (str): Format of the tables of interactions
+            ("none", "parquet" or "arrow").
+        manifest (bool): If True, a manifest of the split files of each
+            output is written.
+    """
+    # 大きいファイルから変換を開始する
+    conversion_jobs = sorted(
+        conversion_jobs, key=lambda job: os.path.getsize(job[0]), reverse=True
+    )
+
+    allocations = allocate_workers(
+        [
+            os.path.getsize(input_file_path)
+            for input_file_path, _ in conversion_jobs
+        ],
+        total_workers,
+    )
+
+    # 同時に変換するファイルのプロセス数の合計がtotal_workersを超えないようにする
+    max_jobs = max_concurrent_jobs(allocations, total_workers)
+
+    if max_jobs < len(conversion_jobs):
+        logger.warning(
+            f"Only {max_jobs} of {len(conversion_jobs)} files are converted "
+            + "at a time. Set --workers to at least the number of files "
+            + "to convert all of them concurrently."
+        )
+
+    for (input_file_path, _), allocation in zip(conversion_jobs, allocations):
+        logger.info(f"Scheduled: {input_file_path} (workers={allocation})")
+
+    progress = RichProgress(unit="B", hide_progress=hide_progress)
+
+    # 各ファイルの変換はワーカープロセスで実行し、スレッドは入出力のみを担う
+    with progress, ThreadPoolExecutor(max_workers=max_jobs) as executor:
+        conversion_futures = [
+            executor.submit(
+                convert_tsv_file,
+                input_file_path,
+                output_file_path,
+                hide_progress=hide_progress,
+                jsonld_output=jsonld_output,
+                use_pyld=use_pyld,
+                workers=allocation,
+                chunk_size=chunk_size,
+                mmap=mmap,
+                chunk_bytes=chunk_bytes,
+                progress=progress,
+                use_process_pool=True,
+                incremental=incremental,
+                compression=compression,
+                jsonld_format=jsonld_format,
+                output_format=output_format,
+                max_file_size=max_file_size,
+                table_output=table_output,
+                manifest=manifest,
+            )
+            for (input_file_path, output_file_path), allocation in zip(
+                conversion_jobs, allocations
+            )
+        ]
+
+        try:
+            for conversion_future in conversion_futures:
+                conversion_future.result()
+
+        except Exception:
+            # 開始前の変換は中止する
+            for conversion_future in conversion_futures:
+                conversion_future.cancel()
+
+            raise
+
+
+def create_http_session(max_connections: int) -> requests.Session:
+    """
+    Create an HTTP session whose connections are pooled and shared
+    by concurrent downloads.
+
+    Args:
+        max_connections (int): Maximum number of connections kept per host.
+
+    Returns:
+        requests.Session: The HTTP session.
+    """
+    session = requests.Session()
+
+    adapter = HTTPAdapter(
+        pool_connections=max(max_connections, 1),
+        pool_maxsize=max(max_connections, 1),
+    )
+
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    return session
+
+
+def tsv_download(
+    url: str,
+    data_dir: str,
+    skip_download: bool = False,
+    decompress: bool = True,
+    session: requests.Session | None = None,
+    use_cache: bool = True,
+    segments: int = 1,
+) -> str:
     """Download and decompress a TSV file from a specified URL.
 
     Downloads a TSV file from the given URL to the data directory, and if the file
     is compressed in GZIP format, it decompresses it. Returns the path to the resulting
     file after successful download and decompression.
 
+    The validators of each download are kept in a metadata file in the data
+    directory, and the download and decompression are skipped if the remote
+    file has not changed since the last download.
+
     Args:
         url (str): The URL where the TSV file to be downloaded is located.
         data_dir (str): The path to the directory
         where the downloaded file will be stored.
         skip_download (bool): If specified, TSV downloading is skipped.
+        decompress (bool): If False, the downloaded file is not decompressed
+            and the path to the compressed file is returned.
+        session (requests.Session | None): HTTP session used for the download.
+            If None, a new connection is opened.
+        use_cache (bool): If False, the file is downloaded even if it has not
+            changed since the last download.
+        segments (int): Number of byte ranges a large file is downloaded as
+            in parallel.
 
     Returns:
-        str: The full path to the decompressed TSV file.
+        str: The full path to the decompressed TSV file,
+        or to the compressed file if decompress is False.
 
     Raises:
         Exception: An exception is raised if there
@@ -122,205 +662,3157 @@ def tsv_download(url: str, data_dir: str, skip_download: bool = False) -> str:
 
     """
     try:
-        logger.info("Start downloading target files...")
+        f_name = url.split("/")[-1]
+
+        logger.info(f"Start downloading target files... ({f_name})")
+
+        os.makedirs(data_dir, exist_ok=True)
+
+        f_name_without_ext = os.path.splitext(f_name)[0]
+
+        gzip_file_path = os.path.join(data_dir, f_name)
+
+        decomp_file_path = os.path.join(data_dir, f_name_without_ext)
+
+        if not skip_download:
+            download_cache = (
+                DownloadMetadataCache(
+                    os.path.join(
+                        data_dir, settings.DOWNLOAD_METADATA_FILE_NAME
+                    )
+                )
+                if use_cache
+                else None
+            )
+
+            downloaded = download_file(
+                url, gzip_file_path, session, download_cache, segments
+            )
+
+            if downloaded:
+                logger.info(f"Download of target file completed. ({f_name})")
+
+            if (
+                decompress
+                and not downloaded
+                and os.path.exists(decomp_file_path)
+                and os.path.getmtime(decomp_file_path)
+                >= os.path.getmtime(gzip_file_path)
+            ):
+                logger.info(
+                    "Decompressed file is up to date. "
+                    + f"Decompression skipped. ({f_name})"
+                )
+
+            elif decompress:
+                logger.info(
+                    f"Start decompression of target files... ({f_name})"
+                )
+
+                # 展開途中のファイルが最新と判定されないよう一時ファイルに展開する
+                with gzip.open(gzip_file_path, "rb") as gz_f:
+                    with open(f"{decomp_file_path}.part", "wb") as decomp_f:
+                        shutil.copyfileobj(gz_f, decomp_f)
+
+                os.replace(f"{decomp_file_path}.part", decomp_file_path)
+
+                logger.info(
+                    f"Decompression of the target file is complete. ({f_name})"
+                )
+
+        else:
+            logger.info("Download and decompression of target file skipped.")
+
+        if not decompress:
+            # 圧縮ファイルのまま変換する
+            logger.info("Decompression of target file skipped.")
+
+            return gzip_file_path
+
+        return decomp_file_path
+
+    except Exception as e:
+        logger.exception(e)
+
+        raise
+
+
+def download_file(
+    url: str,
+    file_path: str,
+    session: requests.Session | None = None,
+    download_cache: DownloadMetadataCache | None = None,
+    segments: int = 1,
+) -> bool:
+    """
+    Download a file, skipping the transfer if it has not changed.
+
+    If the metadata of the last download is cached and the local file is
+    intact, a conditional request is sent with the cached ETag and
+    Last-Modified. The transfer is skipped if the server answers
+    304 Not Modified, or if the validators and Content-Length of the
+    response match the cached ones for servers that ignore conditional
+    requests.
+
+    The file is written to a `.part` file, which is renamed when the
+    download completes. If the connection is dropped, the download is
+    resumed from the end of the `.part` file with a Range request, both
+    within this call (up to DOWNLOAD_RETRIES times) and in a later run.
+    A server that stops responding for DOWNLOAD_TIMEOUT is treated
+    in the same way.
+
+    Args:
+        url (str): The URL of the file.
+        file_path (str): Path where the file is saved.
+        session (requests.Session | None): HTTP session used for the download.
+            If None, a new connection is opened.
+        download_cache (DownloadMetadataCache | None): Metadata of the previous
+            downloads. If None, the file is always downloaded.
+        segments (int): If greater than 1, a file larger than
+            DOWNLOAD_SEGMENT_MIN_SIZE is downloaded as this number of byte
+            ranges in parallel, if the server supports Range requests.
+
+    Returns:
+        bool: True if the file was downloaded, False if the local file
+        is up to date.
+    """
+    f_name = os.path.basename(file_path)
+
+    cached = download_cache.get(url) if download_cache is not None else None
+
+    # ローカルファイルが前回のダウンロード結果と一致する場合のみ条件付きリクエストにする
+    if cached is not None and not (
+        os.path.exists(file_path)
+        and os.path.getsize(file_path) == cached.get("size")
+    ):
+        cached = None
+
+    http = session if session is not None else requests
+
+    # 転送途中のファイルが完了したファイルと判定されないよう一時ファイルに保存する
+    part_file_path = f"{file_path}.part"
+
+    for attempt in range(settings.DOWNLOAD_RETRIES + 1):
+        headers = {}
+
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        # 前回の途中までのファイルがあれば、同じファイルである場合に続きから取得する
+        partial = load_partial_download(part_file_path)
+
+        if partial is not None:
+            headers |= range_request_headers(
+                partial, os.path.getsize(part_file_path)
+            )
+
+        try:
+            with http.get(
+                url,
+                stream=True,
+                headers=headers,
+                timeout=settings.DOWNLOAD_TIMEOUT,
+            ) as r:
+                if cached is not None and r.status_code == 304:
+                    logger.info(
+                        "Remote file is unchanged. "
+                        + f"Download skipped. ({f_name})"
+                    )
+
+                    return False
+
+                if partial is not None and r.status_code == 416:
+                    # 途中までのファイルが既に末尾まで取得済みの場合
+                    metadata = {
+                        key: partial.get(key)
+                        for key in ("etag", "last_modified", "content_length")
+                    }
+
+                    break
+
+                r.raise_for_status()
+
+                metadata = response_metadata(r)
+
+                if cached is not None and is_same_remote_file(
+                    cached, metadata
+                ):
+                    logger.info(
+                        "Remote file is unchanged. "
+                        + f"Download skipped. ({f_name})"
+                    )
+
+                    return False
+
+                if r.status_code == 206:
+                    logger.info(f"Resuming download... ({f_name})")
+
+                    mode = "ab"
+
+                else:
+                    mode = "wb"
+
+                    if (
+                        segments > 1
+                        and r.headers.get("Accept-Ranges") == "bytes"
+                        and get_validator(metadata) is not None
+                        and (metadata["content_length"] or 0)
+                        >= settings.DOWNLOAD_SEGMENT_MIN_SIZE
+                    ):
+                        # 分割ダウンロードでは1回目の応答の本体は使用しない
+                        r.close()
+
+                        save_partial_download(part_file_path, metadata, True)
+
+                        download_segments(
+                            url,
+                            part_file_path,
+                            metadata["content_length"],
+                            get_validator(metadata),
+                            segments,
+                            session,
+                        )
+
+                        break
+
+                    save_partial_download(part_file_path, metadata, False)
+
+                with open(part_file_path, mode) as f:
+                    for chunk in r.iter_content(
+                        chunk_size=settings.DOWNLOAD_CHUNK_SIZE
+                    ):
+                        f.write(chunk)
+
+            if (
+                metadata["content_length"] is None
+                or os.path.getsize(part_file_path)
+                >= metadata["content_length"]
+            ):
+                break
+
+            raise requests.exceptions.ConnectionError(
+                "The connection was closed before the download completed."
+            )
+
+        # 応答が止まった場合も中断した位置から再開する
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.ChunkedEncodingError,
+            requests.exceptions.Timeout,
+        ) as e:
+            if attempt >= settings.DOWNLOAD_RETRIES:
+                raise
+
+            logger.warning(f"Download interrupted: {e} Retrying... ({f_name})")
+
+    os.replace(part_file_path, file_path)
+
+    os.remove(f"{part_file_path}.json")
+
+    if download_cache is not None:
+        download_cache.set(
+            url, metadata | {"size": os.path.getsize(file_path)}
+        )
+
+    return True
+
+
+def download_segments(
+    url: str,
+    part_file_path: str,
+    total_size: int,
+    validator: str,
+    segments: int,
+    session: requests.Session | None = None,
+) -> None:
+    """
+    Download a file as several byte ranges in parallel.
+
+    The ranges are written to their positions in a file allocated
+    to the full size.
+
+    Args:
+        url (str): The URL of the file.
+        part_file_path (str): Path where the file is saved.
+        total_size (int): Size of the file in bytes.
+        validator (str): ETag or Last-Modified of the file, sent as If-Range
+            so that all ranges come from the same version of the file.
+        segments (int): Number of byte ranges.
+        session (requests.Session | None): HTTP session used for the download.
+    """
+    logger.info(
+        f"Start segmented download: {segments} segments "
+        + f"({os.path.basename(part_file_path)})"
+    )
+
+    with open(part_file_path, "wb") as f:
+        f.truncate(total_size)
+
+    segment_size = -(-total_size // segments)
+
+    with ThreadPoolExecutor(max_workers=segments) as executor:
+        segment_futures = [
+            executor.submit(
+                download_range,
+                url,
+                part_file_path,
+                start,
+                min(start + segment_size, total_size),
+                validator,
+                session,
+            )
+            for start in range(0, total_size, segment_size)
+        ]
+
+        for segment_future in segment_futures:
+            segment_future.result()
+
+
+def download_range(
+    url: str,
+    file_path: str,
+    start: int,
+    end: int,
+    validator: str,
+    session: requests.Session | None = None,
+) -> None:
+    """
+    Download a byte range of a file into the same position of a local file.
+
+    If the connection is dropped or times out, the rest of the range is
+    requested again up to DOWNLOAD_RETRIES times.
+
+    Args:
+        url (str): The URL of the file.
+        file_path (str): Path to the local file allocated to the full size.
+        start (int): Start byte offset (inclusive).
+        end (int): End byte offset (exclusive).
+        validator (str): ETag or Last-Modified of the file, sent as If-Range.
+        session (requests.Session | None): HTTP session used for the download.
+
+    Raises:
+        Exception: If the server does not return the requested range,
+        for example because the file has changed.
+    """
+    http = session if session is not None else requests
+
+    position = start
+
+    for attempt in range(settings.DOWNLOAD_RETRIES + 1):
+        headers = {
+            "Range": f"bytes={position}-{end - 1}",
+            "If-Range": validator,
+            "Accept-Encoding": "identity",
+        }
+
+        try:
+            with http.get(
+                url,
+                stream=True,
+                headers=headers,
+                timeout=settings.DOWNLOAD_TIMEOUT,
+            ) as r:
+                r.raise_for_status()
+
+                if r.status_code != 206:
+                    raise Exception(
+                        "The server did not return the requested range. "
+                        + "The remote file may have changed."
+                    )
+
+                with open(file_path, "r+b") as f:
+                    f.seek(position)
+
+                    for chunk in r.iter_content(
+                        chunk_size=settings.DOWNLOAD_CHUNK_SIZE
+                    ):
+                        data = chunk[: end - position]
+
+                        f.write(data)
+
+                        position += len(data)
+
+            if position >= end:
+                return
+
+            raise requests.exceptions.ConnectionError(
+                "The connection was closed before the range was downloaded."
+            )
+
+        # 応答が止まった場合も中断した位置から再開する
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.ChunkedEncodingError,
+            requests.exceptions.Timeout,
+        ) as e:
+            if attempt >= settings.DOWNLOAD_RETRIES:
+                raise
+
+            logger.warning(f"Segment download interrupted: {e} Retrying...")
+
+
+def response_metadata(r: requests.Response) -> dict[str, Any]:
+    """
+    Get the validators and the size of the remote file from a response.
+
+    Args:
+        r (requests.Response): The response.
+
+    Returns:
+        dict[str, Any]: The ETag, Last-Modified and Content-Length of the
+        whole file, even if the response contains only a byte range.
+    """
+    content_length = r.headers.get("Content-Length")
+
+    if r.status_code == 206:
+        # Content-Range: bytes <開始>-<終了>/<全体のサイズ>
+        total_size = r.headers.get("Content-Range", "*").rsplit("/", 1)[-1]
+
+        content_length = total_size if total_size != "*" else None
+
+    return {
+        "etag": r.headers.get("ETag"),
+        "last_modified": r.headers.get("Last-Modified"),
+        "content_length": int(content_length) if content_length else None,
+    }
+
+
+def get_validator(metadata: dict[str, Any]) -> str | None:
+    """Returns the ETag, or the Last-Modified if there is no ETag."""
+    return metadata.get("etag") or metadata.get("last_modified")
+
+
+def range_request_headers(
+    partial: dict[str, Any], size: int
+) -> dict[str, str]:
+    """
+    Create the headers to request the rest of a partially downloaded file.
+
+    Args:
+        partial (dict[str, Any]): Metadata of the partial download.
+        size (int): Size of the partially downloaded file.
+
+    Returns:
+        dict[str, str]: The headers, or an empty dict if the download
+        cannot be resumed.
+    """
+    validator = get_validator(partial)
+
+    # 分割ダウンロードの途中のファイルは末尾まで連続していないため再開しない
+    if partial.get("segmented") or validator is None or size == 0:
+        return {}
+
+    # ファイルが変更されていた場合はIf-Rangeにより全体が返される
+    return {
+        "Range": f"bytes={size}-",
+        "If-Range": validator,
+        "Accept-Encoding": "identity",
+    }
+
+
+def load_partial_download(part_file_path: str) -> dict[str, Any] | None:
+    """
+    Load the metadata of a partially downloaded file.
+
+    Args:
+        part_file_path (str): Path to the partially downloaded file.
+
+    Returns:
+        dict[str, Any] | None: The metadata, or None if there is no
+        partially downloaded file.
+    """
+    if not os.path.exists(part_file_path):
+        return None
+
+    try:
+        with open(f"{part_file_path}.json", "r") as f:
+            return json.load(f)
+
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def save_partial_download(
+    part_file_path: str, metadata: dict[str, Any], segmented: bool
+) -> None:
+    """
+    Save the metadata of a file being downloaded, so that the download
+    can be resumed if it is interrupted.
+
+    Args:
+        part_file_path (str): Path to the file being downloaded.
+        metadata (dict[str, Any]): Validators of the remote file.
+        segmented (bool): Whether the file is downloaded in segments.
+    """
+    with open(f"{part_file_path}.json", "w") as f:
+        json.dump(metadata | {"segmented": segmented}, f)
+
+
+def is_same_remote_file(
+    cached: dict[str, Any], metadata: dict[str, Any]
+) -> bool:
+    """
+    Check whether the response validators match the cached ones.
+
+    The ETag is compared if both have one, otherwise the Last-Modified.
+    The Content-Length must also match if both have one. Content-Length
+    alone is not enough to consider the file unchanged.
+
+    Args:
+        cached (dict[str, Any]): Metadata of the last download.
+        metadata (dict[str, Any]): Metadata of the response.
+
+    Returns:
+        bool: True if the remote file is considered unchanged.
+    """
+    if (
+        cached.get("content_length") is not None
+        and metadata["content_length"] is not None
+        and cached["content_length"] != metadata["content_length"]
+    ):
+        return False
+
+    if cached.get("etag") and metadata["etag"]:
+        return cached["etag"] == metadata["etag"]
+
+    if cached.get("last_modified") and metadata["last_modified"]:
+        return cached["last_modified"] == metadata["last_modified"]
+
+    return False
+
+
+@app.command()
+def tsv2jsonld(
+    input_file_path: Annotated[
+        str, typer.Argument(help="Path to the input TSV file.")
+    ],
+    output_file_path: Annotated[
+        str, typer.Argument(help="Path to the output file.")
+    ],
+    taxonomy: Annotated[
+        str,
+        typer.Option(
+            help="""Specify taxonomy.
+            If not specified, the taxonomy is included in the file name.
+            """
+        ),
+    ] = "",
+    hide_progress: Annotated[
+        bool,
+        typer.Option(help="Show progress bar if this option is specified."),
+    ] = False,
+    jsonld_output: Annotated[
+        bool,
+        typer.Option(help="If specified, output will be in JSON-LD format."),
+    ] = False,
+    use_pyld: Annotated[
+        bool,
+        typer.Option(
+            help="If specified, each row is converted with pyld "
+            + "expand/compact (reference implementation)."
+        ),
+    ] = False,
+    workers: Annotated[
+        int,
+        typer.Option(
+            help="Number of worker processes used for conversion. "
+            + "If 1, rows are converted in the main process."
+        ),
+    ] = 1,
+    chunk_size: Annotated[
+        int,
+        typer.Option(help="Number of rows converted together as one task."),
+    ] = settings.CHUNK_SIZE,
+    mmap: Annotated[
+        bool,
+        typer.Option(
+            help="If specified, the input TSV is memory-mapped and split into "
+            + "byte ranges that are read directly by each worker."
+        ),
+    ] = False,
+    chunk_bytes: Annotated[
+        int,
+        typer.Option(
+            help="Size in bytes of each byte range when --mmap is used, "
+            + "and the maximum size of each block of rows otherwise."
+        ),
+    ] = settings.CHUNK_BYTES,
+    incremental: Annotated[
+        bool,
+        typer.Option(
+            help="If specified, only the rows that changed since the previous "
+            + "conversion to the output file are converted, "
+            + "and the other lines are reused."
+        ),
+    ] = False,
+    resume: Annotated[
+        bool,
+        typer.Option(
+            help="If specified, an interrupted conversion is resumed "
+            + "from its last checkpoint."
+        ),
+    ] = False,
+    compression: Annotated[
+        str,
+        typer.Option(
+            help="Compression format of the output files: "
+            + "none, gzip or zstd."
+        ),
+    ] = "none",
+    jsonld_format: Annotated[
+        str,
+        typer.Option(
+            help="Format of the JSON-LD files: indented or compact "
+            + "(without indentation and whitespace)."
+        ),
+    ] = "indented",
+    output_format: Annotated[
+        str,
+        typer.Option(
+            help="Format of the output file: jsonl, ntriples, nquads "
+            + "(one named graph per data source) or turtle."
+        ),
+    ] = "jsonl",
+    max_file_size: Annotated[
+        int,
+        typer.Option(
+            help="If greater than 0, the output is split into files of "
+            + "at most this size in bytes, named <name>_001<ext> and so on."
+        ),
+    ] = 0,
+    table_output: Annotated[
+        str,
+        typer.Option(
+            help="If parquet or arrow, the interactions are also written as "
+            + "a table in Parquet or Arrow IPC format, in the same pass."
+        ),
+    ] = "none",
+    manifest: Annotated[
+        bool,
+        typer.Option(
+            help="If specified with --max-file-size, a manifest listing "
+            + "the path, size, number of records and SHA-256 checksum "
+            + "of each file is written as <name>.manifest.json."
+        ),
+    ] = False,
+) -> None:
+    """
+    Convert TSV format files to JSON Lines files in JSON-LD format
+
+    Gzip-compressed TSV files are decompressed while they are converted.
+    The rows can also be converted to N-Triples, N-Quads or Turtle.
+    """
+    convert_tsv_file(
+        input_file_path,
+        output_file_path,
+        taxonomy=taxonomy,
+        hide_progress=hide_progress,
+        jsonld_output=jsonld_output,
+        use_pyld=use_pyld,
+        workers=workers,
+        chunk_size=chunk_size,
+        mmap=mmap,
+        chunk_bytes=chunk_bytes,
+        incremental=incremental,
+        resume=resume,
+        compression=compression,
+        jsonld_format=jsonld_format,
+        output_format=output_format,
+        max_file_size=max_file_size,
+        table_output=table_output,
+        manifest=manifest,
+    )
+
+
+def convert_tsv_file(
+    input_file_path: str,
+    output_file_path: str,
+    taxonomy: str = "",
+    hide_progress: bool = False,
+    jsonld_output: bool = False,
+    use_pyld: bool = False,
+    workers: int = 1,
+    chunk_size: int = settings.CHUNK_SIZE,
+    mmap: bool = False,
+    chunk_bytes: int = settings.CHUNK_BYTES,
+    progress: RichProgress | None = None,
+    use_process_pool: bool = False,
+    incremental: bool = False,
+    resume: bool = False,
+    compression: str = "none",
+    jsonld_format: str = "indented",
+    output_format: str = "jsonl",
+    max_file_size: int = 0,
+    table_output: str = "none",
+    manifest: bool = False,
+) -> None:
+    """
+    Convert a TSV file to a JSON Lines file in JSON-LD format,
+    or to an N-Triples, N-Quads or Turtle file.
+
+    While the file is converted, the input and output positions are saved
+    periodically to `<output_file_path>.checkpoint`, and the file is removed
+    when the conversion is completed.
+
+    Args:
+        input_file_path (str): Path to the input TSV file.
+        output_file_path (str): Path to the output file.
+        taxonomy (str): Taxonomy name. If empty, the taxonomy is
+            taken from the file name.
+        hide_progress (bool): Whether to hide the progress bar or not.
+        jsonld_output (bool): If True, JSON-LD files are also generated.
+        use_pyld (bool): If True, each row is converted with pyld.
+        workers (int): Number of worker processes used for the conversion.
+        chunk_size (int): Number of rows converted together as one task.
+        mmap (bool): If True, the input file is memory-mapped and split
+            into byte ranges.
+        chunk_bytes (int): Size in bytes of each byte range if mmap is True,
+            and the maximum size of the rows converted together as one task
+            otherwise.
+        progress (RichProgress | None): Progress display shared with other
+            conversions. If None, a progress display is created.
+        use_process_pool (bool): If True, the rows are converted in worker
+            processes even if workers is 1.
+        incremental (bool): If True, only the rows that changed since the
+            previous conversion to the output file are converted.
+        resume (bool): If True, an interrupted conversion is resumed from
+            its last checkpoint.
+        compression (str): Compression format of the output files
+            ("none", "gzip" or "zstd"). The extension of the format is added
+            to the output file path.
+        jsonld_format (str): Format of the JSON-LD files
+            ("indented" or "compact").
+        output_format (str): Format of the output file ("jsonl", "ntriples",
+            "nquads" or "turtle"). JSON-LD files and incremental conversion
+            are available only for "jsonl".
+        max_file_size (int): If greater than 0, the output is split into
+            files of at most this size in bytes (before compression), named
+            after the output file. Not available with incremental conversion.
+        table_output (str): Format of the table of interactions written
+            in the same pass as the output ("none", "parquet" or "arrow").
+            Not available with incremental conversion.
+        manifest (bool): If True and the output is split into files,
+            a manifest listing the path, size, number of records and checksum
+            of each file is written after them.
+    """
+    # 変換処理開始のログ出力
+    logger.info("Starting TSV to JSON-LD convert processing...")
+
+    try:
+        (
+            jsonld_output,
+            incremental,
+            compression,
+            table_output,
+            manifest,
+        ) = check_output_options(
+            output_format,
+            jsonld_format,
+            jsonld_output,
+            incremental,
+            compression,
+            max_file_size,
+            table_output,
+            manifest,
+        )
+
+        output_file_path = compressed_file_path(output_file_path, compression)
+
+        # 出力フォルダのチェックと作成
+        output_dir = os.path.dirname(output_file_path)
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        taxonomy, tax_id = get_taxonomy_id(taxonomy, input_file_path)
+
+        logger.info(f"Processing file: {input_file_path}")
+
+        # 進捗は入力ファイルの読み込み済みバイト数で表示する
+        # (他の変換と共有する場合は表示の開始・終了を呼び出し元に任せる)
+        shared_progress = progress is not None
+
+        if progress is None:
+            progress = RichProgress(unit="B", hide_progress=hide_progress)
+
+        progress_context = nullcontext() if shared_progress else progress
+
+        description = (
+            os.path.basename(input_file_path)
+            if shared_progress
+            else "Processing..."
+        )
+
+        compressed = is_gzip_file(input_file_path)
+
+        if mmap and compressed:
+            logger.warning(
+                "--mmap is not available for gzip-compressed input. "
+                + "The file is read as a stream."
+            )
+
+            mmap = False
+
+        if incremental and (mmap or resume):
+            logger.warning(
+                "--mmap and --resume are not available with --incremental "
+                + "and are ignored."
+            )
+
+            mmap = False
+            resume = False
+
+        if max_file_size > 0 and resume:
+            # 分割したファイルにはチェックポイントを保存しない
+            logger.warning(
+                "--resume is not available with --max-file-size "
+                + "and is ignored."
+            )
+
+            resume = False
+
+        if table_output != "none" and resume:
+            # 表は途中から追記できないため先頭から変換する
+            logger.warning(
+                "--resume is not available with --table-output and is ignored."
+            )
+
+            resume = False
+
+        checkpoint_file_path = output_file_path + settings.CHECKPOINT_SUFFIX
+
+        # JSON-LDファイルを変換と同時に書き込んだかどうか
+        jsonld_written = False
+
+        if incremental:
+            # 入力ファイルと出力ファイルを開き、変換処理を実行
+            # (差分変換では前回の出力を読みながら一時ファイルに書き込む)
+            with progress_context, progress.open(
+                input_file_path, "rb", description=description
+            ) as raw_input_f, open_tsv_stream(
+                raw_input_f, compressed
+            ) as input_f, open(
+                f"{output_file_path}.tmp", "w"
+            ) as output_f:
+                incremental_index = convert_tsv_stream(
+                    input_f,
+                    output_f,
+                    taxonomy,
+                    tax_id,
+                    use_pyld,
+                    workers,
+                    chunk_size,
+                    use_process_pool,
+                    output_file_path,
+                    chunk_bytes=chunk_bytes,
+                )
+
+            save_incremental_output(output_file_path, incremental_index)
+
+        elif mmap:
+            # ヘッダ行を読み込み、データ部の開始位置を取得
+            with open(input_file_path, "rb") as input_f:
+                headers = read_tsv_headers(input_f)
+                data_offset = input_f.tell()
+
+            plan = get_conversion_plan(
+                taxonomy,
+                tax_id,
+                headers,
+                partial(read_sample_lines, input_file_path),
+                use_pyld,
+                output_format,
+            )
+
+            checkpoint = begin_checkpoint(
+                checkpoint_file_path,
+                input_file_path,
+                output_file_path,
+                plan,
+                data_offset,
+                resume,
+            )
+
+            # JSON-LDファイルは変換と同時に書き込む
+            # (再開する場合は変換済みの行がメモリにないため変換後に書き込む)
+            jsonld_written = jsonld_output and checkpoint.output_offset == 0
+
+            # 入力ファイルと出力ファイルを開き、変換処理を実行
+            with progress_context, ExitStack() as output_stack:
+                output_f, shard_writer, table_writer = open_output_writers(
+                    output_stack,
+                    output_file_path,
+                    partial(
+                        open_checkpoint_output,
+                        output_file_path,
+                        checkpoint,
+                        compression,
+                    ),
+                    output_format,
+                    compression,
+                    jsonld_format,
+                    jsonld_written,
+                    max_file_size,
+                    table_output,
+                    manifest,
+                )
+
+                task_id = progress.add_task(
+                    description,
+                    total=os.path.getsize(input_file_path),
+                    completed=checkpoint.input_offset,
+                )
+
+                if checkpoint.output_offset == 0:
+                    write_output_header(output_f, plan)
+
+                # 改行位置で区切ったバイト範囲ごとにワーカーが直接読み込む
+                input_chunks = iter_byte_range_chunks(
+                    input_file_path,
+                    checkpoint.input_offset,
+                    chunk_bytes,
+                    progress,
+                    task_id,
+                )
+
+                write_chunks_with_checkpoints(
+                    (
+                        (input_chunk, input_chunk[2])
+                        for input_chunk in input_chunks
+                    ),
+                    output_f,
+                    plan,
+                    workers,
+                    use_process_pool,
+                    checkpoint_file_path,
+                    checkpoint,
+                    shard_writer,
+                    table_writer,
+                )
+
+        else:
+            # 入力ファイルと出力ファイルを開き、変換処理を実行
+            # (gzip形式の場合は読み込みながら展開し、進捗は圧縮後のバイト数で表示)
+            with progress_context, progress.open(
+                input_file_path, "rb", description=description
+            ) as raw_input_f, open_decompressed_stream(
+                raw_input_f, compressed
+            ) as input_f:
+                headers = read_tsv_headers(input_f)
+
+                plan = get_conversion_plan(
+                    taxonomy,
+                    tax_id,
+                    headers,
+                    partial(read_sample_lines, input_file_path),
+                    use_pyld,
+                    output_format,
+                )
+
+                checkpoint = begin_checkpoint(
+                    checkpoint_file_path,
+                    input_file_path,
+                    output_file_path,
+                    plan,
+                    input_f.tell(),
+                    resume,
+                )
+
+                # 再開する場合は変換済みの行を読み飛ばす
+                input_f.seek(checkpoint.input_offset)
+
+                jsonld_written = (
+                    jsonld_output and checkpoint.output_offset == 0
+                )
+
+                with ExitStack() as output_stack:
+                    output_f, shard_writer, table_writer = open_output_writers(
+                        output_stack,
+                        output_file_path,
+                        partial(
+                            open_checkpoint_output,
+                            output_file_path,
+                            checkpoint,
+                            compression,
+                        ),
+                        output_format,
+                        compression,
+                        jsonld_format,
+                        jsonld_written,
+                        max_file_size,
+                        table_output,
+                        manifest,
+                    )
+
+                    if checkpoint.output_offset == 0:
+                        write_output_header(output_f, plan)
+
+                    write_chunks_with_checkpoints(
+                        iter_binary_line_chunks(
+                            input_f,
+                            checkpoint.input_offset,
+                            chunk_size,
+                            chunk_bytes,
+                        ),
+                        output_f,
+                        plan,
+                        workers,
+                        use_process_pool,
+                        checkpoint_file_path,
+                        checkpoint,
+                        shard_writer,
+                        table_writer,
+                    )
+
+        # 変換が完了したためチェックポイントは不要
+        if os.path.exists(checkpoint_file_path):
+            os.remove(checkpoint_file_path)
+
+        # JSONLをJSON-LD形式で出力する場合の処理
+        # (変換と同時に書き込めなかった場合はJSONLから生成する)
+        if jsonld_output and not jsonld_written:
+            output_jsonld_files(
+                output_file_path,
+                hide_progress,
+                progress if shared_progress else None,
+                compression,
+                jsonld_format,
+            )
+
+    except Exception:
+        # エラー発生時のロギング
+        logger.exception(
+            "An error occurred in the main function.",
+        )
+
+        raise
+
+    finally:
+        # 処理完了時のログ出力
+        logger.info("TSV to JSON-LD convert processing finished.")
+
+
+def url2jsonld(
+    url: str,
+    output_file_path: str,
+    hide_progress: bool = False,
+    jsonld_output: bool = False,
+    use_pyld: bool = False,
+    workers: int = 1,
+    chunk_size: int = settings.CHUNK_SIZE,
+    chunk_bytes: int = settings.CHUNK_BYTES,
+    session: requests.Session | None = None,
+    incremental: bool = False,
+    compression: str = "none",
+    jsonld_format: str = "indented",
+    output_format: str = "jsonl",
+    max_file_size: int = 0,
+    table_output: str = "none",
+    manifest: bool = False,
+) -> None:
+    """
+    Convert a TSV file to a JSON Lines file in JSON-LD format,
+    or to an N-Triples, N-Quads or Turtle file, while downloading it.
+
+    The response body is decompressed and converted as it arrives, and is
+    not written to disk. The download runs in a background thread so that
+    it overlaps with the conversion.
+
+    Args:
+        url (str): The URL of the TSV file, or of the gzip-compressed TSV file.
+        output_file_path (str): Path to the output file.
+        hide_progress (bool): Whether to hide the progress bar or not.
+        jsonld_output (bool): If True, JSON-LD files are also generated.
+        use_pyld (bool): If True, each row is converted with pyld.
+        workers (int): Number of worker processes used for the conversion.
+        chunk_size (int): Number of rows converted together as one task.
+        chunk_bytes (int): Maximum size in bytes of the rows converted
+            together as one task.
+        session (requests.Session | None): HTTP session used for the download.
+            If None, a new connection is opened.
+        incremental (bool): If True, only the rows that changed since the
+            previous conversion to the output file are converted.
+        compression (str): Compression format of the output files
+            ("none", "gzip" or "zstd"). The extension of the format is added
+            to the output file path.
+        jsonld_format (str): Format of the JSON-LD files
+            ("indented" or "compact").
+        output_format (str): Format of the output file ("jsonl", "ntriples",
+            "nquads" or "turtle"). JSON-LD files and incremental conversion
+            are available only for "jsonl".
+        max_file_size (int): If greater than 0, the output is split into
+            files of at most this size in bytes (before compression), named
+            after the output file. Not available with incremental conversion.
+        table_output (str): Format of the table of interactions written
+            in the same pass as the output ("none", "parquet" or "arrow").
+            Not available with incremental conversion.
+        manifest (bool): If True and the output is split into files,
+            a manifest listing the path, size, number of records and checksum
+            of each file is written after them.
+    """
+    logger.info("Starting TSV to JSON-LD streaming convert processing...")
+
+    try:
+        (
+            jsonld_output,
+            incremental,
+            compression,
+            table_output,
+            manifest,
+        ) = check_output_options(
+            output_format,
+            jsonld_format,
+            jsonld_output,
+            incremental,
+            compression,
+            max_file_size,
+            table_output,
+            manifest,
+        )
+
+        output_file_path = compressed_file_path(output_file_path, compression)
+
+        output_dir = os.path.dirname(output_file_path)
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        taxonomy, tax_id = get_taxonomy_id("", url.split("/")[-1])
+
+        logger.info(f"Processing URL: {url}")
+
+        # 進捗はダウンロード済みのバイト数で表示する
+        progress = RichProgress(unit="B", hide_progress=hide_progress)
+
+        http = session if session is not None else requests
+
+        # 応答が止まった場合はDOWNLOAD_TIMEOUT秒で中断する
+        with http.get(
+            url, stream=True, timeout=settings.DOWNLOAD_TIMEOUT
+        ) as r:
+            r.raise_for_status()
+
+            content_length = r.headers.get("Content-Length")
+
+            with progress, PrefetchReader(
+                r.iter_content(chunk_size=settings.STREAM_CHUNK_SIZE),
+                settings.STREAM_PREFETCH_CHUNKS,
+            ) as prefetch_f, progress.wrap_file(
+                prefetch_f,
+                # サイズが不明な場合は読み込み済みバイト数のみ表示
+                total=int(content_length) if content_length else 0,
+                description="Processing...",
+            ) as raw_input_f:
+                buffered_f = io.BufferedReader(raw_input_f)
+
+                compressed = buffered_f.peek(
+                    len(GZIP_MAGIC_NUMBER)
+                ).startswith(GZIP_MAGIC_NUMBER)
+
+                with open_tsv_stream(
+                    buffered_f, compressed
+                ) as input_f, ExitStack() as output_stack:
+                    output_f, shard_writer, table_writer = open_output_writers(
+                        output_stack,
+                        output_file_path,
+                        partial(
+                            open_output_file,
+                            (
+                                f"{output_file_path}.tmp"
+                                if incremental
+                                else output_file_path
+                            ),
+                            compression,
+                        ),
+                        output_format,
+                        compression,
+                        jsonld_format,
+                        # 差分変換では複製した行がメモリにないため変換後に書き込む
+                        jsonld_output and not incremental,
+                        max_file_size,
+                        table_output,
+                        manifest,
+                    )
+
+                    incremental_index = convert_tsv_stream(
+                        input_f,
+                        output_f,
+                        taxonomy,
+                        tax_id,
+                        use_pyld,
+                        workers,
+                        chunk_size,
+                        chunk_bytes=chunk_bytes,
+                        previous_output_path=(
+                            output_file_path if incremental else None
+                        ),
+                        shard_writer=shard_writer,
+                        output_format=output_format,
+                        table_writer=table_writer,
+                    )
+
+            if incremental_index is not None:
+                save_incremental_output(output_file_path, incremental_index)
+
+        logger.info("Download of target file completed.")
+
+        # JSONLをJSON-LD形式で出力する場合の処理
+        if jsonld_output and incremental:
+            output_jsonld_files(
+                output_file_path,
+                hide_progress,
+                compression=compression,
+                jsonld_format=jsonld_format,
+            )
+
+    except Exception:
+        logger.exception("An error occurred in the url2jsonld function.")
+
+        raise
+
+    finally:
+        logger.info("TSV to JSON-LD streaming convert processing finished.")
+
+
+def check_output_options(
+    output_format: str,
+    jsonld_format: str,
+    jsonld_output: bool,
+    incremental: bool,
+    compression: str,
+    max_file_size: int,
+    table_output: str,
+    manifest: bool,
+) -> tuple[bool, bool, str, str, bool]:
+    """
+    Check the output options, and disable the ones that are not available
+    together, with a warning.
+
+    Args:
+        output_format (str): Format of the output file.
+        jsonld_format (str): Format of the JSON-LD files.
+        jsonld_output (bool): If True, JSON-LD files are also generated.
+        incremental (bool): If True, only the changed rows are converted.
+        compression (str): Compression format of the output files.
+        max_file_size (int): If greater than 0, the output is split into
+            files of at most this size in bytes.
+        table_output (str): Format of the table of interactions.
+        manifest (bool): If True, a manifest of the split files is written.
+
+    Returns:
+        tuple[bool, bool, str, str, bool]: jsonld_output, incremental,
+        compression, table_output and manifest to be used.
+
+    Raises:
+        Exception: If a format is unknown, or the package it requires
+            is not installed.
+    """
+    check_compression(compression)
+    check_jsonld_format(jsonld_format)
+    check_output_format(output_format)
+
+    if table_output != "none":
+        check_table_format(table_output)
+
+    jsonld_output, incremental = check_rdf_output_options(
+        output_format, jsonld_output, incremental
+    )
+
+    if table_output != "none" and incremental:
+        # 差分変換では複製した行を解析しないため表を出力できない
+        logger.warning(
+            "--table-output is not available with --incremental "
+            + "and is ignored."
+        )
+
+        table_output = "none"
+
+    if incremental and compression != "none":
+        logger.warning(
+            "--compression is not available with --incremental "
+            + "and is ignored."
+        )
+
+        compression = "none"
+
+    if max_file_size > 0 and incremental:
+        logger.warning(
+            "--incremental is not available with --max-file-size "
+            + "and is ignored."
+        )
+
+        incremental = False
+
+    if manifest and max_file_size <= 0:
+        logger.warning(
+            "--manifest is available only with --max-file-size and is ignored."
+        )
+
+        manifest = False
+
+    return jsonld_output, incremental, compression, table_output, manifest
+
+
+def check_rdf_output_options(
+    output_format: str, jsonld_output: bool, incremental: bool
+) -> tuple[bool, bool]:
+    """
+    Disable the options that are not available for RDF output.
+
+    JSON-LD files are generated from JSON Lines, and incremental conversion
+    reuses lines of JSON Lines, so they are available only for "jsonl".
+
+    Args:
+        output_format (str): Format of the output file.
+        jsonld_output (bool): If True, JSON-LD files are also generated.
+        incremental (bool): If True, only the changed rows are converted.
+
+    Returns:
+        tuple[bool, bool]: jsonld_output and incremental to be used.
+    """
+    if output_format == "jsonl":
+        return jsonld_output, incremental
+
+    if jsonld_output or incremental:
+        logger.warning(
+            "--jsonld-output and --incremental are not available "
+            + f"with --output-format {output_format} and are ignored."
+        )
+
+    return False, False
+
+
+def convert_tsv_stream(
+    input_f: IO[str],
+    output_f: IO[str] | TextShardWriter,
+    taxonomy: str,
+    tax_id: Any,
+    use_pyld: bool = False,
+    workers: int = 1,
+    chunk_size: int = settings.CHUNK_SIZE,
+    use_process_pool: bool = False,
+    previous_output_path: str | None = None,
+    shard_writer: JsonldShardWriter | None = None,
+    output_format: str = "jsonl",
+    table_writer: InteractionTableWriter | None = None,
+    chunk_bytes: int | None = None,
+) -> IncrementalIndex | None:
+    """
+    Convert a TSV text stream and write the JSON-LD formatted lines.
+
+    The rows read to infer the column types are converted as well,
+    so the stream is read only once.
+
+    Args:
+        input_f (IO[str]): The TSV stream opened at its beginning.
+        output_f (IO[str] | TextShardWriter): The output stream, or the writer
+            of the split output files. Only a stream is used with
+            previous_output_path.
+        taxonomy (str): Taxonomy name.
+        tax_id (Any): Taxonomy ID associated with the records.
+        use_pyld (bool): If True, each row is converted with pyld.
+        workers (int): Number of worker processes used for the conversion.
+        chunk_size (int): Number of rows converted together as one task.
+        use_process_pool (bool): If True, the rows are converted in worker
+            processes even if workers is 1.
+        previous_output_path (str | None): If specified, the rows that have
+            not changed since the previous conversion to this JSONL file are
+            not converted again, and their lines are copied from the file.
+        shard_writer (JsonldShardWriter | None): If specified, the records
+            are also written to JSON-LD files. Not used with
+            previous_output_path.
+        output_format (str): Format of the output ("jsonl", "ntriples",
+            "nquads" or "turtle"). Only "jsonl" is used with
+            previous_output_path.
+        table_writer (InteractionTableWriter | None): If specified, the
+            records are also written to the table of interactions.
+            Not used with previous_output_path.
+        chunk_bytes (int | None): If specified, the maximum total length
+            of the rows converted together as one task.
+
+    Returns:
+        IncrementalIndex | None: The index of the written lines
+        if previous_output_path is specified.
+    """
+    headers = read_tsv_headers(input_f)
+
+    sample_lines: list[str] = []
+
+    def read_samples() -> list[str]:
+        # 型推定用に読み込んだ行は変換対象の先頭に戻す
+        sample_lines.extend(
+            islice(input_f, settings.TYPE_INFERENCE_SAMPLE_SIZE)
+        )
+
+        return sample_lines
+
+    plan = get_conversion_plan(
+        taxonomy, tax_id, headers, read_samples, use_pyld, output_format
+    )
+
+    line_chunks = iter_line_chunks(
+        chain(sample_lines, input_f), chunk_size, chunk_bytes
+    )
+
+    write_output_header(output_f, plan)
+
+    if previous_output_path is not None:
+        return convert_line_chunks_incrementally(
+            line_chunks,
+            output_f,
+            plan,
+            workers,
+            use_process_pool,
+            previous_output_path,
+        )
+
+    # 各行を処理し、JSON-LD形式のデータに変換して出力ファイルへ書き込み
+    for converted_chunk in convert_chunks(
+        line_chunks,
+        plan,
+        workers,
+        use_process_pool,
+        jsonld_format=(
+            shard_writer.jsonld_format if shard_writer is not None else None
+        ),
+        split_records=isinstance(output_f, TextShardWriter),
+        table_output=table_writer is not None,
+    ):
+        write_converted_chunk(
+            converted_chunk, output_f, shard_writer, table_writer
+        )
+
+    return None
+
+
+def convert_line_chunks_incrementally(
+    line_chunks: Iterable[list[str]],
+    output_f: IO[str],
+    plan: ConversionPlan,
+    workers: int,
+    use_process_pool: bool,
+    previous_output_path: str,
+) -> IncrementalIndex:
+    """
+    Convert only the rows that changed since the previous conversion.
+
+    Each row is identified by its node ID and compared with the fingerprint
+    recorded in the index of the previous output file. The lines of the
+    unchanged rows are copied from the previous output file, and the new and
+    modified rows are converted. If the index is missing, or was written with
+    a different conversion plan, all rows are converted.
+
+    Args:
+        line_chunks (Iterable[list[str]]): Blocks of TSV lines.
+        output_f (IO[str]): The output JSONL stream, which must not be
+            the previous output file.
+        plan (ConversionPlan): The conversion plan.
+        workers (int): Number of worker processes used for the conversion.
+        use_process_pool (bool): If True, the rows are converted in worker
+            processes even if workers is 1.
+        previous_output_path (str): Path to the JSONL file of the previous
+            conversion.
+
+    Returns:
+        IncrementalIndex: The index of the written lines.
+    """
+    signature = conversion_plan_signature(plan)
+
+    previous_index = IncrementalIndex.load(
+        previous_output_path + settings.INCREMENTAL_INDEX_SUFFIX,
+        previous_output_path,
+        signature,
+    )
+
+    if previous_index is None:
+        logger.info("No reusable previous output. All rows are converted.")
+
+        previous_index = IncrementalIndex(signature)
+
+    index = IncrementalIndex(signature)
+
+    counts = {"unchanged": 0, "modified": 0, "new": 0}
+
+    # 各チャンクの行ごとの (ノードID, フィンガープリント, 前回の出力位置)
+    pending_rows: deque[
+        list[tuple[str | None, int, tuple[int, int] | None]]
+    ] = deque()
+
+    def iter_changed_chunks() -> Iterator[list[str]]:
+        for lines in line_chunks:
+            rows = []
+            changed_lines = []
+
+            for line in lines:
+                node_id = row_node_id(line, plan)
+                fingerprint = row_fingerprint(line)
+
+                previous = (
+                    previous_index.find(node_id, fingerprint)
+                    if node_id is not None
+                    else None
+                )
+
+                if previous is not None:
+                    counts["unchanged"] += 1
+
+                    rows.append((node_id, fingerprint, previous))
+
+                    continue
+
+                counts[
+                    "modified" if node_id in previous_index.entries else "new"
+                ] += 1
+
+                rows.append((node_id, fingerprint, None))
+                changed_lines.append(line)
+
+            pending_rows.append(rows)
+
+            # 変更のあった行のみ変換する
+            yield changed_lines
+
+    offset = 0
+
+    previous_context = (
+        open(previous_output_path, "rb")
+        if previous_index.entries
+        else nullcontext()
+    )
+
+    with previous_context as previous_f:
+        for json_lines_str in convert_chunks(
+            iter_changed_chunks(), plan, workers, use_process_pool
+        ):
+            json_lines = iter(json_lines_str.split("\n"))
+
+            for node_id, fingerprint, previous in pending_rows.popleft():
+                if previous is None:
+                    json_line = next(json_lines) + "\n"
+
+                else:
+                    # 変更のない行は前回の出力から複製する
+                    previous_f.seek(previous[0])
+
+                    json_line = previous_f.read(previous[1]).decode("utf-8")
+
+                output_f.write(json_line)
+
+                length = len(json_line.encode("utf-8"))
+
+                if node_id is not None:
+                    index.add(node_id, fingerprint, offset, length)
+
+                offset += length
+
+    removed = max(
+        len(previous_index) - counts["unchanged"] - counts["modified"], 0
+    )
+
+    logger.info(
+        f"Incremental conversion: unchanged={counts['unchanged']}, "
+        + f"modified={counts['modified']}, new={counts['new']}, "
+        + f"removed={removed}"
+    )
+
+    return index
+
+
+def row_node_id(input_line: str, plan: ConversionPlan) -> str | None:
+    """
+    Get the node ID of a TSV row without converting the row.
+
+    Args:
+        input_line (str): The line from TSV.
+        plan (ConversionPlan): The conversion plan.
+
+    Returns:
+        str | None: The node ID, or None if the row has no node ID column.
+    """
+    row = input_line.strip().split("\t")
+
+    index = plan.header_index[plan.node_id_column]
+
+    if index >= len(row):
+        return None
+
+    parser = plan.column_parsers[index] or parse_field
+
+    return generate_node_id(parser(row[index]))
+
+
+def conversion_plan_signature(plan: ConversionPlan) -> str:
+    """
+    Calculate a signature of the settings that determine the output lines.
+
+    The output of a row can be reused only while the signature is unchanged.
+    Column types inferred from sample rows are not included, because they do
+    not change the converted values.
+
+    Args:
+        plan (ConversionPlan): The conversion plan.
+
+    Returns:
+        str: The signature as a hexadecimal string.
+    """
+    settings_dict = {
+        "headers": plan.headers,
+        "mapped_headers": plan.mapped_headers,
+        "column_parsers": [
+            (
+                (
+                    parser.column_type if parser.declared else None,
+                    parser.delimiter,
+                    parser.na_value,
+                )
+                if parser is not None
+                else None
+            )
+            for parser in plan.column_parsers
+        ],
+        "context": plan.context,
+        "context_uri": settings.CONTEXT_FILE_URI,
+        "participant_columns": plan.participant_columns,
+        "node_id_column": plan.node_id_column,
+        "node_id_prefix": plan.node_id_prefix,
+        "node_type": plan.node_type,
+        "data_source_prefix": plan.data_source_prefix,
+        "reference_prefix": plan.reference_prefix,
+        "taxonomy_value": plan.taxonomy_value,
+    }
+
+    # JSONLの場合は既存のチェックポイントと差分変換のインデックスを使えるように含めない
+    if plan.output_format != "jsonl":
+        settings_dict["output_format"] = plan.output_format
+
+    settings_str = json.dumps(settings_dict, sort_keys=True)
+
+    return hashlib.sha256(settings_str.encode("utf-8")).hexdigest()
+
+
+def save_incremental_output(
+    output_file_path: str, index: IncrementalIndex
+) -> None:
+    """
+    Replace the output file with the incrementally converted one,
+    and save the index of its lines.
+
+    Args:
+        output_file_path (str): Path to the output JSONL file. The converted
+            lines are read from `<output_file_path>.tmp`.
+        index (IncrementalIndex): The index of the converted lines.
+    """
+    index_path = output_file_path + settings.INCREMENTAL_INDEX_SUFFIX
+
+    # 置き換えの途中で中断された場合に古い索引が使われないよう、先に削除する
+    if os.path.exists(index_path):
+        os.remove(index_path)
+
+    os.replace(f"{output_file_path}.tmp", output_file_path)
+
+    index.save(index_path, os.path.getsize(output_file_path))
+
+
+def begin_checkpoint(
+    checkpoint_file_path: str,
+    input_file_path: str,
+    output_file_path: str,
+    plan: ConversionPlan,
+    data_offset: int,
+    resume: bool,
+) -> ConversionCheckpoint:
+    """
+    Get the checkpoint from which a conversion starts.
+
+    Args:
+        checkpoint_file_path (str): Path to the checkpoint file.
+        input_file_path (str): Path to the input TSV file.
+        output_file_path (str): Path to the output JSONL file.
+        plan (ConversionPlan): The conversion plan.
+        data_offset (int): Byte offset of the first data row.
+        resume (bool): If True, the saved checkpoint is returned when it
+            matches the input file, the conversion plan and the output file.
+
+    Returns:
+        ConversionCheckpoint: The saved checkpoint, or a checkpoint at the
+        first data row.
+    """
+    input_stat = os.stat(input_file_path)
+
+    checkpoint = ConversionCheckpoint(
+        input_file_path=os.path.abspath(input_file_path),
+        input_size=input_stat.st_size,
+        input_mtime_ns=input_stat.st_mtime_ns,
+        signature=conversion_plan_signature(plan),
+        input_offset=data_offset,
+        output_offset=0,
+    )
+
+    if not resume:
+        return checkpoint
+
+    saved = load_checkpoint(checkpoint_file_path)
+
+    if (
+        saved is not None
+        and replace(saved, input_offset=data_offset, output_offset=0)
+        == checkpoint
+        and os.path.exists(output_file_path)
+        and os.path.getsize(output_file_path) >= saved.output_offset
+    ):
+        logger.info(
+            f"Resuming from checkpoint: input offset={saved.input_offset}, "
+            + f"output offset={saved.output_offset}"
+        )
+
+        return saved
+
+    logger.warning(
+        "No checkpoint matches the input file and the settings. "
+        + "The file is converted from the beginning."
+    )
+
+    return checkpoint
+
+
+def open_checkpoint_output(
+    output_file_path: str,
+    checkpoint: ConversionCheckpoint,
+    compression: str = "none",
+) -> IO[str]:
+    """
+    Open the output file to write the lines after a checkpoint.
+
+    Args:
+        output_file_path (str): Path to the output JSONL file.
+        checkpoint (ConversionCheckpoint): The checkpoint.
+        compression (str): Compression format of the output file.
+
+    Returns:
+        IO[str]: The output stream positioned at the output offset
+        of the checkpoint.
+    """
+    if checkpoint.output_offset == 0:
+        return open_output_file(output_file_path, compression)
+
+    # 最後のチェックポイント以降の出力を切り捨てて追記する
+    # (圧縮する場合もチェックポイントの位置は圧縮ブロックの境界になる)
+    os.truncate(output_file_path, checkpoint.output_offset)
+
+    return open_output_file(output_file_path, compression, "a")
+
+
+def open_output_file(
+    file_path: str, compression: str = "none", mode: str = "w"
+) -> IO[str]:
+    """
+    Open an output file, compressed in background threads if compression
+    is specified.
+
+    Args:
+        file_path (str): Path to the output file.
+        compression (str): Compression format ("none", "gzip" or "zstd").
+        mode (str): "w" to overwrite the file, or "a" to append to it.
+
+    Returns:
+        IO[str]: The output text stream.
+    """
+    return open_compressed_output_file(
+        file_path,
+        compression,
+        mode,
+        threads=settings.COMPRESSION_THREADS,
+        block_size=settings.COMPRESSION_BLOCK_SIZE,
+    )
+
+
+def write_chunks_with_checkpoints(
+    input_chunks: Iterable[
+        tuple[list[str] | bytes | tuple[str, int, int], int]
+    ],
+    output_f: IO[str] | TextShardWriter,
+    plan: ConversionPlan,
+    workers: int,
+    use_process_pool: bool,
+    checkpoint_file_path: str,
+    checkpoint: ConversionCheckpoint,
+    shard_writer: JsonldShardWriter | None = None,
+    table_writer: InteractionTableWriter | None = None,
+) -> None:
+    """
+    Convert blocks of TSV lines and write the output, saving checkpoints.
+
+    A checkpoint is saved every CHECKPOINT_INTERVAL seconds at most, after
+    the output of the converted blocks has been written to disk.
+    No checkpoint is saved if the output is split into files.
+
+    Args:
+        input_chunks (Iterable[tuple[list[str] | bytes | tuple[str, int,
+            int], int]]): Pairs of a block of lines, or a byte range of the
+            input file, and the byte offset of the end of the block
+            in the input.
+        output_f (IO[str] | TextShardWriter): The output stream, or the
+            writer of the split output files.
+        plan (ConversionPlan): The conversion plan.
+        workers (int): Number of worker processes used for the conversion.
+        use_process_pool (bool): If True, the rows are converted in worker
+            processes even if workers is 1.
+        checkpoint_file_path (str): Path to the checkpoint file.
+        checkpoint (ConversionCheckpoint): The checkpoint the conversion
+            started from.
+        shard_writer (JsonldShardWriter | None): If specified, the records
+            are also written to JSON-LD files.
+        table_writer (InteractionTableWriter | None): If specified, the
+            records are also written to the table of interactions.
+    """
+    # 変換中のチャンクの入力終了位置
+    end_offsets: deque[int] = deque()
+
+    def iter_input_chunks() -> (
+        Iterator[list[str] | bytes | tuple[str, int, int]]
+    ):
+        for input_chunk, end_offset in input_chunks:
+            end_offsets.append(end_offset)
+
+            yield input_chunk
+
+    saved_time = time.monotonic()
+
+    # 分割して出力する場合は行ごとの出力を受け取る
+    split_records = isinstance(output_f, TextShardWriter)
+
+    for converted_chunk in convert_chunks(
+        iter_input_chunks(),
+        plan,
+        workers,
+        use_process_pool,
+        jsonld_format=(
+            shard_writer.jsonld_format if shard_writer is not None else None
+        ),
+        split_records=split_records,
+        table_output=table_writer is not None,
+    ):
+        write_converted_chunk(
+            converted_chunk, output_f, shard_writer, table_writer
+        )
+
+        end_offset = end_offsets.popleft()
+
+        if (
+            split_records
+            or time.monotonic() - saved_time < settings.CHECKPOINT_INTERVAL
+        ):
+            continue
+
+        # 出力をディスクに書き出してから変換済みの位置を記録する
+        output_f.flush()
+        os.fsync(output_f.fileno())
+
+        checkpoint = replace(
+            checkpoint,
+            input_offset=end_offset,
+            output_offset=os.fstat(output_f.fileno()).st_size,
+        )
+
+        save_checkpoint(checkpoint_file_path, checkpoint)
+
+        saved_time = time.monotonic()
+
+
+def write_converted_chunk(
+    converted_chunk: Any,
+    output_f: IO[str] | TextShardWriter,
+    shard_writer: JsonldShardWriter | None,
+    table_writer: InteractionTableWriter | None = None,
+) -> None:
+    """
+    Write the output of a converted block.
+
+    Args:
+        converted_chunk (Any): The output of convert_chunks.
+        output_f (IO[str] | TextShardWriter): The output stream, or the writer
+            of the split output files if the output of each row was generated
+            separately.
+        shard_writer (JsonldShardWriter | None): Writer of the JSON-LD files,
+            if the elements of `@graph` were generated.
+        table_writer (InteractionTableWriter | None): Writer of the table of
+            interactions, if the rows of the table were generated.
+    """
+    if table_writer is not None:
+        converted_chunk, table_rows = converted_chunk
+
+        table_writer.write_rows(table_rows)
+
+    graph_items = None
+
+    if shard_writer is not None:
+        converted_chunk, graph_items = converted_chunk
+
+    if isinstance(converted_chunk, list):
+        output_f.write_items(converted_chunk)
+
+    else:
+        output_f.write(converted_chunk)
+
+    if graph_items is not None:
+        shard_writer.write_items(graph_items)
+
+
+def open_output_writers(
+    stack: ExitStack,
+    output_file_path: str,
+    open_output: Callable[[], IO[str]],
+    output_format: str,
+    compression: str,
+    jsonld_format: str,
+    jsonld_output: bool,
+    max_file_size: int,
+    table_output: str,
+    manifest: bool,
+) -> tuple[
+    IO[str] | TextShardWriter,
+    JsonldShardWriter | None,
+    InteractionTableWriter | None,
+]:
+    """
+    Open the writers of the outputs of a conversion and enter them into
+    an ExitStack, which closes them in the reverse order, or aborts them
+    if the conversion fails.
+
+    Args:
+        stack (ExitStack): The stack the writers are entered into.
+        output_file_path (str): Path to the output file, with the extension
+            of the compression format if the output is compressed.
+        open_output (Callable[[], IO[str]]): Function opening the output
+            file if the output is not split.
+        output_format (str): Format of the output files.
+        compression (str): Compression format of the output files.
+        jsonld_format (str): Format of the JSON-LD files.
+        jsonld_output (bool): If True, JSON-LD files are written
+            while converting.
+        max_file_size (int): If greater than 0, the output is split into
+            files of at most this size in bytes.
+        table_output (str): Format of the table of interactions, or "none".
+        manifest (bool): If True, a manifest of the split files is written.
+
+    Returns:
+        tuple[IO[str] | TextShardWriter, JsonldShardWriter | None,
+        InteractionTableWriter | None]: The output stream or the writer
+        of the split output files, the writer of the JSON-LD files and
+        the writer of the table, or None for the ones not written.
+    """
+    if max_file_size > 0:
+        # 前回の出力の一覧は新しい一覧を開くと削除されるため先に読み込む
+        previous_shard_paths = read_shard_paths(
+            shard_manifest_file_path(output_file_path)
+        )
+
+        # 一覧は全ファイルを閉じた後に書き込むため先に開く
+        shard_manifest = (
+            stack.enter_context(
+                open_shard_manifest(
+                    output_file_path, output_format, compression
+                )
+            )
+            if manifest
+            else None
+        )
+
+        output_f = stack.enter_context(
+            open_output_shard_writer(
+                output_file_path,
+                compression,
+                max_file_size,
+                shard_manifest,
+                previous_shard_paths,
+            )
+        )
+
+    else:
+        output_f = stack.enter_context(open_output())
+
+    shard_writer = (
+        stack.enter_context(
+            open_jsonld_shard_writer(
+                jsonld_file_path_prefix(output_file_path),
+                compression,
+                jsonld_format,
+            )
+        )
+        if jsonld_output
+        else None
+    )
+
+    table_writer = (
+        stack.enter_context(open_table_writer(output_file_path, table_output))
+        if table_output != "none"
+        else None
+    )
+
+    return output_f, shard_writer, table_writer
+
+
+def open_output_shard_writer(
+    output_file_path: str,
+    compression: str,
+    max_file_size: int,
+    manifest: ShardManifest | None = None,
+    previous_shard_paths: list[str] | None = None,
+) -> TextShardWriter:
+    """
+    Create the writer of the output split into files of limited size.
+
+    The files are named after the output file, as `<name>_001.ttl`
+    for `<name>.ttl` and so on, in the same directory.
+
+    Args:
+        output_file_path (str): Path to the output file, with the extension
+            of the compression format if the output is compressed.
+        compression (str): Compression format of the files.
+        max_file_size (int): Maximum size of each file in bytes
+            (before compression).
+        manifest (ShardManifest | None): If specified, each written file
+            is added to the manifest.
+        previous_shard_paths (list[str] | None): Paths to the files listed
+            in the manifest of the previous output, which are removed.
+            If None, the previous files are found by their numbers.
+
+    Returns:
+        TextShardWriter: The writer. The header of each file is set with
+        write_output_header once the conversion plan is known.
+    """
+
+    def shard_written(file_path: str, count: int) -> None:
+        logger.info(f"Written {count} entries to {file_path}")
+
+        if manifest is not None:
+            manifest.add_shard(file_path, count)
+
+    file_path_prefix, file_extension = os.path.splitext(
+        strip_compression_extension(output_file_path)
+    )
+
+    return TextShardWriter(
+        file_path_prefix,
+        compressed_file_path(file_extension, compression),
+        max_file_size,
+        partial(open_output_file, compression=compression),
+        shard_written=shard_written,
+        previous_shard_paths=previous_shard_paths,
+    )
+
+
+def shard_manifest_file_path(output_file_path: str) -> str:
+    """
+    Get the path to the manifest of the split output files,
+    `<name>.manifest.json` for `<name>.nt` and so on.
+
+    Args:
+        output_file_path (str): Path to the output file, with the extension
+            of the compression format if the output is compressed.
+
+    Returns:
+        str: The path to the manifest file.
+    """
+    return (
+        os.path.splitext(strip_compression_extension(output_file_path))[0]
+        + settings.MANIFEST_SUFFIX
+    )
+
+
+def open_shard_manifest(
+    output_file_path: str, output_format: str, compression: str
+) -> ShardManifest:
+    """
+    Create the writer of the manifest of the split output files,
+    named `<name>.manifest.json` for `<name>.nt` and so on.
+
+    Args:
+        output_file_path (str): Path to the output file, with the extension
+            of the compression format if the output is compressed.
+        output_format (str): Format of the output files.
+        compression (str): Compression format of the output files.
+
+    Returns:
+        ShardManifest: The writer, which writes the manifest when it is
+        closed after the output files.
+    """
+    return ShardManifest(
+        shard_manifest_file_path(output_file_path),
+        {"format": output_format, "compression": compression},
+        settings.MANIFEST_CHECKSUM_THREADS,
+    )
+
+
+def write_output_header(
+    output_f: IO[str] | TextShardWriter, plan: ConversionPlan
+) -> None:
+    """
+    Write the header of the output format at the start of the output,
+    or at the start of each file if the output is split.
+
+    Only Turtle has a header, which declares the prefixes of the context.
+
+    Args:
+        output_f (IO[str] | TextShardWriter): The output stream opened at
+            its beginning, or the writer of the split output files.
+        plan (ConversionPlan): The conversion plan.
+    """
+    if plan.turtle_serializer is None:
+        return
+
+    if isinstance(output_f, TextShardWriter):
+        output_f.header = plan.turtle_serializer.header
+
+    else:
+        output_f.write(plan.turtle_serializer.header)
+
+
+def open_table_writer(
+    output_file_path: str, table_format: str
+) -> InteractionTableWriter:
+    """
+    Create the writer of the table of interactions, named after
+    the output file, as `<name>.parquet` for `<name>.jsonl` and so on.
+
+    Args:
+        output_file_path (str): Path to the output file, with the extension
+            of the compression format if the output is compressed.
+        table_format (str): Table format ("parquet" or "arrow").
+
+    Returns:
+        InteractionTableWriter: The writer.
+    """
+    table_file_path = (
+        os.path.splitext(strip_compression_extension(output_file_path))[0]
+        + TABLE_FORMAT_EXTENSIONS[table_format]
+    )
+
+    logger.info(f"Writing the table of interactions to {table_file_path}")
+
+    return InteractionTableWriter(
+        table_file_path, table_format, settings.TABLE_BATCH_SIZE
+    )
+
+
+def open_jsonld_shard_writer(
+    json_file_path_prefix: str,
+    compression: str = "none",
+    jsonld_format: str = "indented",
+) -> JsonldShardWriter:
+    """
+    Create the writer of the JSON-LD files, which streams each record
+    to the current file.
+
+    Args:
+        json_file_path_prefix (str): Prefix for the output JSON-LD files.
+        compression (str): Compression format of the JSON-LD files
+            ("none", "gzip" or "zstd"). The files are compressed in background
+            threads while they are written.
+        jsonld_format (str): Format of the JSON-LD files
+            ("indented" or "compact").
+
+    Returns:
+        JsonldShardWriter: The writer.
+    """
+    return JsonldShardWriter(
+        json_file_path_prefix,
+        compressed_file_path(".jsonld", compression),
+        load_json_file(settings.CONTEXT_LOCAL_FILE_PATH)["@context"],
+        settings.JSONLD_MAX_FILE_SIZE,
+        get_json_serializer(),
+        partial(open_output_file, compression=compression),
+        jsonld_format,
+        shard_written=lambda file_path, count: logger.info(
+            f"Written {count} entries to {file_path}"
+        ),
+    )
+
+
+def output_jsonld_files(
+    output_file_path: str,
+    hide_progress: bool,
+    progress: RichProgress | None = None,
+    compression: str = "none",
+    jsonld_format: str = "indented",
+) -> None:
+    """
+    Generate JSON-LD files from the output JSONL file.
+
+    The files are written to the `<output_file_basename>_jsonld` folder.
+
+    Args:
+        output_file_path (str): Path to the output JSONL file.
+        hide_progress (bool): Whether to hide the progress bar or not.
+        progress (RichProgress | None): Progress display shared with other
+            conversions. If None, a progress display is created.
+        compression (str): Compression format of the JSON-LD files.
+        jsonld_format (str): Format of the JSON-LD files
+            ("indented" or "compact").
+    """
+    # JSONLファイルをJSON-LD形式に変換して新しいパスに出力
+    jsonl2json(
+        output_file_path,
+        jsonld_file_path_prefix(output_file_path),
+        hide_progress,
+        progress,
+        compression,
+        jsonld_format,
+    )
+
+
+def jsonld_file_path_prefix(output_file_path: str) -> str:
+    """
+    Get the prefix of the JSON-LD files of an output JSONL file,
+    creating the `<output_file_basename>_jsonld` folder.
+
+    Args:
+        output_file_path (str): Path to the output JSONL file.
+
+    Returns:
+        str: The prefix, `<folder>/<output_file_basename>.jsonld`.
+    """
+    # 出力ファイル名から拡張子 (圧縮形式の拡張子を含む) を除去して基本名を取得
+    base = os.path.splitext(strip_compression_extension(output_file_path))[0]
+
+    # 基本名を使用して新しいフォルダパスを生成
+    new_folder_path = os.path.join(
+        os.path.dirname(base), os.path.basename(base) + "_jsonld"
+    )
+
+    # 新しいフォルダが存在しなければ作成
+    if not os.path.exists(new_folder_path):
+        os.makedirs(new_folder_path)
+
+    # JSON-LDファイルの新しい出力パスを設定
+    new_output_path = os.path.join(
+        new_folder_path, os.path.basename(base) + ".jsonld"
+    )
+
+    return new_output_path
+
+
+# 読み込んだJSONファイル (ファイルパス -> (更新時刻, データ))
+_json_file_cache: dict[str, tuple[int, Any]] = {}
+
+# 変換プラン ((taxonomy, ヘッダ, pyld使用, 出力形式)
+# -> (定義ファイルの更新時刻, プラン))
+_conversion_plan_cache: dict[
+    tuple[str, tuple[str, ...], bool, str],
+    tuple[tuple[int, ...], ConversionPlan],
+] = {}
+
+# ワーカープロセスごとの変換プラン (_init_workerで初期化)
+_worker_plan: ConversionPlan | None = None
+
+# JSONシリアライザ (get_json_serializerで初期化)
+_json_serializer: JsonSerializer | None = None
+
+
+def get_json_serializer() -> JsonSerializer:
+    """
+    Get the JSON serializer selected by settings.JSON_SERIALIZER.
+
+    The serializer is created once per process. It writes the same output
+    as the json module, using orjson where it is installed and compatible.
+
+    Returns:
+        JsonSerializer: The serializer.
+    """
+    global _json_serializer
+
+    if _json_serializer is None:
+        _json_serializer = create_json_serializer(settings.JSON_SERIALIZER)
+
+        logger.info(f"JSON serializer: {_json_serializer.name}")
+
+    return _json_serializer
+
+
+def load_json_file(file_path: str) -> Any:
+    """
+    Load a JSON file, reusing the loaded data while the file is not modified.
+
+    The returned data is shared between callers and must not be modified.
+
+    Args:
+        file_path (str): Path to the JSON file.
+
+    Returns:
+        Any: The loaded data.
+    """
+    mtime = os.stat(file_path).st_mtime_ns
+
+    cached = _json_file_cache.get(file_path)
+
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with open(file_path, "r") as f:
+        data = json.load(f)
+
+    _json_file_cache[file_path] = (mtime, data)
+
+    return data
+
+
+def get_conversion_plan(
+    taxonomy: str,
+    tax_id: Any,
+    headers: list[str],
+    read_samples: Callable[[], list[str]],
+    use_pyld: bool = False,
+    output_format: str = "jsonl",
+) -> ConversionPlan:
+    """
+    Get the conversion plan for a taxonomy and header row.
+
+    The plan is cached in the process and rebuilt when the taxonomy
+    definition file, the column mapping file or the context file is modified.
+
+    Args:
+        taxonomy (str): Taxonomy name.
+        tax_id (Any): Taxonomy ID associated with the records.
+        headers (list[str]): Header names of the TSV file.
+        read_samples (Callable[[], list[str]]): Function that reads the sample
+            data rows, from which the column types are inferred when the plan
+            is built.
+        use_pyld (bool): If True, the plan converts the records with pyld.
+        output_format (str): Format of the output.
+
+    Returns:
+        ConversionPlan: The conversion plan.
+    """
+    column_mapper_path = os.path.join(
+        settings.COLUMN_MAPPER_DIR, f"{taxonomy}.json"
+    )
+
+    mtimes = tuple(
+        os.stat(file_path).st_mtime_ns
+        for file_path in (
+            settings.TAXONOMY_FILE_PATH,
+            column_mapper_path,
+            settings.CONTEXT_LOCAL_FILE_PATH,
+        )
+    )
+
+    cache_key = (taxonomy, tuple(headers), use_pyld, output_format)
+
+    cached = _conversion_plan_cache.get(cache_key)
+
+    if cached is not None and cached[0] == mtimes:
+        logger.info(f"Reusing conversion plan: {taxonomy}")
+
+        return cached[1]
+
+    plan = build_conversion_plan(
+        taxonomy,
+        tax_id,
+        headers,
+        column_mapper_path,
+        read_samples,
+        use_pyld,
+        output_format,
+    )
+
+    _conversion_plan_cache[cache_key] = (mtimes, plan)
+
+    return plan
+
+
+def build_conversion_plan(
+    taxonomy: str,
+    tax_id: Any,
+    headers: list[str],
+    column_mapper_path: str,
+    read_samples: Callable[[], list[str]],
+    use_pyld: bool = False,
+    output_format: str = "jsonl",
+) -> ConversionPlan:
+    """
+    Build the conversion plan for a taxonomy and header row.
+
+    Args:
+        taxonomy (str): Taxonomy name.
+        tax_id (Any): Taxonomy ID associated with the records.
+        headers (list[str]): Header names of the TSV file.
+        column_mapper_path (str): Path to the column mapping file.
+        read_samples (Callable[[], list[str]]): Function that reads
+            the sample data rows.
+        use_pyld (bool): If True, the records are converted with pyld.
+        output_format (str): Format of the output.
+
+    Returns:
+        ConversionPlan: The conversion plan.
+    """
+    # 列名マッピングファイルの読み込み
+    logger.info("Loading column mapping...")
+
+    column_mapper = load_column_mapper(column_mapper_path)
+
+    logger.info("Column mapping loaded.")
+
+    # JSON-LDコンテキストファイルの読み込み
+    logger.info("Loading JSON-LD context...")
+
+    # 読み込んだファイルのキャッシュと共有しないよう複製する
+    context = copy.deepcopy(
+        load_json_file(settings.CONTEXT_LOCAL_FILE_PATH)["@context"]
+    )
+
+    logger.info("JSON-LD context loaded.")
+
+    emitter = None if use_pyld else compile_jsonld_emitter(context)
+
+    # ワーカープロセスに引き継がれるようにシリアライザを作成しておく
+    get_json_serializer()
+
+    mapped_headers, column_parsers = build_column_parsers(
+        headers, column_mapper, read_samples
+    )
+
+    header_index = {
+        header: index
+        for index, header in enumerate(mapped_headers)
+        if header is not None
+    }
+
+    # UniProt IDの列がない場合はUniProtエントリをparticipantとする
+    participant_columns = list(settings.PARTICIPANTS)
+
+    if (
+        settings.UNIPROT_ID_COLUMN not in header_index
+        and settings.UNIPROT_ENTRY_COLUMN not in participant_columns
+    ):
+        participant_columns.append(settings.UNIPROT_ENTRY_COLUMN)
+
+    return ConversionPlan(
+        taxonomy=taxonomy,
+        tax_id=tax_id,
+        headers=tuple(headers),
+        mapped_headers=tuple(mapped_headers),
+        header_index=header_index,
+        column_parsers=tuple(column_parsers),
+        context=context,
+        emitter=emitter,
+        participant_columns=tuple(participant_columns),
+        node_id_column=settings.NODE_ID_COLUMN,
+        node_id_prefix=settings.NODE_ID_PREFIX,
+        node_type=settings.NODE_TYPE,
+        data_source_prefix=settings.DATA_SOURCE_PREFIX,
+        reference_prefix=settings.REFERENCE_PREFIX,
+        taxonomy_value=f"taxid:{tax_id}",
+        output_format=output_format,
+        data_source_iri=(
+            context_term_iri(context, "data_source")
+            if output_format == "nquads"
+            else None
+        ),
+        turtle_serializer=(
+            TurtleSerializer(context_prefixes(context))
+            if output_format == "turtle"
+            else None
+        ),
+    )
+
+
+def _init_worker(plan: ConversionPlan) -> None:
+    """
+    Initialize the conversion plan of a worker process.
+
+    Called once per worker process so that rows can be converted
+    without sending the plan with each task.
+
+    Args:
+        plan (ConversionPlan): The conversion plan.
+    """
+    global _worker_plan
+
+    _worker_plan = plan
+
+
+def iter_byte_range_chunks(
+    input_file_path: str,
+    data_offset: int,
+    chunk_bytes: int,
+    progress: RichProgress,
+    task_id: TaskID,
+) -> Iterator[tuple[str, int, int]]:
+    """
+    Split the data rows of a TSV file into byte ranges to be converted.
+
+    Args:
+        input_file_path (str): Path to the input TSV file.
+        data_offset (int): Byte offset of the first data row.
+        chunk_bytes (int): Approximate size of each range in bytes.
+        progress (RichProgress): Progress display.
+        task_id (TaskID): Progress task advanced as ranges are handed out.
+
+    Yields:
+        tuple[str, int, int]: The input file path and the start and end
+        byte offsets of a range.
+    """
+    for start, end in iter_byte_ranges(
+        input_file_path, data_offset, chunk_bytes
+    ):
+        yield input_file_path, start, end
+
+        progress.update(task_id, completed=end)
+
+
+def _convert_chunk(
+    input_chunk: list[str] | tuple[str, int, int],
+    plan: ConversionPlan,
+    jsonld_format: str | None = None,
+    split_records: bool = False,
+    table_output: bool = False,
+) -> Any:
+    """
+    Converts a block of lines, or a byte range of the input file.
+
+    Args:
+        input_chunk (list[str] | tuple[str, int, int]): A block of lines, or
+            a tuple of the input file path and the start and end byte offsets.
+        plan (ConversionPlan): The conversion plan.
+        jsonld_format (str | None): If specified, the records are also
+            serialized as elements of `@graph` of the JSON-LD files
+            in this format ("indented" or "compact").
+        split_records (bool): If True, the output of each row is returned
+            as an element of a list instead of being joined into one string.
+        table_output (bool): If True, the rows of the table of interactions
+            are also returned.
+
+    Returns:
+        Any: The output in the output format of the plan
+        (str | list[str]), paired with the elements of `@graph` if
+        jsonld_format is specified, and then with the rows of the table
+        if table_output is True.
+    """
+    if isinstance(input_chunk, tuple):
+        input_chunk = read_byte_range(*input_chunk)
+
+    table_rows: list[tuple[Any, ...]] | None = [] if table_output else None
+
+    if plan.output_format != "jsonl":
+        records = lines_to_rdf_records(input_chunk, plan, table_rows)
+
+        converted = records if split_records else "".join(records)
+
+    elif jsonld_format is not None:
+        converted = lines_to_jsonld_lines_and_graph_items(
+            input_chunk, plan, jsonld_format, split_records, table_rows
+        )
+
+    elif split_records or table_output:
+        json_lines = lines_to_jsonld_lines(input_chunk, plan, table_rows)
+
+        converted = json_lines if split_records else "".join(json_lines)
+
+    else:
+        converted = lines_to_jsonld_lines_str(input_chunk, plan)
+
+    if table_rows is not None:
+        return converted, table_rows
+
+    return converted
+
+
+def _convert_chunk_in_worker(
+    input_chunk: list[str] | tuple[str, int, int],
+    jsonld_format: str | None = None,
+    split_records: bool = False,
+    table_output: bool = False,
+) -> Any:
+    """Converts a block using the plan initialized by _init_worker."""
+    return _convert_chunk(
+        input_chunk, _worker_plan, jsonld_format, split_records, table_output
+    )
+
+
+def convert_chunks(
+    input_chunks: Iterable[list[str] | tuple[str, int, int]],
+    plan: ConversionPlan,
+    workers: int,
+    use_process_pool: bool = False,
+    jsonld_format: str | None = None,
+    split_records: bool = False,
+    table_output: bool = False,
+) -> Iterator[Any]:
+    """
+    Convert blocks of TSV lines and yield the output in input order.
+
+    Args:
+        input_chunks (Iterable[list[str] | tuple[str, int, int]]): Blocks of
+            lines, or byte ranges of the input file.
+        plan (ConversionPlan): The conversion plan.
+        workers (int): Number of worker processes. If 1, the blocks are
+            converted in the main process.
+        use_process_pool (bool): If True, the blocks are converted in worker
+            processes even if workers is 1.
+        jsonld_format (str | None): If specified, the records are also
+            serialized as elements of `@graph` of the JSON-LD files
+            in this format ("indented" or "compact").
+        split_records (bool): If True, the output of each row is yielded
+            as an element of a list instead of being joined into one string.
+        table_output (bool): If True, the rows of the table of interactions
+            are also yielded.
+
+    Yields:
+        Any: The output of each block, paired with the elements of `@graph`
+        if jsonld_format is specified, and then with the rows of the table
+        if table_output is True.
+    """
+    if workers > 1 or use_process_pool:
+        # マルチプロセスで高速化
+        logger.info(f"Multiprocess: max_workers={workers}")
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(plan,),
+        ) as executor:
+            yield from iter_ordered_results(
+                executor,
+                partial(
+                    _convert_chunk_in_worker,
+                    jsonld_format=jsonld_format,
+                    split_records=split_records,
+                    table_output=table_output,
+                ),
+                input_chunks,
+                max_pending=workers * settings.MAX_PENDING_PER_WORKER,
+            )
+
+    else:
+        for input_chunk in input_chunks:
+            yield _convert_chunk(
+                input_chunk, plan, jsonld_format, split_records, table_output
+            )
+
+
+def iter_ordered_results(
+    executor: Executor,
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_pending: int,
+) -> Iterator[Any]:
+    """
+    Apply a function to items in an executor and yield results in input order.
+
+    Unlike Executor.map, items are submitted lazily so that at most
+    max_pending tasks are in flight, which keeps memory bounded
+    for large input files.
+
+    Args:
+        executor (Executor): The executor that runs the tasks.
+        fn (Callable[[Any], Any]): The function applied to each item.
+        items (Iterable[Any]): The items to process.
+        max_pending (int): Maximum number of tasks submitted but not yet
+            yielded.
+
+    Yields:
+        Any: The result of fn for each item, in the order of items.
+    """
+    pending: deque[Future] = deque()
+
+    for item in items:
+        pending.append(executor.submit(fn, item))
+
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
+
+
+def is_gzip_file(file_path: str) -> bool:
+    """
+    Check whether a file is compressed in gzip format.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        bool: True if the file starts with the gzip magic number.
+    """
+    with open(file_path, "rb") as f:
+        return f.read(len(GZIP_MAGIC_NUMBER)) == GZIP_MAGIC_NUMBER
+
+
+def open_tsv_stream(binary_f: IO[bytes], compressed: bool) -> IO[str]:
+    """
+    Open a binary stream of a TSV file, or of a gzip-compressed TSV file,
+    as text.
+
+    Closing the returned stream does not close binary_f when it is compressed.
+
+    Args:
+        binary_f (IO[bytes]): The binary stream.
+        compressed (bool): Whether the stream is compressed in gzip format.
+
+    Returns:
+        IO[str]: The text stream.
+    """
+    if compressed:
+        return gzip.open(binary_f, "rt")
+
+    return io.TextIOWrapper(binary_f)
+
+
+def open_decompressed_stream(
+    binary_f: IO[bytes], compressed: bool
+) -> IO[bytes]:
+    """
+    Open a binary stream of a TSV file, or of a gzip-compressed TSV file,
+    as a buffered binary stream of the TSV data.
+
+    The positions of the returned stream are byte offsets in the TSV data.
+    Closing the returned stream does not close binary_f when it is compressed.
+
+    Args:
+        binary_f (IO[bytes]): The binary stream.
+        compressed (bool): Whether the stream is compressed in gzip format.
+
+    Returns:
+        IO[bytes]: The binary stream of the TSV data.
+    """
+    if compressed:
+        return gzip.GzipFile(fileobj=binary_f, mode="rb")
+
+    return io.BufferedReader(binary_f)
+
+
+def open_tsv_file(file_path: str) -> IO[str]:
+    """
+    Open a TSV file, or a gzip-compressed TSV file, as text.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        IO[str]: The text stream.
+    """
+    if is_gzip_file(file_path):
+        return gzip.open(file_path, "rt")
+
+    return open(file_path, "r")
+
+
+def read_tsv_headers(input_f: IO[str] | IO[bytes]) -> list[str]:
+    """
+    Skip to the header row of a TSV file and return the header names.
+
+    After this function returns, input_f is positioned at the first data row.
+
+    Args:
+        input_f (IO[str] | IO[bytes]): The TSV file opened at its beginning.
+
+    Returns:
+        list[str]: The header names.
+    """
+    # ヘッダ行をスキップ
+    for i in range(settings.HEADER_ROW_NUMBER - 1):
+        input_f.readline()
+
+    # ヘッダ行の取得と加工
+    headers = input_f.readline()
+
+    if isinstance(headers, bytes):
+        headers = headers.decode("utf-8")
+
+    if headers.endswith("\n"):
+        headers = headers.rstrip("\n")
+
+    return headers.strip(settings.HEADER_ROW_PREFIX).split("\t")
+
+
+def read_sample_lines(
+    input_file_path: str,
+    sample_size: int = settings.TYPE_INFERENCE_SAMPLE_SIZE,
+) -> list[str]:
+    """
+    Read the first data rows of a TSV file to infer the column types.
+
+    Args:
+        input_file_path (str): Path to the input TSV file.
+        sample_size (int): Maximum number of rows to read.
+
+    Returns:
+        list[str]: The data rows read.
+    """
+    with open_tsv_file(input_file_path) as f:
+        read_tsv_headers(f)
+
+        return list(islice(f, sample_size))
+
+
+def build_column_parsers(
+    headers: list[str],
+    column_mapper: dict[str, ColumnSchema],
+    read_samples: Callable[[], list[str]],
+) -> tuple[list[str | None], list[ColumnParser | None]]:
+    """
+    Create a parser for each mapped column.
+
+    Columns with a type declared in the column mapping file use that type.
+    The types of the other mapped columns are inferred from sample rows.
+
+    Args:
+        headers (list[str]): The header names of the TSV file.
+        column_mapper (dict[str, ColumnSchema]): The column definition
+            of each header.
+        read_samples (Callable[[], list[str]]): Function that reads
+            the sample data rows.
+
+    Returns:
+        tuple[list[str | None], list[ColumnParser | None]]: The mapped header
+        and the parser of each column, or None for columns that are not mapped.
+    """
+    column_schemas = [column_mapper.get(header, None) for header in headers]
+
+    # 型が宣言されていない列がある場合のみサンプル行を読み込む
+    if any(
+        schema is not None and schema.type is None for schema in column_schemas
+    ):
+        sample_rows = [line.strip().split("\t") for line in read_samples()]
+
+    else:
+        sample_rows = []
+
+    column_parsers: list[ColumnParser | None] = []
+
+    for index, schema in enumerate(column_schemas):
+        if schema is None:
+            # マッピングされていない列は解析しない
+            column_parsers.append(None)
+
+        elif schema.type is not None:
+            column_parsers.append(
+                ColumnParser(
+                    schema.type, schema.delimiter, schema.na, declared=True
+                )
+            )
+
+        else:
+            column_type = infer_column_type(
+                (row[index] for row in sample_rows if index < len(row)),
+                schema.delimiter,
+                schema.na,
+            )
+
+            column_parsers.append(
+                ColumnParser(column_type, schema.delimiter, schema.na)
+            )
+
+    mapped_headers = [
+        schema.key if schema is not None else None for schema in column_schemas
+    ]
+
+    logger.info(
+        "Column types: "
+        + ", ".join(
+            f"{header}={parser.column_type}"
+            + (" (declared)" if parser.declared else "")
+            for header, parser in zip(mapped_headers, column_parsers)
+            if parser is not None
+        )
+    )
+
+    return mapped_headers, column_parsers
+
+
+def parse_tsv_lines(
+    input_lines: Iterable[str],
+    mapped_headers: list[str],
+    column_parsers: list[ColumnParser | None] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Parse TSV lines into records keyed by the mapped headers.
+
+    The cells are converted column by column, and columns that are not
+    mapped are not parsed.
+
+    Args:
+        input_lines (Iterable[str]): The lines from TSV to be parsed.
+        mapped_headers (list[str]): Mapped headers corresponding to the TSV columns.
+        column_parsers (list[ColumnParser | None] | None): Parser of each
+            column. If None, every cell is parsed with parse_field.
+
+    Returns:
+        list[dict[str, Any]]: The parsed records.
+    """
+    rows = [input_line.strip().split("\t") for input_line in input_lines]
+
+    if column_parsers is None:
+        column_parsers = [parse_field] * len(mapped_headers)
+
+    columns = [
+        (index, header, parser)
+        for index, (header, parser) in enumerate(
+            zip(mapped_headers, column_parsers)
+        )
+        if header is not None
+    ]
+
+    if not columns:
+        return [{} for row in rows]
+
+    # 全行の列数が揃っている場合は列ごとにまとめて変換
+    if rows and min(len(row) for row in rows) >= len(mapped_headers):
+        keys = [header for index, header, parser in columns]
+
+        column_values = [
+            list(map(parser, [row[index] for row in rows]))
+            for index, header, parser in columns
+        ]
+
+        return [dict(zip(keys, values)) for values in zip(*column_values)]
+
+    return [
+        {
+            header: parser(row[index])
+            for index, header, parser in columns
+            if index < len(row)
+        }
+        for row in rows
+    ]
+
+
+def iter_line_chunks(
+    lines: Iterable[str], chunk_size: int, chunk_bytes: int | None = None
+) -> Iterator[list[str]]:
+    """
+    Group lines into blocks of at most chunk_size lines.
+
+    Args:
+        lines (Iterable[str]): The lines to group.
+        chunk_size (int): Maximum number of lines in a block.
+        chunk_bytes (int | None): If specified, a block is also closed once
+            the total length of its lines reaches this value.
+
+    Yields:
+        list[str]: A block of lines.
+    """
+    chunk: list[str] = []
+    chunk_length = 0
+
+    for line in lines:
+        chunk.append(line)
+
+        if chunk_bytes is not None:
+            chunk_length += len(line)
+
+        if len(chunk) >= chunk_size or (
+            chunk_bytes is not None and chunk_length >= chunk_bytes
+        ):
+            yield chunk
 
-        os.makedirs(data_dir, exist_ok=True)
+            chunk = []
+            chunk_length = 0
 
-        f_name = url.split("/")[-1]
+    if chunk:
+        yield chunk
 
-        f_name_without_ext = os.path.splitext(f_name)[0]
 
-        gzip_file_path = os.path.join(data_dir, f_name)
+def iter_binary_line_chunks(
+    input_f: IO[bytes],
+    offset: int,
+    chunk_size: int,
+    chunk_bytes: int | None = None,
+) -> Iterator[tuple[bytes, int]]:
+    """
+    Group the lines of a binary TSV stream into blocks of at most
+    chunk_size lines.
 
-        decomp_file_path = os.path.join(data_dir, f_name_without_ext)
+    Args:
+        input_f (IO[bytes]): The binary TSV stream.
+        offset (int): Byte offset of the current position of input_f.
+        chunk_size (int): Maximum number of lines in a block.
+        chunk_bytes (int | None): If specified, a block is also closed once
+            its size in bytes reaches this value.
+
+    Yields:
+        tuple[bytes, int]: A block of lines as UTF-8 bytes, and the byte
+        offset of the end of the block.
+    """
+    for lines in iter_line_chunks(input_f, chunk_size, chunk_bytes):
+        chunk = b"".join(lines)
 
-        if not skip_download:
-            with requests.get(url, stream=True) as r:
-                with open(gzip_file_path, "wb") as f:
-                    for chunk in r.iter_content(chunk_size=1024 * 1024):
-                        f.write(chunk)
+        offset += len(chunk)
 
-            logger.info("Download of target file completed.")
-            logger.info("Start decompression of target files...")
+        yield chunk, offset
 
-            with gzip.open(gzip_file_path, "rb") as gz_f:
-                with open(decomp_file_path, "wb") as decomp_f:
-                    shutil.copyfileobj(gz_f, decomp_f)
 
-            logger.info("Decompression of the target file is complete.")
+def lines_to_jsonld_lines_str(
+    input_lines: Iterable[str] | bytes, plan: ConversionPlan
+) -> str:
+    """Converts a block of lines from a TSV file to lines
+    in JSON-LD format of JSON Lines.
 
-        else:
-            logger.info("Download and decompression of target file skipped.")
+    Args:
+        input_lines (Iterable[str] | bytes): The lines from TSV to be
+            converted, or a block of the TSV file as UTF-8 bytes.
+        plan (ConversionPlan): The conversion plan.
 
-        return decomp_file_path
+    Returns:
+        str: The JSON-LD formatted lines joined into one string,
+        each terminated by a newline.
+    """
+    return "".join(lines_to_jsonld_lines(input_lines, plan))
 
-    except Exception as e:
-        logger.exception(e)
 
-        raise
+def lines_to_jsonld_lines(
+    input_lines: Iterable[str] | bytes,
+    plan: ConversionPlan,
+    table_rows: list[tuple[Any, ...]] | None = None,
+) -> list[str]:
+    """Converts a block of lines from a TSV file to lines
+    in JSON-LD format of JSON Lines.
 
+    Args:
+        input_lines (Iterable[str] | bytes): The lines from TSV to be
+            converted, or a block of the TSV file as UTF-8 bytes.
+        plan (ConversionPlan): The conversion plan.
+        table_rows (list[tuple[Any, ...]] | None): If specified, the row of
+            the table of interactions of each record is appended to it.
 
-@app.command()
-def tsv2jsonld(
-    input_file_path: Annotated[
-        str, typer.Argument(help="Path to the input TSV file.")
-    ],
-    output_file_path: Annotated[
-        str, typer.Argument(help="Path to the output JSONL file.")
-    ],
-    taxonomy: Annotated[
-        str,
-        typer.Option(
-            help="""Specify taxonomy.
-            If not specified, the taxonomy is included in the file name.
-            """
-        ),
-    ] = "",
-    hide_progress: Annotated[
-        bool,
-        typer.Option(help="Show progress bar if this option is specified."),
-    ] = False,
-    jsonld_output: Annotated[
-        bool,
-        typer.Option(help="If specified, output will be in JSON-LD format."),
-    ] = False,
-) -> None:
-    """
-    Convert TSV format files to JSON Lines files in JSON-LD format
+    Returns:
+        list[str]: The JSON-LD formatted lines, each terminated by a newline.
     """
-    # 変換処理開始のログ出力
-    logger.info("Starting TSV to JSON-LD convert processing...")
+    if isinstance(input_lines, bytes):
+        # テキストモードでファイルを読み込んだ場合と同じ改行の扱いで行に分割
+        input_lines = io.StringIO(input_lines.decode("utf-8"), newline=None)
 
-    try:
-        # 出力フォルダのチェックと作成
-        output_dir = os.path.dirname(output_file_path)
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+    json_records = parse_tsv_lines(
+        input_lines, plan.mapped_headers, plan.column_parsers
+    )
 
-        taxonomy, tax_id = get_taxonomy_id(taxonomy, input_file_path)
+    if table_rows is None:
+        return [
+            record_to_jsonld_line_str(json_record, plan) + "\n"
+            for json_record in json_records
+        ]
 
-        # 列名マッピングファイルの読み込み
-        logger.info("Loading column mapping...")
+    json_lines = []
 
-        with open(
-            os.path.join(settings.COLUMN_MAPPER_DIR, f"{taxonomy}.json"), "r"
-        ) as f:
-            column_mapper = json.load(f)
+    for json_record in json_records:
+        json_lines.append(record_to_jsonld_line_str(json_record, plan) + "\n")
 
-        logger.info("Column mapping loaded.")
+        # json_recordは変換時にノードに変更されている
+        table_rows.append(node_table_row(json_record))
 
-        # JSON-LDコンテキストファイルの読み込み
-        logger.info("Loading JSON-LD context...")
+    return json_lines
 
-        with open(settings.CONTEXT_LOCAL_FILE_PATH, "r") as f:
-            context = json.load(f)["@context"]
 
-        logger.info("JSON-LD context loaded.")
+def lines_to_jsonld_lines_and_graph_items(
+    input_lines: Iterable[str] | bytes,
+    plan: ConversionPlan,
+    jsonld_format: str = "indented",
+    split_records: bool = False,
+    table_rows: list[tuple[Any, ...]] | None = None,
+) -> tuple[str | list[str], list[str]]:
+    """Converts a block of lines from a TSV file to lines
+    in JSON-LD format of JSON Lines, and to elements of `@graph`
+    of the JSON-LD files.
 
-        logger.info(f"Processing file: {input_file_path}")
+    Args:
+        input_lines (Iterable[str] | bytes): The lines from TSV to be
+            converted, or a block of the TSV file as UTF-8 bytes.
+        plan (ConversionPlan): The conversion plan.
+        jsonld_format (str): Format of the JSON-LD files
+            ("indented" or "compact").
+        split_records (bool): If True, the JSON-LD formatted lines are
+            returned as a list instead of being joined.
+        table_rows (list[tuple[Any, ...]] | None): If specified, the row of
+            the table of interactions of each record is appended to it.
+
+    Returns:
+        tuple[str | list[str], list[str]]: The JSON-LD formatted lines joined
+        into one string, and the records serialized as elements of `@graph`.
+    """
+    if isinstance(input_lines, bytes):
+        input_lines = io.StringIO(input_lines.decode("utf-8"), newline=None)
 
-        # 入力ファイルの総行数を計算
-        with open(input_file_path, "r") as f:
-            total_lines = sum(1 for line in f)
+    json_records = parse_tsv_lines(
+        input_lines, plan.mapped_headers, plan.column_parsers
+    )
 
-        # 入力ファイルと出力ファイルを開き、変換処理を実行
-        with open(input_file_path, "r") as input_f, open(
-            output_file_path, "w"
-        ) as output_f:
-            # ヘッダ行をスキップ
-            for i in range(settings.HEADER_ROW_NUMBER - 1):
-                next(input_f)
-                total_lines -= 1
+    json_serializer = get_json_serializer()
 
-            # ヘッダ行の取得と加工
-            headers = input_f.readline()
-            total_lines -= 1
+    json_lines = []
+    graph_items = []
 
-            if headers.endswith("\n"):
-                headers = headers.rstrip("\n")
+    for json_record in json_records:
+        jsonld_record = record_to_jsonld_record(json_record, plan)
 
-            headers = headers.strip(settings.HEADER_ROW_PREFIX).split("\t")
+        json_lines.append(json_serializer.dumps_line(jsonld_record) + "\n")
 
-            mapped_headers = [
-                column_mapper.get(header, None) for header in headers
-            ]
+        if table_rows is not None:
+            # json_recordは変換時にノードに変更されている
+            table_rows.append(node_table_row(json_record))
 
-            # マルチスレッドで高速化
-            with ThreadPoolExecutor() as executor:
-                logger.info(
-                    f"Multithread process: max_workers={executor._max_workers}"
-                )
+        # JSON-LDファイルの@graphには@contextを除いて出力する
+        del jsonld_record["@context"]
 
-                progress = RichProgress(
-                    unit="rows", hide_progress=hide_progress
-                )
+        graph_items.append(
+            graph_item_str(jsonld_record, json_serializer, jsonld_format)
+        )
 
-                # 各行を処理し、JSON-LD形式のデータに変換して出力ファイルへ書き込み
-                with progress:
-                    for input_line in progress.track(
-                        input_f,
-                        total=total_lines,
-                        description="Processing...",
-                    ):
-                        json_str = executor.submit(
-                            line_to_jsonld_line_str,
-                            input_line,
-                            mapped_headers,
-                            context,
-                            tax_id,
-                        )
+    return (json_lines if split_records else "".join(json_lines)), graph_items
 
-                        output_f.write(json_str.result() + "\n")
 
-        # JSONLをJSON-LD形式で出力する場合の処理
-        if jsonld_output:
-            # 出力ファイル名から拡張子を除去して基本名を取得
-            base = os.path.splitext(output_file_path)[0]
+def lines_to_rdf_records(
+    input_lines: Iterable[str] | bytes,
+    plan: ConversionPlan,
+    table_rows: list[tuple[Any, ...]] | None = None,
+) -> list[str]:
+    """Converts a block of lines from a TSV file to N-Triples, N-Quads
+    or Turtle, in the output format of the plan.
 
-            # 基本名を使用して新しいフォルダパスを生成
-            new_folder_path = os.path.join(
-                os.path.dirname(base), os.path.basename(base) + "_jsonld"
-            )
+    Args:
+        input_lines (Iterable[str] | bytes): The lines from TSV to be
+            converted, or a block of the TSV file as UTF-8 bytes.
+        plan (ConversionPlan): The conversion plan.
+        table_rows (list[tuple[Any, ...]] | None): If specified, the row of
+            the table of interactions of each record is appended to it.
+
+    Returns:
+        list[str]: The output of each row, as lines each terminated
+        by a newline.
+    """
+    if isinstance(input_lines, bytes):
+        input_lines = io.StringIO(input_lines.decode("utf-8"), newline=None)
 
-            # 新しいフォルダが存在しなければ作成
-            if not os.path.exists(new_folder_path):
-                os.makedirs(new_folder_path)
+    json_records = parse_tsv_lines(
+        input_lines, plan.mapped_headers, plan.column_parsers
+    )
 
-            # JSON-LDファイルの新しい出力パスを設定
-            new_output_path = os.path.join(
-                new_folder_path, os.path.basename(base) + ".jsonld"
-            )
+    if table_rows is None:
+        return [
+            record_to_rdf_lines_str(json_record, plan)
+            for json_record in json_records
+        ]
 
-            # JSONLファイルをJSON-LD形式に変換して新しいパスに出力
-            jsonl2json(output_file_path, new_output_path, hide_progress)
+    rdf_records = []
 
-    except Exception:
-        # エラー発生時のロギング
-        logger.exception(
-            "An error occurred in the main function.",
-        )
+    for json_record in json_records:
+        rdf_records.append(record_to_rdf_lines_str(json_record, plan))
 
-        raise
+        # json_recordは変換時にノードに変更されている
+        table_rows.append(node_table_row(json_record))
 
-    finally:
-        # 処理完了時のログ出力
-        logger.info("TSV to JSON-LD convert processing finished.")
+    return rdf_records
 
 
-def line_to_jsonld_line_str(
-    input_line: str,
-    mapped_headers: list[str],
-    context: dict[str, str | dict[str, str]],
-    tax_id: Any,
-):
+def line_to_jsonld_line_str(input_line: str, plan: ConversionPlan):
     """Converts a single line from a TSV file to a single line
     in JSON-LD format of JSON Lines.
 
     Args:
         input_line (str): The line from TSV to be converted.
-        mapped_headers (list[str]): Mapped headers corresponding to the TSV columns.
-        context (dict[str, str | dict[str, str]]): Context information for JSON-LD.
-        tax_id (Any): Taxonomy ID associated with the record.
+        plan (ConversionPlan): The conversion plan.
 
     Returns:
         str: The JSON-LD formatted line as a string.
@@ -330,24 +3822,82 @@ def line_to_jsonld_line_str(
         and their corresponding values to form a JSON-LD record,
         and outputs it as a well-formatted JSON-LD string.
     """
-    if input_line.endswith("\n"):
-        input_line = input_line.rstrip("\n")
+    json_record = parse_tsv_lines(
+        [input_line], plan.mapped_headers, plan.column_parsers
+    )[0]
+
+    return record_to_jsonld_line_str(json_record, plan)
+
+
+def record_to_jsonld_line_str(
+    json_record: dict[str, Any], plan: ConversionPlan
+) -> str:
+    """Converts a parsed TSV record to a single line
+    in JSON-LD format of JSON Lines.
+
+    Args:
+        json_record (dict[str, Any]): The record keyed by the mapped headers.
+        plan (ConversionPlan): The conversion plan.
+
+    Returns:
+        str: The JSON-LD formatted line as a string.
+    """
+    jsonld_record = record_to_jsonld_record(json_record, plan)
+
+    json_str = get_json_serializer().dumps_line(jsonld_record)
+
+    return json_str
+
+
+def record_to_jsonld_record(
+    json_record: dict[str, Any], plan: ConversionPlan
+) -> dict[str, Any]:
+    """Converts a parsed TSV record to a record in JSON-LD format.
+
+    Args:
+        json_record (dict[str, Any]): The record keyed by the mapped headers.
+        plan (ConversionPlan): The conversion plan.
+
+    Returns:
+        dict[str, Any]: The JSON-LD formatted record with `@context`.
+    """
+    json_record = record_to_node(json_record, plan)
+
+    if plan.emitter is not None:
+        try:
+            jsonld_record = plan.emitter.compact(json_record)
+
+        except UnsupportedJsonldValueException:
+            # コンパイル済みエミッタで扱えない値はpyldで変換する
+            jsonld_record = convert_to_jsonld(json_record, plan.context)
+
+    else:
+        jsonld_record = convert_to_jsonld(json_record, plan.context)
 
-    fields = input_line.strip().split("\t")
+    return jsonld_record
 
-    parsed_fields: list[
-        str | int | float | list[Any] | dict[str, str | list[str]] | None
-    ] = [parse_field(field) for field in fields]
 
-    json_record = dict(zip(mapped_headers, parsed_fields))
+def record_to_node(
+    json_record: dict[str, Any], plan: ConversionPlan
+) -> dict[str, Any]:
+    """Builds the node of an interaction from a parsed TSV record.
+
+    The node is the record before it is compacted with the JSON-LD context,
+    with the node ID, type, data sources, evidence and participants.
 
-    json_record = {k: v for k, v in json_record.items() if k is not None}
+    Args:
+        json_record (dict[str, Any]): The record keyed by the mapped headers,
+            which is modified into the node.
+        plan (ConversionPlan): The conversion plan.
 
-    id = generate_node_id(json_record[settings.NODE_ID_COLUMN])
+    Returns:
+        dict[str, Any]: The node.
+    """
+    id = generate_node_id(json_record[plan.node_id_column])
 
-    json_record["@id"] = settings.NODE_ID_PREFIX + id
+    json_record["@id"] = plan.node_id_prefix + id
 
-    json_record["@type"] = settings.NODE_TYPE
+    json_record["@type"] = plan.node_type
 
     json_record["label"] = id
 
@@ -355,12 +3905,12 @@ def line_to_jsonld_line_str(
 
     if isinstance(data_sources, list):
         data_sources = [
-            settings.DATA_SOURCE_PREFIX + str(data_source).lower()
+            plan.data_source_prefix + str(data_source).lower()
             for data_source in data_sources
         ]
 
     else:
-        data_sources = settings.DATA_SOURCE_PREFIX + str(data_sources).lower()
+        data_sources = plan.data_source_prefix + str(data_sources).lower()
 
     json_record["data_source"] = data_sources
 
@@ -368,30 +3918,21 @@ def line_to_jsonld_line_str(
 
     if isinstance(references, list):
         references = [
-            settings.REFERENCE_PREFIX + str(reference)
-            for reference in references
+            plan.reference_prefix + str(reference) for reference in references
         ]
 
     else:
-        references = settings.REFERENCE_PREFIX + str(references)
+        references = plan.reference_prefix + str(references)
 
     json_record["evidence"] = {"reference": references}
 
     # participantの処理
     new_participants = []
 
-    target_participants = settings.PARTICIPANTS
-
-    if (
-        settings.UNIPROT_ID_COLUMN not in json_record
-        and settings.UNIPROT_ENTRY_COLUMN not in target_participants
-    ):
-        target_participants.append(settings.UNIPROT_ENTRY_COLUMN)
-
-    if settings.UNIPROT_ENTRY_COLUMN not in target_participants:
+    if settings.UNIPROT_ENTRY_COLUMN not in plan.participant_columns:
         del json_record[settings.UNIPROT_ENTRY_COLUMN]
 
-    for participant in target_participants:
+    for participant in plan.participant_columns:
         if participant in json_record:
             participant_value = json_record.get(participant)
 
@@ -410,13 +3951,118 @@ def line_to_jsonld_line_str(
 
     json_record["participant"] = new_participants
 
-    json_record["taxonomy"] = f"taxid:{tax_id}"
+    json_record["taxonomy"] = plan.taxonomy_value
 
-    jsonld_record = convert_to_jsonld(json_record, context)
+    return json_record
 
-    json_str = json.dumps(jsonld_record, sort_keys=True)
 
-    return json_str
+def node_table_row(node: dict[str, Any]) -> tuple[Any, ...]:
+    """Gets the row of the table of interactions from the node
+    of an interaction.
+
+    The values are those of the JSONL record, with the data sources,
+    references and participants as lists even if there is only one.
+
+    Args:
+        node (dict[str, Any]): The node made by record_to_node.
+
+    Returns:
+        tuple[Any, ...]: The values in the order of INTERACTION_TABLE_COLUMNS.
+        The confidence is the highest one if the record has several,
+        and None if it has no numeric confidence.
+    """
+
+    def to_list(value: Any) -> list[Any]:
+        if value is None:
+            return []
+
+        return value if isinstance(value, list) else [value]
+
+    confidence = None
+
+    for value in to_list(node.get("confidence")):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+
+        # NaNより数値を優先し、最大の値を使用する
+        if (
+            confidence is None
+            or confidence != confidence
+            or value > confidence
+        ):
+            confidence = float(value)
+
+    return (
+        node["@id"],
+        [str(v) for v in to_list(node["participant"])],
+        [str(v) for v in to_list(node.get("data_source"))],
+        [str(v) for v in to_list(node["evidence"]["reference"])],
+        confidence,
+        node["taxonomy"],
+    )
+
+
+def record_to_rdf_lines_str(
+    json_record: dict[str, Any], plan: ConversionPlan
+) -> str:
+    """Converts a parsed TSV record to lines of N-Triples, N-Quads or Turtle.
+
+    The triples are the same as those of `jsonld.to_rdf()` for the record
+    in JSON-LD format. In N-Quads, the triples are written to the named
+    graph of each data source of the record, or to the default graph
+    if the record has no data source. In Turtle, the triples are written
+    as a block of the record's node without the prefixes.
+
+    Blank node labels are made from a hash of the node, so that they are
+    unique among the records and the same when the record is converted again.
+
+    Args:
+        json_record (dict[str, Any]): The record keyed by the mapped headers.
+        plan (ConversionPlan): The conversion plan.
+
+    Returns:
+        str: The lines joined into one string, each terminated by a newline.
+    """
+    node = record_to_node(json_record, plan)
+
+    node_hash = hashlib.blake2b(
+        get_json_serializer().dumps_line(node).encode("utf-8"), digest_size=12
+    ).hexdigest()
+
+    blank_node_prefix = f"_:b{node_hash}_"
+
+    triples = None
+
+    if plan.emitter is not None:
+        try:
+            triples = plan.emitter.triples(node, blank_node_prefix)
+
+        except UnsupportedJsonldValueException:
+            # コンパイル済みエミッタで扱えない値はpyldで変換する
+            pass
+
+    if triples is None:
+        triples = convert_to_rdf_triples(node, plan.context, blank_node_prefix)
+
+    if plan.turtle_serializer is not None:
+        return plan.turtle_serializer.subject_blocks_str(triples)
+
+    graphs: list[str | None] = [None]
+
+    if plan.output_format == "nquads":
+        # data_sourceごとの名前付きグラフに出力する
+        graphs = list(
+            dict.fromkeys(
+                obj
+                for _, predicate, obj in triples
+                if predicate == plan.data_source_iri
+                and isinstance(obj, str)
+                and not obj.startswith("_:")
+            )
+        ) or [None]
+
+    # 同じトリプルはpyldと同様に1行のみ出力する
+    return nquad_lines_str(triples, graphs)
 
 
 def generate_node_id(uniprot_entries: list[str] | Any) -> str:
@@ -480,6 +4126,30 @@ def parse_field(field: str) -> str | int | float | list[Any] | None:
             return field
 
 
+def compile_jsonld_emitter(context: dict[str, Any]) -> JsonldEmitter | None:
+    """
+    Compile the JSON-LD context into an emitter that bypasses pyld per record.
+
+    Args:
+        context (dict[str, Any]): The JSON-LD context.
+
+    Returns:
+        JsonldEmitter | None: The compiled emitter, or None if the context
+        cannot be compiled and pyld has to be used instead.
+    """
+    try:
+        emitter = JsonldEmitter(context, settings.CONTEXT_FILE_URI)
+
+    except UnsupportedJsonldContextException as e:
+        logger.warning(f"{e.message} Falling back to pyld conversion.")
+
+        return None
+
+    logger.info("JSON-LD context compiled.")
+
+    return emitter
+
+
 def convert_to_jsonld(
     json_data: dict[str, Any], context: dict[str, Any]
 ) -> dict[str, Any]:
@@ -557,121 +4227,148 @@ def convert_to_jsonld(
     return compacted_data
 
 
-def jsonl2json(
-    jsonl_file_path: str, json_file_path_prefix: str, hide_progress: bool
-) -> None:
+def convert_to_rdf_triples(
+    node: dict[str, Any], context: dict[str, Any], blank_node_prefix: str
+) -> list[tuple[str, str, RdfTerm]]:
     """
-    Bulk convert a JSON Lines file to JSON-LD format.
+    Convert a node to RDF triples with pyld.
 
     Args:
-        jsonl_file_path (str): Path to the input JSON Lines file.
-        json_file_path_prefix (str): Prefix for the output JSON-LD file.
-        hide_progress (bool): Whether to hide the progress bar or not.
-    """
+        node (dict[str, Any]): The node to convert.
+        context (dict[str, Any]): The JSON-LD context.
+        blank_node_prefix (str): Prefix that replaces "_:b" of the blank node
+            labels given by pyld.
 
-    # 変換処理開始のログを出力
-    logger.info("Starting JSON Lines to JSON-LD convert processing...")
+    Returns:
+        list[tuple[str, str, RdfTerm]]: The subject, predicate and object
+        of each triple.
+    """
+    json_data = {"@context": context} | node
 
     try:
-        # コンテキスト情報が記載されたファイルを読み込む
-        with open(settings.CONTEXT_LOCAL_FILE_PATH, "r") as f:
-            context_data = json.load(f)["@context"]
+        dataset = jsonld.to_rdf(json_data)
+
+    except Exception:
+        logger.exception(
+            f"""
+            An error occurred when executing jsonld.to_rdf().
+            Target JSON:
+            {json_data}
+            """,
+        )
 
-        file_index = 1  # 出力ファイルのインデックス初期化
-        data_list = []  # 読み込んだデータを保持するリストを初期化
+        raise
 
-        with open(jsonl_file_path, "r") as f:
-            total_lines = sum(1 for line in f)
+    def to_term(rdf_term: dict[str, Any]) -> RdfTerm:
+        if rdf_term["type"] == "literal":
+            return RdfLiteral(rdf_term["value"], rdf_term["datatype"])
 
-        progress = RichProgress(unit="lines", hide_progress=hide_progress)
+        if rdf_term["type"] == "blank node":
+            return blank_node_prefix + rdf_term["value"][len("_:b") :]
 
-        # JSON Linesファイルを開き、データを読み込む
-        with open(jsonl_file_path, "r") as jsonl_file, progress:
-            current_size = 0
+        return rdf_term["value"]
 
-            for line in progress.track(
-                jsonl_file,
-                total=total_lines,
-                description="Converting",
-            ):
-                data = json.loads(line)
-                del data["@context"]
-                data_list.append(data)
-                current_size += len(line.encode("utf-8"))
-
-                if (
-                    current_size >= settings.JSONLD_MAX_FILE_SIZE
-                ):  # 10MB以上になったらファイルに書き込み
-                    write_jsonld_file(
-                        data_list,
-                        context_data,
-                        json_file_path_prefix,
-                        file_index,
-                    )
+    return [
+        (
+            to_term(triple["subject"]),
+            to_term(triple["predicate"]),
+            to_term(triple["object"]),
+        )
+        for triple in dataset.get("@default", [])
+    ]
 
-                    data_list.clear()  # リストをリセット
-                    file_index += 1  # ファイルインデックスをインクリメント
-                    current_size = 0  # サイズカウントをリセット
-
-            # 残りのデータを最後のファイルに書き込む
-            if data_list:
-                write_jsonld_file(
-                    data_list,
-                    context_data,
-                    json_file_path_prefix,
-                    file_index,
-                )
 
-    except Exception:
-        logger.exception("An error occurred in the jsonl2json function.")
+def context_term_iri(context: dict[str, Any], term: str) -> str | None:
+    """
+    Get the IRI a term of the JSON-LD context expands to.
 
-        raise
+    Args:
+        context (dict[str, Any]): The JSON-LD context.
+        term (str): The term.
 
-    # 変換処理終了のログを出力
-    logger.info("JSON Lines to JSON-LD convert processing finished.")
+    Returns:
+        str | None: The IRI, or None if the term is not defined.
+    """
+    expanded_data = jsonld.expand(
+        {"@context": context, term: {"@id": "_:term"}}
+    )
+
+    if not expanded_data:
+        return None
+
+    return next(iter(expanded_data[0]), None)
 
 
-def write_jsonld_file(
-    data_list: list[dict[str, Any]],
-    context_data: dict[str, Any],
+def jsonl2json(
+    jsonl_file_path: str,
     json_file_path_prefix: str,
-    file_index: int,
+    hide_progress: bool,
+    progress: RichProgress | None = None,
+    compression: str = "none",
+    jsonld_format: str = "indented",
 ) -> None:
     """
-    Write a series of data to a file in JSON-LD format.
+    Bulk convert a JSON Lines file to JSON-LD format.
 
     Args:
-        data_list (list[dict[str, Any]]): List of data to write.
-        context_data (dict[str, Any]): Context data for JSON-LD.
-        json_file_path_prefix (str): Prefix for the output file.
-        file_index (int): File index number.
+        jsonl_file_path (str): Path to the input JSON Lines file,
+            which may be compressed in gzip or zstd format.
+        json_file_path_prefix (str): Prefix for the output JSON-LD file.
+        hide_progress (bool): Whether to hide the progress bar or not.
+        progress (RichProgress | None): Progress display shared with other
+            conversions. If None, a progress display is created.
+        compression (str): Compression format of the JSON-LD files.
+        jsonld_format (str): Format of the JSON-LD files
+            ("indented" or "compact").
     """
 
+    # 変換処理開始のログを出力
+    logger.info("Starting JSON Lines to JSON-LD convert processing...")
+
     try:
-        # 出力ファイルパスの生成
-        output_path = f"{json_file_path_prefix}_{file_index:03}.jsonld"
+        # 進捗は入力ファイルの読み込み済みバイト数で表示する
+        shared_progress = progress is not None
+
+        if progress is None:
+            progress = RichProgress(unit="B", hide_progress=hide_progress)
 
-        # 出力ファイルへの書き込み処理
-        with open(output_path, "w", encoding="utf-8") as json_file:
-            # JSON-LD形式のデータ構造の作成
-            jsonld_data = {
-                "@context": context_data,  # コンテキスト情報の設定
-                "@graph": data_list,  # データ本体
-            }
+        progress_context = nullcontext() if shared_progress else progress
+
+        description = (
+            f"Converting {os.path.basename(jsonl_file_path)}"
+            if shared_progress
+            else "Converting"
+        )
 
-            # データをJSONファイルに書き込む
-            json.dump(jsonld_data, json_file, ensure_ascii=False, indent=2)
+        # JSON Linesファイルを開き、データを読み込む
+        # (圧縮されている場合は読み込みながら展開する)
+        with progress_context, progress.open(
+            jsonl_file_path, "rb", description=description
+        ) as raw_jsonl_file, open_compressed_text_stream(
+            raw_jsonl_file
+        ) as jsonl_file, open_jsonld_shard_writer(
+            json_file_path_prefix, compression, jsonld_format
+        ) as shard_writer:
+            json_serializer = get_json_serializer()
+
+            # 1行ずつJSON-LDファイルに書き込む
+            # (JSONLD_MAX_FILE_SIZEを超える場合はファイルを切り替える)
+            for line in jsonl_file:
+                data = json_serializer.loads(line)
+                del data["@context"]
 
-            # 出力ログの生成
-            logger.info(f"Written {len(data_list)} entries to {output_path}")
+                shard_writer.write(
+                    graph_item_str(data, json_serializer, jsonld_format)
+                )
 
     except Exception:
-        logger.exception(
-            "An error occurred in the write_jsonld_file function."
-        )
+        logger.exception("An error occurred in the jsonl2json function.")
 
         raise
 
+    # 変換処理終了のログを出力
+    logger.info("JSON Lines to JSON-LD convert processing finished.")
+
 
 def get_taxonomy_id(tax_str: str, tsv_file_path: str) -> tuple[str, Any]:
     """
@@ -704,40 +4401,39 @@ def get_taxonomy_id(tax_str: str, tsv_file_path: str) -> tuple[str, Any]:
         function utilizes a logger to log info messages; it should also be defined in
         the module.
     """
-    with open(settings.TAXONOMY_FILE_PATH) as f:
-        tax_dict: dict[str, Any] = json.load(f)
-
-        if isinstance(tax_dict, dict):
-            if not tax_str:
-                input_filename = os.path.basename(tsv_file_path)
-
-                for tax_str, tax_id in tax_dict.items():
-                    if tax_str in input_filename:
-                        logger.info(f"Taxonomy: {tax_str}, ID: {tax_id}")
-                        return tax_str, tax_id
-
-                # どのtaxonomy定義ファイルのキーも合致しなかった場合
-                raise Exception(
-                    "The definition in the taxonomy definition file is incorrect."
-                )
+    tax_dict: dict[str, Any] = load_json_file(settings.TAXONOMY_FILE_PATH)
 
-            else:
-                tax_id = tax_dict.get(tax_str)
+    if isinstance(tax_dict, dict):
+        if not tax_str:
+            input_filename = os.path.basename(tsv_file_path)
 
-                if tax_id is not None:
+            for tax_str, tax_id in tax_dict.items():
+                if tax_str in input_filename:
                     logger.info(f"Taxonomy: {tax_str}, ID: {tax_id}")
                     return tax_str, tax_id
 
-                else:
-                    raise Exception(
-                        "The definition in the taxonomy definition file is incorrect."
-                    )
-
-        else:
+            # どのtaxonomy定義ファイルのキーも合致しなかった場合
             raise Exception(
                 "The definition in the taxonomy definition file is incorrect."
             )
 
+        else:
+            tax_id = tax_dict.get(tax_str)
+
+            if tax_id is not None:
+                logger.info(f"Taxonomy: {tax_str}, ID: {tax_id}")
+                return tax_str, tax_id
+
+            else:
+                raise Exception(
+                    "The definition in the taxonomy definition file is incorrect."
+                )
+
+    else:
+        raise Exception(
+            "The definition in the taxonomy definition file is incorrect."
+        )
+
 
 if __name__ == "__main__":
     # Typer app
@@ -43,3 +43,45 @@ PARTICIPANTS = [UNIPROT_ID_COLUMN]
 TAXONOMY_FILE_PATH = os.path.join(src_dir, "taxonomy.json")
 
 JSONLD_MAX_FILE_SIZE = 3 * 1024 * 1024
+
+CHUNK_SIZE = 1000
+
+TYPE_INFERENCE_SAMPLE_SIZE = 1000
+
+CHUNK_BYTES = 4 * 1024 * 1024
+
+MAX_PENDING_PER_WORKER = 4
+
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+STREAM_PREFETCH_CHUNKS = 64
+
+MAX_CONCURRENT_DOWNLOADS = 4
+
+DOWNLOAD_METADATA_FILE_NAME = ".download_metadata.json"
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+DOWNLOAD_TIMEOUT = (30, 60)
+
+DOWNLOAD_RETRIES = 3
+
+DOWNLOAD_SEGMENT_MIN_SIZE = 16 * 1024 * 1024
+
+INCREMENTAL_INDEX_SUFFIX = ".index"
+
+CHECKPOINT_SUFFIX = ".checkpoint"
+
+CHECKPOINT_INTERVAL = 60
+
+COMPRESSION_THREADS = 2
+
+COMPRESSION_BLOCK_SIZE = 4 * 1024 * 1024
+
+JSON_SERIALIZER = "auto"
+
+TABLE_BATCH_SIZE = 65536
+
+MANIFEST_SUFFIX = ".manifest.json"
+
+MANIFEST_CHECKSUM_THREADS = 2
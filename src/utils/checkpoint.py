@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass
+
+
+@dataclass(frozen=True)
+class ConversionCheckpoint:
+    """Position up to which a TSV file has been converted.
+
+    The output file is complete up to output_offset, and contains the lines
+    of the input rows up to input_offset, so that an interrupted conversion
+    can be resumed by truncating the output file and reading the input from
+    input_offset.
+
+    Attributes:
+        input_file_path (str): Path to the input TSV file.
+        input_size (int): Size of the input file in bytes.
+        input_mtime_ns (int): Modification time of the input file.
+        signature (str): Signature of the conversion settings.
+        input_offset (int): Byte offset in the (decompressed) TSV data
+            of the first row that has not been converted.
+        output_offset (int): Byte offset in the output file where the
+            output of that row starts.
+    """
+
+    input_file_path: str
+    input_size: int
+    input_mtime_ns: int
+    signature: str
+    input_offset: int
+    output_offset: int
+
+
+def load_checkpoint(file_path: str) -> ConversionCheckpoint | None:
+    """
+    Load a checkpoint file.
+
+    Args:
+        file_path (str): Path to the checkpoint file.
+
+    Returns:
+        ConversionCheckpoint | None: The checkpoint, or None if the file
+        does not exist or is not a checkpoint.
+    """
+    try:
+        with open(file_path, "r") as f:
+            return ConversionCheckpoint(**json.load(f))
+
+    except (FileNotFoundError, json.JSONDecodeError, TypeError):
+        return None
+
+
+def save_checkpoint(file_path: str, checkpoint: ConversionCheckpoint) -> None:
+    """
+    Save a checkpoint file atomically.
+
+    Args:
+        file_path (str): Path to the checkpoint file.
+        checkpoint (ConversionCheckpoint): The checkpoint.
+    """
+    # 一時ファイルに書き込んでから置き換える
+    tmp_file_path = f"{file_path}.tmp"
+
+    with open(tmp_file_path, "w") as f:
+        json.dump(asdict(checkpoint), f, indent=2)
+
+    os.replace(tmp_file_path, file_path)
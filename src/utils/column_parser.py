@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+# int()/float() が受け付けない文字 (数字・空白・符号・小数点・区切り・指数・inf/nan 以外)
+_NON_NUMERIC_CHAR_PATTERN = re.compile(r"[^\d\s+\-._eEiInNfFtTyYaA]")
+
+# 列マッピングファイルで宣言できる列の型
+DECLARED_COLUMN_TYPES = ("int", "float", "string", "iri")
+
+
+@dataclass(frozen=True)
+class ColumnSchema:
+    """Definition of a TSV column in a column mapping file.
+
+    Attributes:
+        key (str): Key of the column values in the records.
+        type (str | None): Declared type of the values
+            ("int", "float", "string" or "iri"), or None to infer it.
+        delimiter (str | None): Delimiter of list values,
+            or None if the values are not lists.
+        na (str | None): Value converted to None, or None to keep all values.
+    """
+
+    key: str
+    type: str | None = None
+    delimiter: str | None = ","
+    na: str | None = "NA"
+
+
+def load_column_mapper(file_path: str) -> dict[str, ColumnSchema]:
+    """
+    Load a column mapping file.
+
+    Each header is mapped either to a key string, or to an object with
+    "key" and the optional "type", "delimiter" and "na" fields.
+
+    Args:
+        file_path (str): Path to the column mapping file.
+
+    Returns:
+        dict[str, ColumnSchema]: The column definition of each header.
+
+    Raises:
+        Exception: If the definition in the column mapping file is incorrect.
+    """
+    with open(file_path, "r") as f:
+        column_mapper = json.load(f)
+
+    if not isinstance(column_mapper, dict):
+        raise Exception(
+            "The definition in the column mapping file is incorrect."
+        )
+
+    column_schemas: dict[str, ColumnSchema] = {}
+
+    for header, definition in column_mapper.items():
+        if isinstance(definition, str):
+            column_schemas[header] = ColumnSchema(key=definition)
+
+        elif (
+            isinstance(definition, dict)
+            and isinstance(definition.get("key"), str)
+            and definition.get("type", None) in DECLARED_COLUMN_TYPES + (None,)
+        ):
+            column_schemas[header] = ColumnSchema(
+                key=definition["key"],
+                type=definition.get("type", None),
+                delimiter=definition.get("delimiter", ","),
+                na=definition.get("na", "NA"),
+            )
+
+        else:
+            raise Exception(
+                "The definition in the column mapping file is incorrect: "
+                + f"{header}"
+            )
+
+    return column_schemas
+
+
+class ColumnParser:
+    """Parses the cells of one TSV column into Python values.
+
+    For an inferred type, the result is the same as parsing each cell by
+    splitting it on the delimiter and trying int() and then float(), but a
+    converter specialized for the column type is used so that cells of
+    string columns do not raise exceptions for each failed conversion.
+
+    For a declared type, the values are converted to that type without
+    guessing: "string" and "iri" values are kept as strings, and "float"
+    values are always floats. Cells that cannot be converted to a declared
+    numeric type are parsed as if the type had not been declared.
+    """
+
+    def __init__(
+        self,
+        column_type: str = "auto",
+        delimiter: str | None = ",",
+        na_value: str | None = "NA",
+        declared: bool = False,
+    ) -> None:
+        """
+        Args:
+            column_type (str): Type of the column values.
+                One of "int", "float", "string" or "auto",
+                or "iri" if the type is declared.
+            delimiter (str | None): Delimiter of list values,
+                or None if the values are not lists.
+            na_value (str | None): Value converted to None.
+            declared (bool): Whether the type is declared in the column
+                mapping file rather than inferred.
+        """
+        if declared:
+            parsers = {
+                "int": self._parse_auto,
+                "float": self._parse_declared_float,
+                "string": self._parse_declared_string,
+                "iri": self._parse_declared_string,
+            }
+
+        else:
+            parsers = {
+                "int": self._parse_auto,
+                "float": self._parse_float,
+                "string": self._parse_string,
+                "auto": self._parse_auto,
+            }
+
+        if column_type not in parsers:
+            raise ValueError(f"Unknown column type: {column_type}")
+
+        self.column_type = column_type
+        self.delimiter = delimiter
+        self.na_value = na_value
+        self.declared = declared
+        self._parse_value = parsers[column_type]
+
+    def __call__(self, field: str) -> Any:
+        """
+        Converts a cell into an appropriate type.
+
+        Args:
+            field (str): The cell to be converted.
+
+        Returns:
+            str | int | float | list[Any] | None: The converted value.
+        """
+        if self.delimiter is not None and self.delimiter in field:
+            return [
+                self._parse_value(value)
+                for value in field.split(self.delimiter)
+            ]
+
+        return self._parse_value(field)
+
+    def _parse_auto(self, value: str) -> str | int | float | None:
+        """Tries int(), then float(), and returns the string otherwise."""
+        if value == self.na_value:
+            return None
+
+        try:
+            return int(value)
+
+        except ValueError:
+            try:
+                return float(value)
+
+            except ValueError:
+                return value
+
+    def _parse_float(self, value: str) -> str | int | float | None:
+        """Skips int() for values that cannot be integers."""
+        if value == self.na_value:
+            return None
+
+        if "." not in value:
+            return self._parse_auto(value)
+
+        try:
+            return float(value)
+
+        except ValueError:
+            return value
+
+    def _parse_string(self, value: str) -> str | int | float | None:
+        """Skips int() and float() for values that cannot be numbers."""
+        if value == self.na_value:
+            return None
+
+        if _NON_NUMERIC_CHAR_PATTERN.search(value) is not None:
+            return value
+
+        return self._parse_auto(value)
+
+    def _parse_declared_float(self, value: str) -> str | int | float | None:
+        """Converts values of a column declared as float."""
+        if value == self.na_value:
+            return None
+
+        try:
+            return float(value)
+
+        except ValueError:
+            return self._parse_auto(value)
+
+    def _parse_declared_string(self, value: str) -> str | None:
+        """Keeps values of a column declared as string or IRI."""
+        if value == self.na_value:
+            return None
+
+        return value
+
+
+def infer_column_type(
+    fields: Iterable[str],
+    delimiter: str | None = ",",
+    na_value: str | None = "NA",
+) -> str:
+    """
+    Infers the type of a column from sample cells.
+
+    Args:
+        fields (Iterable[str]): Sample cells of the column.
+        delimiter (str | None): Delimiter of list values.
+        na_value (str | None): Value converted to None.
+
+    Returns:
+        str: "int" if all values are integers, "float" if all values are
+        numbers, "string" otherwise, or "auto" if there are no values.
+    """
+    parser = ColumnParser("auto", delimiter, na_value)
+
+    value_types = set()
+
+    for field in fields:
+        values = parser(field)
+
+        for value in values if isinstance(values, list) else [values]:
+            if value is not None:
+                value_types.add(type(value))
+
+    if not value_types:
+        return "auto"
+
+    if value_types == {int}:
+        return "int"
+
+    if value_types <= {int, float}:
+        return "float"
+
+    return "string"
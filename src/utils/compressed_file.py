@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import gzip
+import io
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO
+
+try:
+    import zstandard
+except ImportError:  # zstdでの圧縮を使用しない場合は不要
+    zstandard = None
+
+if __name__ == "__main__":
+    from custom_exception import UnsupportedCompressionException
+else:
+    from .custom_exception import UnsupportedCompressionException
+
+# 圧縮形式ごとのファイル拡張子
+COMPRESSION_EXTENSIONS = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+# zstd形式のファイルの先頭バイト
+ZSTD_MAGIC_NUMBER = b"\x28\xb5\x2f\xfd"
+
+# gzip形式のファイルの先頭バイト
+GZIP_MAGIC_NUMBER = b"\x1f\x8b"
+
+
+def compressed_file_path(file_path: str, compression: str) -> str:
+    """
+    Add the extension of a compression format to a file path.
+
+    Args:
+        file_path (str): The file path.
+        compression (str): Compression format ("none", "gzip" or "zstd").
+
+    Returns:
+        str: The file path ending with the extension of the format.
+    """
+    extension = COMPRESSION_EXTENSIONS[compression]
+
+    if file_path.endswith(extension):
+        return file_path
+
+    return file_path + extension
+
+
+def strip_compression_extension(file_path: str) -> str:
+    """
+    Remove the extension of a compression format from a file path.
+
+    Args:
+        file_path (str): The file path.
+
+    Returns:
+        str: The file path without the extension.
+    """
+    for extension in COMPRESSION_EXTENSIONS.values():
+        if extension and file_path.endswith(extension):
+            return file_path[: -len(extension)]
+
+    return file_path
+
+
+def check_compression(compression: str) -> None:
+    """
+    Check that a compression format is available.
+
+    Args:
+        compression (str): Compression format.
+
+    Raises:
+        UnsupportedCompressionException: If the format is unknown, or the
+            package needed for the format is not installed.
+    """
+    if compression not in COMPRESSION_EXTENSIONS:
+        raise UnsupportedCompressionException(
+            f"Unknown compression format: {compression}"
+        )
+
+    if compression == "zstd" and zstandard is None:
+        raise UnsupportedCompressionException(
+            "The zstandard package is required for zstd compression."
+        )
+
+
+def compress_block(data: bytes, compression: str, level: int) -> bytes:
+    """
+    Compress a block of data into a complete gzip member or zstd frame.
+
+    Concatenated members and frames are decompressed as one stream,
+    so that blocks can be compressed independently of each other.
+
+    Args:
+        data (bytes): The data to compress.
+        compression (str): Compression format ("gzip" or "zstd").
+        level (int): Compression level.
+
+    Returns:
+        bytes: The compressed block.
+    """
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(data)
+
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+class CompressedTextWriter(io.TextIOBase):
+    """Text stream that writes a compressed file using background threads.
+
+    The written text is split into blocks of block_size bytes, and each block
+    is compressed into an independent gzip member or zstd frame by a thread
+    pool, while the caller continues to write. The compressed blocks are
+    written to the file in order.
+
+    flush() writes all the text written so far as complete blocks, so the
+    file is a valid compressed file at any flush, and a file truncated at
+    the size it had after a flush can be appended to.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        compression: str,
+        mode: str = "w",
+        level: int | None = None,
+        threads: int = 1,
+        block_size: int = 4 * 1024 * 1024,
+    ) -> None:
+        """
+        Args:
+            file_path (str): Path to the output file.
+            compression (str): Compression format ("gzip" or "zstd").
+            mode (str): "w" to overwrite the file, or "a" to append to it.
+            level (int | None): Compression level, or None for the default
+                level of the format.
+            threads (int): Number of compression threads.
+            block_size (int): Size of each block before compression in bytes.
+        """
+        super().__init__()
+
+        check_compression(compression)
+
+        if level is None:
+            level = 3 if compression == "zstd" else 6
+
+        self.name = file_path
+        self._file = open(file_path, mode + "b")
+        self._compression = compression
+        self._level = level
+        self._block_size = max(block_size, 1)
+        self._buffer: list[bytes] = []
+        self._buffer_size = 0
+        self._max_pending = max(threads, 1) * 2
+        self._pending: deque[Future] = deque()
+        self._executor = ThreadPoolExecutor(max_workers=max(threads, 1))
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:  # type: ignore[override]
+        data = s.encode("utf-8")
+
+        self._buffer.append(data)
+        self._buffer_size += len(data)
+
+        if self._buffer_size >= self._block_size:
+            self._submit_block()
+
+        return len(s)
+
+    def _submit_block(self) -> None:
+        """Submits the buffered text to the compression threads."""
+        if not self._buffer_size:
+            return
+
+        self._pending.append(
+            self._executor.submit(
+                compress_block,
+                b"".join(self._buffer),
+                self._compression,
+                self._level,
+            )
+        )
+
+        self._buffer = []
+        self._buffer_size = 0
+
+        # 圧縮待ちのブロックが多い場合は書き込みを待つ
+        while len(self._pending) > self._max_pending:
+            self._file.write(self._pending.popleft().result())
+
+    def flush(self) -> None:
+        if self.closed:
+            return
+
+        self._submit_block()
+
+        while self._pending:
+            self._file.write(self._pending.popleft().result())
+
+        self._file.flush()
+
+    def fileno(self) -> int:
+        return self._file.fileno()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+
+        try:
+            # 残りのブロックはflush()で書き込まれる
+            super().close()
+
+        finally:
+            self._executor.shutdown()
+            self._file.close()
+
+
+def open_compressed_output_file(
+    file_path: str,
+    compression: str = "none",
+    mode: str = "w",
+    level: int | None = None,
+    threads: int = 1,
+    block_size: int = 4 * 1024 * 1024,
+) -> IO[str]:
+    """
+    Open an output text file, compressed in the given format.
+
+    Args:
+        file_path (str): Path to the output file.
+        compression (str): Compression format ("none", "gzip" or "zstd").
+        mode (str): "w" to overwrite the file, or "a" to append to it.
+        level (int | None): Compression level, or None for the default
+            level of the format.
+        threads (int): Number of compression threads.
+        block_size (int): Size of each compressed block in bytes.
+
+    Returns:
+        IO[str]: The text stream.
+    """
+    check_compression(compression)
+
+    if compression == "none":
+        return open(file_path, mode, encoding="utf-8")
+
+    return CompressedTextWriter(
+        file_path, compression, mode, level, threads, block_size
+    )
+
+
+def open_compressed_text_stream(binary_f: IO[bytes]) -> IO[str]:
+    """
+    Open a binary stream of a text file that may be compressed
+    in gzip or zstd format as text.
+
+    The format is detected from the first bytes of the stream.
+
+    Args:
+        binary_f (IO[bytes]): The binary stream opened at its beginning.
+
+    Returns:
+        IO[str]: The decompressed text stream.
+    """
+    if not isinstance(binary_f, io.BufferedReader):
+        binary_f = io.BufferedReader(binary_f)
+
+    magic_number = binary_f.peek(len(ZSTD_MAGIC_NUMBER))[
+        : len(ZSTD_MAGIC_NUMBER)
+    ]
+
+    if magic_number.startswith(GZIP_MAGIC_NUMBER):
+        return gzip.open(binary_f, "rt", encoding="utf-8")
+
+    if magic_number == ZSTD_MAGIC_NUMBER:
+        check_compression("zstd")
+
+        return io.TextIOWrapper(
+            zstandard.ZstdDecompressor().stream_reader(
+                binary_f, read_across_frames=True
+            ),
+            encoding="utf-8",
+        )
+
+    return io.TextIOWrapper(binary_f, encoding="utf-8")
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+if __name__ == "__main__":
+    from column_parser import ColumnParser
+    from jsonld_emitter import JsonldEmitter
+    from turtle_serializer import TurtleSerializer
+else:
+    from .column_parser import ColumnParser
+    from .jsonld_emitter import JsonldEmitter
+    from .turtle_serializer import TurtleSerializer
+
+
+@dataclass(frozen=True)
+class ConversionPlan:
+    """Everything needed to convert the rows of a TSV file, built once per
+    taxonomy and header row.
+
+    The plan is not modified after it is built, so that it can be cached,
+    shared between files and sent to worker processes as is. Its
+    dictionaries are built for the plan and not shared with any cache,
+    and must not be modified either.
+
+    Attributes:
+        taxonomy (str): Taxonomy name.
+        tax_id (Any): Taxonomy ID associated with the records.
+        headers (tuple[str, ...]): Header names of the TSV columns.
+        mapped_headers (tuple[str | None, ...]): Mapped header of each column,
+            or None for columns that are not mapped.
+        header_index (dict[str, int]): Column index of each mapped header.
+        column_parsers (tuple[ColumnParser | None, ...]): Parser of each
+            column.
+        context (dict[str, Any]): The JSON-LD context.
+        emitter (JsonldEmitter | None): Compiled emitter for the context,
+            or None if the records are converted with pyld.
+        participant_columns (tuple[str, ...]): Mapped headers converted
+            to participants.
+        node_id_column (str): Mapped header used as node ID.
+        node_id_prefix (str): Prefix for the node ID.
+        node_type (str): Type of the node.
+        data_source_prefix (str): Prefix for data sources.
+        reference_prefix (str): Prefix for references.
+        taxonomy_value (str): Taxonomy value written to each record.
+        output_format (str): Output format ("jsonl", "ntriples", "nquads"
+            or "turtle").
+        data_source_iri (str | None): IRI of the data source property, whose
+            values name the graphs of the N-Quads output, or None if the
+            context does not define it.
+        turtle_serializer (TurtleSerializer | None): Serializer with the
+            prefixes of the context if the output format is "turtle".
+    """
+
+    taxonomy: str
+    tax_id: Any
+    headers: tuple[str, ...]
+    mapped_headers: tuple[str | None, ...]
+    header_index: dict[str, int]
+    column_parsers: tuple[ColumnParser | None, ...]
+    context: dict[str, Any]
+    emitter: JsonldEmitter | None
+    participant_columns: tuple[str, ...]
+    node_id_column: str
+    node_id_prefix: str
+    node_type: str
+    data_source_prefix: str
+    reference_prefix: str
+    taxonomy_value: str
+    output_format: str = "jsonl"
+    data_source_iri: str | None = None
+    turtle_serializer: TurtleSerializer | None = None
@@ -7,3 +7,80 @@ class JsonldConversionResultTypeException(Exception):
     ):
         self.message = message
         super().__init__(self.message)
+
+
+class UnsupportedJsonldContextException(Exception):
+    """JSON-LDコンテキストをコンパイルできない場合の例外"""
+
+    def __init__(
+        self,
+        message="JSON-LD context cannot be compiled.",
+    ):
+        self.message = message
+        super().__init__(self.message)
+
+
+class UnsupportedJsonldValueException(Exception):
+    """コンパイル済みエミッタで変換できない値が含まれる場合の例外"""
+
+    def __init__(
+        self,
+        message="Record contains a value the compiled emitter cannot convert.",
+    ):
+        self.message = message
+        super().__init__(self.message)
+
+
+class UnsupportedCompressionException(Exception):
+    """指定された圧縮形式を使用できない場合の例外"""
+
+    def __init__(
+        self,
+        message="The compression format is not available.",
+    ):
+        self.message = message
+        super().__init__(self.message)
+
+
+class UnsupportedJsonSerializerException(Exception):
+    """指定されたJSONシリアライザを使用できない場合の例外"""
+
+    def __init__(
+        self,
+        message="The JSON serializer is not available.",
+    ):
+        self.message = message
+        super().__init__(self.message)
+
+
+class UnsupportedJsonldFormatException(Exception):
+    """指定されたJSON-LDファイルの形式を使用できない場合の例外"""
+
+    def __init__(
+        self,
+        message="The JSON-LD file format is not available.",
+    ):
+        self.message = message
+        super().__init__(self.message)
+
+
+class UnsupportedOutputFormatException(Exception):
+    """指定された出力形式を使用できない場合の例外"""
+
+    def __init__(
+        self,
+        message="The output format is not available.",
+    ):
+        self.message = message
+        super().__init__(self.message)
+
+
+class UnsupportedTableFormatException(Exception):
+    """指定された表形式の出力形式を使用できない場合の例外"""
+
+    def __init__(
+        self,
+        message="The table format is not available.",
+    ):
+        self.message = message
+        super().__init__(self.message)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from typing import Any
+
+
+class DownloadMetadataCache:
+    """Stores the HTTP validators of downloaded files in a JSON file.
+
+    For each URL, the ETag, Last-Modified and Content-Length of the last
+    download are kept so that the next download can be made conditional.
+    The cache can be shared by concurrent downloads, and the file is
+    replaced atomically so that an interrupted run does not corrupt it.
+    """
+
+    # 並行ダウンロードの間で共有するロック
+    _lock = threading.Lock()
+
+    def __init__(self, file_path: str) -> None:
+        """
+        Args:
+            file_path (str): Path to the JSON file of the cache.
+        """
+        self.file_path = file_path
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        """Loads all entries, or returns an empty dict if there are none."""
+        try:
+            with open(self.file_path, "r") as f:
+                entries = json.load(f)
+
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+        return entries if isinstance(entries, dict) else {}
+
+    def get(self, url: str) -> dict[str, Any] | None:
+        """
+        Get the metadata of the last download of a URL.
+
+        Args:
+            url (str): The downloaded URL.
+
+        Returns:
+            dict[str, Any] | None: The metadata, or None if the URL
+            has not been downloaded.
+        """
+        with self._lock:
+            return self._load().get(url)
+
+    def set(self, url: str, metadata: dict[str, Any] | None) -> None:
+        """
+        Set the metadata of the last download of a URL.
+
+        Args:
+            url (str): The downloaded URL.
+            metadata (dict[str, Any] | None): The metadata,
+                or None to remove the entry.
+        """
+        with self._lock:
+            entries = self._load()
+
+            if metadata is None:
+                entries.pop(url, None)
+
+            else:
+                entries[url] = metadata
+
+            os.makedirs(os.path.dirname(self.file_path) or ".", exist_ok=True)
+
+            # 一時ファイルに書き込んでから置き換える
+            tmp_file_path = f"{self.file_path}.tmp"
+
+            with open(tmp_file_path, "w") as f:
+                json.dump(entries, f, indent=2)
+
+            os.replace(tmp_file_path, self.file_path)
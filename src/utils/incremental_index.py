@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import hashlib
+import os
+
+
+def row_fingerprint(line: str) -> int:
+    """
+    Calculates the fingerprint of a TSV row.
+
+    Args:
+        line (str): The TSV row.
+
+    Returns:
+        int: A 64-bit hash of the row without surrounding whitespace.
+    """
+    return int.from_bytes(
+        hashlib.blake2b(line.strip().encode("utf-8"), digest_size=8).digest(),
+        "big",
+    )
+
+
+class IncrementalIndex:
+    """Fingerprints of the converted rows and their positions in the output.
+
+    The index is saved next to the output JSONL file, and is used to reuse
+    the output of the rows that have not changed in the next conversion.
+    Entries are keyed by node ID and hold the fingerprint of the TSV row,
+    and the byte offset and length of its line in the output file. Rows that
+    share a node ID are told apart by their fingerprints.
+
+    The file starts with the signature of the conversion settings and ends
+    with the size of the output file, so that an index written with other
+    settings, or for another version of the output file, is not used.
+    """
+
+    def __init__(self, signature: str) -> None:
+        """
+        Args:
+            signature (str): Signature of the conversion settings.
+        """
+        self.signature = signature
+
+        # ノードID -> [(行のフィンガープリント, 出力ファイル中の位置, 長さ), ...]
+        self.entries: dict[str, list[tuple[int, int, int]]] = {}
+
+    def add(
+        self, node_id: str, fingerprint: int, offset: int, length: int
+    ) -> None:
+        """
+        Add the output line of a row.
+
+        Args:
+            node_id (str): Node ID of the row.
+            fingerprint (int): Fingerprint of the TSV row.
+            offset (int): Byte offset of the line in the output file.
+            length (int): Length of the line in bytes, including the newline.
+        """
+        self.entries.setdefault(node_id, []).append(
+            (fingerprint, offset, length)
+        )
+
+    def find(self, node_id: str, fingerprint: int) -> tuple[int, int] | None:
+        """
+        Find the output line of an unchanged row.
+
+        Args:
+            node_id (str): Node ID of the row.
+            fingerprint (int): Fingerprint of the TSV row.
+
+        Returns:
+            tuple[int, int] | None: The byte offset and length of the line,
+            or None if the row is not in the index.
+        """
+        for entry_fingerprint, offset, length in self.entries.get(node_id, ()):
+            if entry_fingerprint == fingerprint:
+                return offset, length
+
+        return None
+
+    def __len__(self) -> int:
+        """Returns the number of rows in the index."""
+        return sum(len(entries) for entries in self.entries.values())
+
+    @classmethod
+    def load(
+        cls, index_path: str, output_path: str, signature: str
+    ) -> IncrementalIndex | None:
+        """
+        Load the index of a previous conversion.
+
+        Args:
+            index_path (str): Path to the index file.
+            output_path (str): Path to the output file of the previous
+                conversion.
+            signature (str): Signature of the current conversion settings.
+
+        Returns:
+            IncrementalIndex | None: The index, or None if there is no index,
+            or it cannot be used with the current settings and output file.
+        """
+        if not (os.path.exists(index_path) and os.path.exists(output_path)):
+            return None
+
+        index = cls(signature)
+
+        output_size = None
+
+        with open(index_path, "r", encoding="utf-8") as f:
+            if f.readline().rstrip("\n") != f"#signature\t{signature}":
+                return None
+
+            for line in f:
+                fields = line.rstrip("\n").split("\t")
+
+                if fields[0] == "#output_size":
+                    output_size = int(fields[1])
+
+                    break
+
+                index.add(
+                    fields[0],
+                    int(fields[1], 16),
+                    int(fields[2]),
+                    int(fields[3]),
+                )
+
+        # 書き込み途中の索引や、索引作成後に変更された出力ファイルは使用しない
+        if output_size != os.path.getsize(output_path):
+            return None
+
+        return index
+
+    def save(self, index_path: str, output_size: int) -> None:
+        """
+        Save the index atomically.
+
+        Args:
+            index_path (str): Path to the index file.
+            output_size (int): Size of the output file in bytes.
+        """
+        tmp_index_path = f"{index_path}.tmp"
+
+        with open(tmp_index_path, "w", encoding="utf-8") as f:
+            f.write(f"#signature\t{self.signature}\n")
+
+            for node_id, entries in self.entries.items():
+                for fingerprint, offset, length in entries:
+                    f.write(
+                        f"{node_id}\t{fingerprint:016x}\t{offset}\t{length}\n"
+                    )
+
+            f.write(f"#output_size\t{output_size}\n")
+
+        os.replace(tmp_index_path, index_path)
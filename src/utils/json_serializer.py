@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import json
+import math
+import re
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjsonを使用しない場合は不要
+    orjson = None
+
+if __name__ == "__main__":
+    from custom_exception import UnsupportedJsonSerializerException
+else:
+    from .custom_exception import UnsupportedJsonSerializerException
+
+# 選択できるJSONシリアライザ
+JSON_SERIALIZERS = ("auto", "json", "orjson")
+
+# orjsonが浮動小数点数として読み込む可能性のある桁数の多い整数
+_LONG_INTEGER_PATTERN = re.compile(r"[0-9]{19}")
+
+# シリアライザの互換性を確認する値
+# (キーの順序、エスケープ、浮動小数点数の表記が標準ライブラリと一致すること)
+_SELF_CHECK_VALUES: list[Any] = [
+    {
+        "b": [1, -2, 0.969, 1.0, -0.0, 0.0001, 3e-05, 1e-07, 1e16, 1.5e300],
+        "a": {"z": None, "y": True, "x": False, "w": [], "v": {}},
+        "B": '"quoted" \\ / \n\r\t\b\f \x00\x1f\x7f',
+        "é": "non-ASCII é   \U0001f600",
+        "@id": "cpdb:A-B",
+        "": [[], [{}], [[1]]],
+    },
+    [float("nan"), float("inf"), -float("inf")],
+    [2**64, -(2**63) - 1, 2**63 - 1, 12345678901234567890123],
+    {2: "non-string keys", 1: {"2": [0.30000000000000004]}},
+    "",
+    [],
+    {},
+]
+
+
+class JsonSerializer:
+    """Serializes JSON with the standard library.
+
+    The encoders are created once and reused, instead of creating a new
+    encoder for each call of json.dumps with non-default options.
+
+    Subclasses must produce exactly the same output as this class.
+    """
+
+    name = "json"
+
+    def __init__(self) -> None:
+        self._line_encoder = json.JSONEncoder(sort_keys=True)
+
+        # (sort_keys, compact) -> エンコーダ
+        self._document_encoders = {
+            (sort_keys, compact): json.JSONEncoder(
+                ensure_ascii=False,
+                indent=None if compact else 2,
+                separators=(",", ":") if compact else None,
+                sort_keys=sort_keys,
+            )
+            for sort_keys in (False, True)
+            for compact in (False, True)
+        }
+
+    def dumps_line(self, obj: Any) -> str:
+        """
+        Serialize a value to one line of JSON Lines.
+
+        Args:
+            obj (Any): The value.
+
+        Returns:
+            str: The same string as json.dumps(obj, sort_keys=True).
+        """
+        return self._line_encoder.encode(obj)
+
+    def dumps_document(
+        self, obj: Any, sort_keys: bool = False, compact: bool = False
+    ) -> str:
+        """
+        Serialize a value to a JSON document.
+
+        Args:
+            obj (Any): The value.
+            sort_keys (bool): If True, the keys of the objects are sorted.
+            compact (bool): If True, the document is written without
+                indentation and whitespace.
+
+        Returns:
+            str: The same string as
+            json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=sort_keys),
+            or as json.dumps(obj, ensure_ascii=False, separators=(",", ":"),
+            sort_keys=sort_keys) if compact is True.
+        """
+        return self._document_encoders[sort_keys, compact].encode(obj)
+
+    def loads(self, s: str) -> Any:
+        """
+        Deserialize a JSON string.
+
+        Args:
+            s (str): The JSON string.
+
+        Returns:
+            Any: The same value as json.loads(s).
+        """
+        return json.loads(s)
+
+
+class OrjsonSerializer(JsonSerializer):
+    """Serializes JSON with orjson where its output matches the standard
+    library.
+
+    orjson does not put spaces after separators and does not escape non-ASCII
+    characters, and rewriting its output costs as much as serializing the
+    small records of JSON Lines, so dumps_line uses the standard library.
+
+    Documents and deserialization use orjson. The parts of a
+    document that orjson writes differently (NaN and infinity, floats written
+    in exponent notation, integers out of the 64-bit range, and non-string
+    keys) are serialized with the standard library, and so are the strings
+    that orjson cannot parse (NaN) or may parse differently (long integers).
+    """
+
+    name = "orjson"
+
+    def dumps_document(
+        self, obj: Any, sort_keys: bool = False, compact: bool = False
+    ) -> str:
+        return self._dumps(obj, None if compact else "", sort_keys)
+
+    def _dumps(self, obj: Any, indent: str | None, sort_keys: bool) -> str:
+        """Serializes a value whose lines after the first start with indent,
+        or without whitespace if indent is None."""
+        if not _has_incompatible_value(obj):
+            option = (0 if indent is None else orjson.OPT_INDENT_2) | (
+                orjson.OPT_SORT_KEYS if sort_keys else 0
+            )
+            json_str = orjson.dumps(obj, option=option).decode("utf-8")
+
+            return (
+                json_str.replace("\n", "\n" + indent) if indent else json_str
+            )
+
+        # orjsonと表記が異なる値を含む場合は要素ごとに処理する
+        if indent is None:
+            item_indent = None
+            item_prefix, separator, key_separator = "", ",", ":"
+            start, end = "", ""
+
+        else:
+            item_indent = indent + "  "
+            item_prefix, separator, key_separator = item_indent, ",\n", ": "
+            start, end = "\n", "\n" + indent
+
+        if isinstance(obj, dict) and obj:
+            items = [
+                item_prefix
+                # キーは標準ライブラリと同じ変換で書く ('{\n  "key": null\n}')
+                + self._document_encoders[False, False].encode({key: None})[
+                    4:-8
+                ]
+                + key_separator
+                + self._dumps(value, item_indent, sort_keys)
+                for key, value in (
+                    sorted(obj.items()) if sort_keys else obj.items()
+                )
+            ]
+
+            return "{" + start + separator.join(items) + end + "}"
+
+        if isinstance(obj, list) and obj:
+            items = [
+                item_prefix + self._dumps(value, item_indent, sort_keys)
+                for value in obj
+            ]
+
+            return "[" + start + separator.join(items) + end + "]"
+
+        return self._document_encoders[False, False].encode(obj)
+
+    def loads(self, s: str) -> Any:
+        # orjsonは64ビットを超える整数を浮動小数点数として読み込む
+        if _LONG_INTEGER_PATTERN.search(s):
+            return json.loads(s)
+
+        try:
+            return orjson.loads(s)
+
+        except orjson.JSONDecodeError:
+            return json.loads(s)
+
+
+def _has_incompatible_value(obj: Any) -> bool:
+    """Returns whether orjson writes a part of the value differently."""
+    value_type = type(obj)
+
+    if value_type is float:
+        # 標準ライブラリは1e-04未満と1e16以上を指数表記で書く
+        return not (obj == 0.0 or 1e-4 <= abs(obj) < 1e16) or math.isnan(obj)
+
+    if value_type is int:
+        return not (-(2**63) <= obj < 2**64)
+
+    if value_type is dict:
+        return any(type(key) is not str for key in obj) or any(
+            _has_incompatible_value(value) for value in obj.values()
+        )
+
+    if value_type is list:
+        return any(_has_incompatible_value(value) for value in obj)
+
+    return value_type not in (str, bool, type(None))
+
+
+def check_json_serializer(serializer: JsonSerializer) -> bool:
+    """
+    Check that a serializer produces the same output as the standard library.
+
+    Args:
+        serializer (JsonSerializer): The serializer to check.
+
+    Returns:
+        bool: True if the output is identical for all the check values.
+    """
+    reference = JsonSerializer()
+
+    for value in _SELF_CHECK_VALUES:
+        try:
+            line = reference.dumps_line(value)
+
+            if (
+                serializer.dumps_line(value) != line
+                or serializer.dumps_document(value)
+                != reference.dumps_document(value)
+                or any(
+                    serializer.dumps_document(value, sort_keys, compact)
+                    != reference.dumps_document(value, sort_keys, compact)
+                    for sort_keys in (False, True)
+                    for compact in (False, True)
+                )
+                or serializer.dumps_line(serializer.loads(line)) != line
+            ):
+                return False
+
+        except Exception:
+            return False
+
+    return True
+
+
+def create_json_serializer(name: str = "auto") -> JsonSerializer:
+    """
+    Create a JSON serializer.
+
+    Args:
+        name (str): "json" for the standard library, "orjson" for orjson,
+            or "auto" to use orjson if it is installed and compatible.
+
+    Returns:
+        JsonSerializer: The serializer.
+
+    Raises:
+        UnsupportedJsonSerializerException: If the serializer is unknown,
+            or orjson is requested but is not installed or not compatible.
+    """
+    if name not in JSON_SERIALIZERS:
+        raise UnsupportedJsonSerializerException(
+            f"Unknown JSON serializer: {name}"
+        )
+
+    if name == "json" or (name == "auto" and orjson is None):
+        return JsonSerializer()
+
+    if orjson is None:
+        raise UnsupportedJsonSerializerException(
+            "The orjson package is required for the orjson serializer."
+        )
+
+    serializer = OrjsonSerializer()
+
+    # インストールされたorjsonの出力が標準ライブラリと一致することを確認する
+    if not check_json_serializer(serializer):
+        if name == "orjson":
+            raise UnsupportedJsonSerializerException(
+                "The output of the installed orjson differs "
+                + "from the json module."
+            )
+
+        return JsonSerializer()
+
+    return serializer
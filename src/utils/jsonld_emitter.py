@@ -0,0 +1,476 @@
+from __future__ import annotations
+
+import re
+from itertools import count
+from typing import Any, Iterator
+
+if __name__ == "__main__":
+    from custom_exception import (
+        UnsupportedJsonldContextException,
+        UnsupportedJsonldValueException,
+    )
+    from rdf_serializer import RDF_TYPE, RdfTerm, rdf_literal
+else:
+    from .custom_exception import (
+        UnsupportedJsonldContextException,
+        UnsupportedJsonldValueException,
+    )
+    from .rdf_serializer import RDF_TYPE, RdfTerm, rdf_literal
+
+# RFC3986 gen-delims (JSON-LD 1.1 の prefix 判定に使用)
+_GEN_DELIMS = (":", "/", "?", "#", "[", "]", "@")
+
+_ABSOLUTE_IRI_PATTERN = re.compile(r"^[a-zA-Z][a-zA-Z0-9+\-.]*:")
+
+_SUPPORTED_TERM_KEYS = {"@id", "@type"}
+
+# pyldのtoRdfで相対IRIとして扱われる空白文字
+_WHITESPACE_PATTERN = re.compile(r"\s")
+
+
+class JsonldEmitter:
+    """Emits compacted JSON-LD records without running pyld per record.
+
+    The context is compiled once into prefix and term tables, and each record
+    is compacted directly with them. The result is identical to running
+    `jsonld.expand()` followed by `jsonld.compact()` with the same context.
+
+    Only contexts made of prefix definitions and term definitions with
+    `@id` and an optional `"@type": "@id"` are supported. Values outside
+    what the compiled tables can reproduce exactly (relative IRIs, nested
+    lists, etc.) raise UnsupportedJsonldValueException so that callers can
+    fall back to pyld for that record.
+
+    The same tables convert a record to RDF triples, identical to the
+    triples of `jsonld.to_rdf()` except for the blank node labels.
+    """
+
+    def __init__(self, context: dict[str, Any], context_uri: str) -> None:
+        """
+        Args:
+            context (dict[str, Any]): The JSON-LD context
+                (value of `@context`).
+            context_uri (str): URI written to `@context` of each record.
+
+        Raises:
+            UnsupportedJsonldContextException: If the context uses features
+            the emitter does not support.
+        """
+        self.context_uri = context_uri
+
+        # term -> (IRI, @type が @id かどうか)
+        self._terms: dict[str, tuple[str, bool]] = {}
+
+        # prefix として使用できる term -> IRI
+        self._prefixes: dict[str, str] = {}
+
+        self._compile(context)
+
+        # IRI -> term (完全一致する term の逆引き)
+        self._iri_terms = {iri: term for term, (iri, _) in self._terms.items()}
+
+        # 他の prefix と IRI が前方一致しない prefix は CURIE をそのまま返せる
+        self._isolated_prefixes = {
+            term
+            for term, iri in self._prefixes.items()
+            if not any(
+                other != term
+                and (other_iri.startswith(iri) or iri.startswith(other_iri))
+                for other, other_iri in self._prefixes.items()
+            )
+        }
+
+        # @type が @id の term にリテラル値を入れた場合のキー
+        self._literal_keys = {
+            term: self._compact_iri(iri, vocab=True, exclude_terms=True)
+            for term, (iri, is_id_type) in self._terms.items()
+            if is_id_type
+        }
+
+    def _compile(self, context: dict[str, Any]) -> None:
+        """Builds the term and prefix tables from the context."""
+        if not isinstance(context, dict):
+            raise UnsupportedJsonldContextException(
+                "Only an inline JSON-LD context object is supported."
+            )
+
+        raw_terms: dict[str, tuple[str, bool, bool]] = {}
+
+        for term, definition in context.items():
+            if term.startswith("@") or ":" in term:
+                raise UnsupportedJsonldContextException(
+                    f"Unsupported context entry: {term}"
+                )
+
+            if isinstance(definition, str):
+                raw_terms[term] = (definition, False, True)
+
+            elif isinstance(definition, dict) and "@id" in definition:
+                if not set(definition) <= _SUPPORTED_TERM_KEYS or (
+                    definition.get("@type", "@id") != "@id"
+                ):
+                    raise UnsupportedJsonldContextException(
+                        f"Unsupported term definition: {term}"
+                    )
+
+                raw_terms[term] = (
+                    definition["@id"],
+                    "@type" in definition,
+                    False,
+                )
+
+            else:
+                raise UnsupportedJsonldContextException(
+                    f"Unsupported term definition: {term}"
+                )
+
+        def resolve(term: str, visiting: tuple[str, ...]) -> str:
+            if term in self._terms:
+                return self._terms[term][0]
+
+            if term in visiting:
+                raise UnsupportedJsonldContextException(
+                    f"Cyclic term definition: {term}"
+                )
+
+            raw_iri, is_id_type, simple = raw_terms[term]
+
+            if raw_iri.startswith("@"):
+                raise UnsupportedJsonldContextException(
+                    f"Keyword aliases are not supported: {term}"
+                )
+
+            iri = raw_iri
+
+            if raw_iri in raw_terms and raw_iri != term:
+                iri = resolve(raw_iri, visiting + (term,))
+
+            else:
+                prefix, colon, suffix = raw_iri.partition(":")
+
+                if (
+                    colon
+                    and prefix
+                    and prefix != "_"
+                    and not suffix.startswith("//")
+                    and prefix in raw_terms
+                    and prefix != term
+                ):
+                    prefix_iri = resolve(prefix, visiting + (term,))
+
+                    if prefix in self._prefixes:
+                        iri = prefix_iri + suffix
+
+            if not _ABSOLUTE_IRI_PATTERN.match(iri):
+                raise UnsupportedJsonldContextException(
+                    f"Term does not resolve to an absolute IRI: {term}"
+                )
+
+            self._terms[term] = (iri, is_id_type)
+
+            if simple and iri.endswith(_GEN_DELIMS):
+                self._prefixes[term] = iri
+
+            return iri
+
+        for term in raw_terms:
+            resolve(term, ())
+
+        iris = [iri for iri, _ in self._terms.values()]
+
+        if len(iris) != len(set(iris)):
+            raise UnsupportedJsonldContextException(
+                "Multiple terms mapped to the same IRI are not supported."
+            )
+
+    def _expand_iri(self, value: str, vocab: bool) -> str:
+        """Expands a term, CURIE or absolute IRI to an absolute IRI."""
+        if vocab and value in self._terms:
+            return self._terms[value][0]
+
+        if value.startswith("@"):
+            raise UnsupportedJsonldValueException(
+                f"Keyword-like value: {value}"
+            )
+
+        prefix, colon, suffix = value.partition(":")
+
+        if colon and prefix:
+            if prefix == "_" or suffix.startswith("//"):
+                return value
+
+            prefix_iri = self._prefixes.get(prefix)
+
+            if prefix_iri is not None:
+                return prefix_iri + suffix
+
+            if _ABSOLUTE_IRI_PATTERN.match(value):
+                return value
+
+        # 相対IRIはpyldのbase解決に依存するため対象外
+        raise UnsupportedJsonldValueException(f"Relative IRI: {value}")
+
+    def _compact_iri(
+        self, iri: str, vocab: bool, exclude_terms: bool = False
+    ) -> str:
+        """Compacts an absolute IRI to a term, CURIE or the IRI itself."""
+        if vocab and not exclude_terms and iri in self._iri_terms:
+            return self._iri_terms[iri]
+
+        candidate = None
+
+        for term, prefix_iri in self._prefixes.items():
+            if iri == prefix_iri or not iri.startswith(prefix_iri):
+                continue
+
+            curie = f"{term}:{iri[len(prefix_iri):]}"
+
+            # 短いもの、同じ長さなら辞書順で小さいものを選択
+            if candidate is None or (len(curie), curie) < (
+                len(candidate),
+                candidate,
+            ):
+                candidate = curie
+
+        if candidate is not None:
+            return candidate
+
+        # pyldでエラーとなるIRIや相対IRIはpyldに処理を委ねる
+        if not _ABSOLUTE_IRI_PATTERN.match(iri) or any(
+            iri.startswith(f"{term}:") for term in self._prefixes
+        ):
+            raise UnsupportedJsonldValueException(f"Cannot compact IRI: {iri}")
+
+        return iri
+
+    def _round_trip_iri(self, value: str, vocab: bool = False) -> str:
+        """Returns the compacted form of an IRI-valued string."""
+        prefix, colon, suffix = value.partition(":")
+
+        # 他のprefixと競合しないCURIEは展開・圧縮しても変わらない
+        if (
+            colon
+            and prefix in self._isolated_prefixes
+            and suffix
+            and not suffix.startswith("//")
+            and not (vocab and value in self._terms)
+        ):
+            return value
+
+        return self._compact_iri(self._expand_iri(value, vocab), vocab)
+
+    def compact(self, record: dict[str, Any]) -> dict[str, Any]:
+        """Converts a record to a compacted JSON-LD dictionary.
+
+        Args:
+            record (dict[str, Any]): The record to convert.
+
+        Returns:
+            dict[str, Any]: Data in JSON-LD format with `@context`
+            set to the context URI.
+
+        Raises:
+            UnsupportedJsonldValueException: If the record contains a value
+            the emitter cannot convert identically to pyld.
+        """
+        compacted = self._compact_node(record)
+
+        if not compacted.keys() - {"@id"}:
+            # トップレベルの@idのみのノードはpyldでは削除される
+            raise UnsupportedJsonldValueException("Empty top-level node.")
+
+        return {"@context": self.context_uri} | compacted
+
+    def _compact_node(self, node: dict[str, Any]) -> dict[str, Any]:
+        """Compacts a node object."""
+        compacted: dict[str, list[Any]] = {}
+        arrays: set[str] = set()
+
+        for key, value in node.items():
+            if key == "@id":
+                if not isinstance(value, str):
+                    raise UnsupportedJsonldValueException(
+                        f"Invalid @id: {value}"
+                    )
+
+                compacted["@id"] = [self._round_trip_iri(value)]
+
+                continue
+
+            if key == "@type":
+                if not isinstance(value, str):
+                    raise UnsupportedJsonldValueException(
+                        f"Unsupported @type: {value}"
+                    )
+
+                compacted["@type"] = [self._round_trip_iri(value, vocab=True)]
+
+                continue
+
+            if key.startswith("@") or ":" in key:
+                raise UnsupportedJsonldValueException(
+                    f"Unsupported key: {key}"
+                )
+
+            term = self._terms.get(key)
+
+            # コンテキストに定義されていないキーは展開時に削除される
+            if term is None:
+                continue
+
+            is_id_type = term[1]
+
+            if isinstance(value, list):
+                items = value
+
+                if not any(item is not None for item in items):
+                    compacted.setdefault(key, [])
+                    arrays.add(key)
+
+                    continue
+
+            elif value is None:
+                continue
+
+            else:
+                items = [value]
+
+            for item in items:
+                if item is None:
+                    continue
+
+                item_key = key
+
+                if isinstance(item, str):
+                    if is_id_type:
+                        item = self._round_trip_iri(item)
+
+                elif isinstance(item, dict):
+                    item = self._compact_node(item)
+
+                elif isinstance(item, (bool, int, float)):
+                    if is_id_type:
+                        item_key = self._literal_keys[key]
+
+                else:
+                    raise UnsupportedJsonldValueException(
+                        f"Unsupported value type: {type(item)}"
+                    )
+
+                compacted.setdefault(item_key, []).append(item)
+
+        return {
+            key: (
+                values[0] if len(values) == 1 and key not in arrays else values
+            )
+            for key, values in compacted.items()
+        }
+
+    def triples(
+        self, record: dict[str, Any], blank_node_prefix: str
+    ) -> list[tuple[str, str, RdfTerm]]:
+        """Converts a record to RDF triples.
+
+        Args:
+            record (dict[str, Any]): The record to convert.
+            blank_node_prefix (str): Prefix of the blank node labels, which
+                are numbered in the order the blank nodes appear.
+
+        Returns:
+            list[tuple[str, str, RdfTerm]]: The subject, predicate and object
+            of each triple. Duplicate triples are not removed.
+
+        Raises:
+            UnsupportedJsonldValueException: If the record contains a value
+            the emitter cannot convert identically to pyld.
+        """
+        triples: list[tuple[str, str, RdfTerm]] = []
+
+        blank_nodes = (f"{blank_node_prefix}{i}" for i in count())
+
+        self._node_triples(record, blank_nodes, triples)
+
+        return triples
+
+    def _rdf_iri(self, value: str, vocab: bool) -> str:
+        """Expands a value to an IRI that pyld writes as is."""
+        iri = self._expand_iri(value, vocab)
+
+        # 入力中の空白ノードはpyldでラベルが振り直される
+        if iri.startswith("_:") or _WHITESPACE_PATTERN.search(iri):
+            raise UnsupportedJsonldValueException(f"Unsupported IRI: {iri}")
+
+        return iri
+
+    def _node_triples(
+        self,
+        node: dict[str, Any],
+        blank_nodes: Iterator[str],
+        triples: list[tuple[str, str, RdfTerm]],
+    ) -> str:
+        """Appends the triples of a node object and returns its subject."""
+        node_id = node.get("@id")
+
+        if node_id is None:
+            subject = next(blank_nodes)
+
+        elif isinstance(node_id, str):
+            subject = self._rdf_iri(node_id, vocab=False)
+
+        else:
+            raise UnsupportedJsonldValueException(f"Invalid @id: {node_id}")
+
+        for key, value in node.items():
+            if key == "@id":
+                continue
+
+            if key == "@type":
+                if not isinstance(value, str):
+                    raise UnsupportedJsonldValueException(
+                        f"Unsupported @type: {value}"
+                    )
+
+                triples.append(
+                    (subject, RDF_TYPE, self._rdf_iri(value, vocab=True))
+                )
+
+                continue
+
+            if key.startswith("@") or ":" in key:
+                raise UnsupportedJsonldValueException(
+                    f"Unsupported key: {key}"
+                )
+
+            term = self._terms.get(key)
+
+            # コンテキストに定義されていないキーは展開時に削除される
+            if term is None:
+                continue
+
+            predicate, is_id_type = term
+
+            for item in value if isinstance(value, list) else [value]:
+                if item is None:
+                    continue
+
+                if isinstance(item, str):
+                    obj = (
+                        self._rdf_iri(item, vocab=False)
+                        if is_id_type
+                        else rdf_literal(item)
+                    )
+
+                elif isinstance(item, dict):
+                    obj = self._node_triples(item, blank_nodes, triples)
+
+                elif isinstance(item, (bool, int, float)):
+                    obj = rdf_literal(item)
+
+                else:
+                    raise UnsupportedJsonldValueException(
+                        f"Unsupported value type: {type(item)}"
+                    )
+
+                triples.append((subject, predicate, obj))
+
+        return subject
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from typing import IO, Any, Callable
+
+if __name__ == "__main__":
+    from custom_exception import UnsupportedJsonldFormatException
+    from json_serializer import JsonSerializer
+    from shard_writer import TextShardWriter
+else:
+    from .custom_exception import UnsupportedJsonldFormatException
+    from .json_serializer import JsonSerializer
+    from .shard_writer import TextShardWriter
+
+# 選択できるJSON-LDファイルの形式
+JSONLD_FORMATS = ("indented", "compact")
+
+# @graphの要素のインデント
+GRAPH_ITEM_INDENT = "    "
+
+
+def check_jsonld_format(jsonld_format: str) -> None:
+    """
+    Check that a JSON-LD file format is known.
+
+    Args:
+        jsonld_format (str): Format of the JSON-LD files.
+
+    Raises:
+        UnsupportedJsonldFormatException: If the format is unknown.
+    """
+    if jsonld_format not in JSONLD_FORMATS:
+        raise UnsupportedJsonldFormatException(
+            f"Unknown JSON-LD file format: {jsonld_format}"
+        )
+
+
+def graph_item_str(
+    jsonld_record: dict[str, Any],
+    serializer: JsonSerializer,
+    jsonld_format: str = "indented",
+) -> str:
+    """
+    Serialize a record without `@context` as an element of `@graph`.
+
+    The keys are sorted as in the JSON Lines output. In the indented format,
+    the lines after the first are indented to the level of the elements
+    of `@graph`.
+
+    Args:
+        jsonld_record (dict[str, Any]): The record without `@context`.
+        serializer (JsonSerializer): The JSON serializer.
+        jsonld_format (str): Format of the JSON-LD files
+            ("indented" or "compact").
+
+    Returns:
+        str: The serialized element.
+    """
+    if jsonld_format == "compact":
+        return serializer.dumps_document(
+            jsonld_record, sort_keys=True, compact=True
+        )
+
+    return serializer.dumps_document(jsonld_record, sort_keys=True).replace(
+        "\n", "\n" + GRAPH_ITEM_INDENT
+    )
+
+
+class JsonldShardWriter(TextShardWriter):
+    """Streams serialized records to JSON-LD files of limited size.
+
+    Each file holds the `@context` and a `@graph` of records, and is
+    split in the same way as TextShardWriter.
+
+    The files are written in the same format as
+    json.dumps({"@context": ..., "@graph": [...]}, ensure_ascii=False,
+    indent=2), or json.dumps(..., ensure_ascii=False, separators=(",", ":"))
+    in the compact format.
+    """
+
+    def __init__(
+        self,
+        file_path_prefix: str,
+        file_extension: str,
+        context_data: dict[str, Any],
+        max_file_size: int,
+        serializer: JsonSerializer,
+        open_file: Callable[[str], IO[str]],
+        jsonld_format: str = "indented",
+        shard_written: Callable[[str, int], None] | None = None,
+    ) -> None:
+        """
+        Args:
+            file_path_prefix (str): Prefix for the output files, which are
+                named `<file_path_prefix>_001<file_extension>` and so on.
+            file_extension (str): Extension of the output files.
+            context_data (dict[str, Any]): Context data for JSON-LD.
+            max_file_size (int): Maximum size of each file in bytes
+                (before compression, if open_file compresses the file).
+            serializer (JsonSerializer): The JSON serializer.
+            open_file (Callable[[str], IO[str]]): Function that opens
+                an output file for writing.
+            jsonld_format (str): Format of the files ("indented" or "compact").
+                The records must be serialized by graph_item_str
+                in the same format.
+            shard_written (Callable[[str, int], None] | None): Function called
+                with the path and the number of records of each written file.
+        """
+        check_jsonld_format(jsonld_format)
+
+        self.jsonld_format = jsonld_format
+
+        # @contextと@graphの開始部分、要素の区切り、@graphの終了部分
+        if jsonld_format == "compact":
+            header = (
+                '{"@context":'
+                + serializer.dumps_document(context_data, compact=True)
+                + ',"@graph":['
+            )
+            separator = ","
+            footer = "]}"
+
+        else:
+            header = (
+                '{\n  "@context": '
+                + serializer.dumps_document(context_data).replace("\n", "\n  ")
+                + ',\n  "@graph": [\n'
+                + GRAPH_ITEM_INDENT
+            )
+            separator = ",\n" + GRAPH_ITEM_INDENT
+            footer = "\n  ]\n}"
+
+        super().__init__(
+            file_path_prefix,
+            file_extension,
+            max_file_size,
+            open_file,
+            header,
+            separator,
+            footer,
+            shard_written,
+        )
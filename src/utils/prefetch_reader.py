@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import io
+import queue
+import threading
+from typing import Iterable
+
+# 読み込み終了を示す番兵
+_END_OF_CHUNKS = object()
+
+
+class PrefetchReader(io.RawIOBase):
+    """Binary stream that reads chunks from an iterable in a background thread.
+
+    Chunks are read ahead into a bounded queue while the consumer processes
+    the previous ones, so that, for example, a download and the conversion
+    of the downloaded bytes run at the same time.
+    An exception raised while reading the chunks is raised again
+    by the read method of the stream.
+    """
+
+    def __init__(
+        self, chunks: Iterable[bytes], max_prefetch_chunks: int
+    ) -> None:
+        """
+        Args:
+            chunks (Iterable[bytes]): The chunks of bytes to read.
+            max_prefetch_chunks (int): Maximum number of chunks read ahead.
+        """
+        super().__init__()
+
+        self._queue: queue.Queue = queue.Queue(
+            maxsize=max(max_prefetch_chunks, 1)
+        )
+        self._stopped = threading.Event()
+        self._error: BaseException | None = None
+        self._buffer = memoryview(b"")
+        self._eof = False
+
+        self._thread = threading.Thread(
+            target=self._prefetch, args=(chunks,), daemon=True
+        )
+        self._thread.start()
+
+    def _prefetch(self, chunks: Iterable[bytes]) -> None:
+        """Reads the chunks into the queue until the stream is closed."""
+        try:
+            for chunk in chunks:
+                if chunk and not self._put(chunk):
+                    return
+
+        except BaseException as e:
+            self._error = e
+
+        self._put(_END_OF_CHUNKS)
+
+    def _put(self, item: object) -> bool:
+        """Puts an item into the queue, giving up if the stream is closed."""
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+
+                return True
+
+            except queue.Full:
+                continue
+
+        return False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(  # type: ignore[override]
+        self, buffer: bytearray | memoryview
+    ) -> int:
+        if not self._buffer:
+            if self._eof:
+                return 0
+
+            item = self._queue.get()
+
+            if item is _END_OF_CHUNKS:
+                self._eof = True
+
+                if self._error is not None:
+                    raise self._error
+
+                return 0
+
+            self._buffer = memoryview(item)
+
+        size = min(len(buffer), len(self._buffer))
+
+        buffer[:size] = self._buffer[:size]
+
+        self._buffer = self._buffer[size:]
+
+        return size
+
+    def close(self) -> None:
+        # 先読みスレッドを停止させる
+        self._stopped.set()
+
+        super().close()
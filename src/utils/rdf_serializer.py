@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Iterable, NamedTuple, Union
+
+if __name__ == "__main__":
+    from custom_exception import UnsupportedOutputFormatException
+else:
+    from .custom_exception import UnsupportedOutputFormatException
+
+# 選択できる出力形式と出力ファイルの拡張子
+OUTPUT_FORMAT_EXTENSIONS = {
+    "jsonl": ".jsonl",
+    "ntriples": ".nt",
+    "nquads": ".nq",
+    "turtle": ".ttl",
+}
+
+RDF_TYPE = "http://www.w3.org/1999/02/22-rdf-syntax-ns#type"
+XSD_BOOLEAN = "http://www.w3.org/2001/XMLSchema#boolean"
+XSD_DOUBLE = "http://www.w3.org/2001/XMLSchema#double"
+XSD_INTEGER = "http://www.w3.org/2001/XMLSchema#integer"
+XSD_STRING = "http://www.w3.org/2001/XMLSchema#string"
+
+# pyldの浮動小数点数の正規表記 (指数部の不要な0を除く)
+_DOUBLE_EXPONENT_PATTERN = re.compile(r"(\d)0*E\+?0*(\d)")
+
+# N-TriplesのIRIに書けない文字
+_IRI_ESCAPE_PATTERN = re.compile(r'[\x00-\x20<>"{}|^`\\]')
+
+# リテラル中でエスケープする文字 (pyldと同じ)
+_LITERAL_ESCAPE_PATTERN = re.compile(r'[\\\t\n\r"]')
+
+_LITERAL_ESCAPES = {
+    "\\": "\\\\",
+    "\t": "\\t",
+    "\n": "\\n",
+    "\r": "\\r",
+    '"': '\\"',
+}
+
+
+class RdfLiteral(NamedTuple):
+    """A literal of an RDF triple.
+
+    Attributes:
+        lexical (str): The lexical form of the literal.
+        datatype (str): IRI of the datatype.
+    """
+
+    lexical: str
+    datatype: str = XSD_STRING
+
+
+# IRI、"_:"で始まる空白ノード、またはリテラル
+RdfTerm = Union[str, RdfLiteral]
+
+
+def check_output_format(output_format: str) -> None:
+    """
+    Check that an output format is known.
+
+    Args:
+        output_format (str): Output format ("jsonl", "ntriples", "nquads"
+            or "turtle").
+
+    Raises:
+        UnsupportedOutputFormatException: If the format is unknown.
+    """
+    if output_format not in OUTPUT_FORMAT_EXTENSIONS:
+        raise UnsupportedOutputFormatException(
+            f"Unknown output format: {output_format}"
+        )
+
+
+def rdf_literal(value: str | int | float | bool) -> RdfLiteral:
+    """
+    Convert a JSON value to a literal in the same way as pyld's toRdf.
+
+    Args:
+        value (str | int | float | bool): The value.
+
+    Returns:
+        RdfLiteral: The literal with the canonical lexical form of the value.
+    """
+    if isinstance(value, bool):
+        return RdfLiteral("true" if value else "false", XSD_BOOLEAN)
+
+    if isinstance(value, float):
+        return RdfLiteral(
+            _DOUBLE_EXPONENT_PATTERN.sub(r"\1E\2", "%1.15E" % value),
+            XSD_DOUBLE,
+        )
+
+    if isinstance(value, int):
+        return RdfLiteral(str(value), XSD_INTEGER)
+
+    return RdfLiteral(value)
+
+
+def _escape_iri_char(match: re.Match) -> str:
+    return "\\u%04X" % ord(match.group())
+
+
+def _escape_literal_char(match: re.Match) -> str:
+    return _LITERAL_ESCAPES[match.group()]
+
+
+def rdf_term_str(term: RdfTerm) -> str:
+    """
+    Write a term in N-Triples syntax.
+
+    Args:
+        term (RdfTerm): An IRI, a blank node label starting with "_:",
+            or a literal.
+
+    Returns:
+        str: The term in N-Triples syntax.
+    """
+    if isinstance(term, RdfLiteral):
+        lexical = _LITERAL_ESCAPE_PATTERN.sub(
+            _escape_literal_char, term.lexical
+        )
+
+        # xsd:stringは型を省略する
+        if term.datatype == XSD_STRING:
+            return f'"{lexical}"'
+
+        return f'"{lexical}"^^<{term.datatype}>'
+
+    if term.startswith("_:"):
+        return term
+
+    return _iri_str(term)
+
+
+@lru_cache(maxsize=65536)
+def _iri_str(iri: str) -> str:
+    """Writes an IRI in N-Triples syntax.
+
+    The results are cached, because the predicates and many of the objects
+    are repeated in each record."""
+    return "<" + _IRI_ESCAPE_PATTERN.sub(_escape_iri_char, iri) + ">"
+
+
+def nquad_lines_str(
+    triples: Iterable[tuple[str, str, RdfTerm]],
+    graphs: Iterable[str | None] = (None,),
+) -> str:
+    """
+    Write triples as lines of N-Triples, or as quads of N-Quads.
+
+    Each triple is written once to each graph, even if it is given
+    more than once.
+
+    Args:
+        triples (Iterable[tuple[str, str, RdfTerm]]): The subject, predicate
+            and object of each triple.
+        graphs (Iterable[str | None]): IRIs of the named graphs the triples
+            are written to. None is the default graph.
+
+    Returns:
+        str: The lines joined into one string, each terminated by a newline.
+    """
+    triple_strs = list(
+        dict.fromkeys(
+            f"{rdf_term_str(subject)} {_iri_str(predicate)} "
+            + rdf_term_str(obj)
+            for subject, predicate, obj in triples
+        )
+    )
+
+    lines = []
+
+    for graph in graphs:
+        line_end = " .\n" if graph is None else f" {rdf_term_str(graph)} .\n"
+
+        lines.extend([triple_str + line_end for triple_str in triple_strs])
+
+    return "".join(lines)
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+# チェックサムの計算時に読み込むサイズ
+_READ_SIZE = 1024 * 1024
+
+
+def file_size_and_checksum(file_path: str) -> tuple[int, str]:
+    """
+    Get the size and the SHA-256 checksum of a file.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        tuple[int, str]: The size in bytes and the hexadecimal checksum.
+    """
+    sha256 = hashlib.sha256()
+    size = 0
+
+    with open(file_path, "rb") as f:
+        while chunk := f.read(_READ_SIZE):
+            sha256.update(chunk)
+            size += len(chunk)
+
+    return size, sha256.hexdigest()
+
+
+def read_shard_paths(manifest_file_path: str) -> list[str] | None:
+    """
+    Get the paths to the files listed in a manifest.
+
+    Args:
+        manifest_file_path (str): Path to the manifest file.
+
+    Returns:
+        list[str] | None: The paths to the files, or None if the manifest
+        does not exist or cannot be read.
+    """
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_file_path))
+
+    try:
+        with open(manifest_file_path) as f:
+            manifest = json.load(f)
+
+        return [
+            os.path.join(manifest_dir, shard["path"])
+            for shard in manifest["shards"]
+        ]
+
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+class ShardManifest:
+    """Writes the manifest of the files of a split output.
+
+    The size and checksum of each file are computed in background threads
+    as soon as the file is written, while the next file is being written.
+    The manifest is written when the writer is closed without an error,
+    so a manifest lists only complete files.
+
+    The manifest is a JSON object with the attributes given to the writer
+    and `shards`, the list of the files in order, each with its path
+    relative to the manifest, size in bytes, number of records
+    and SHA-256 checksum.
+    """
+
+    def __init__(
+        self,
+        manifest_file_path: str,
+        attributes: dict[str, Any] | None = None,
+        threads: int = 1,
+    ) -> None:
+        """
+        Args:
+            manifest_file_path (str): Path to the manifest file.
+            attributes (dict[str, Any] | None): Attributes of the output
+                written at the top of the manifest, such as its format.
+            threads (int): Number of threads computing the checksums.
+        """
+        self._manifest_file_path = manifest_file_path
+        self._attributes = dict(attributes or {})
+
+        # 前回の出力の一覧は上書きされるファイルと一致しなくなるため削除する
+        if os.path.exists(manifest_file_path):
+            os.remove(manifest_file_path)
+
+        self._executor = ThreadPoolExecutor(max_workers=max(threads, 1))
+
+        # (ファイルパス, レコード数, サイズとチェックサムの計算結果)
+        self._shards: list[tuple[str, int, Future[tuple[int, str]]]] = []
+
+    def add_shard(self, file_path: str, record_count: int) -> None:
+        """
+        Add a written file to the manifest.
+
+        Args:
+            file_path (str): Path to the file, which must be closed.
+            record_count (int): Number of records in the file.
+        """
+        self._shards.append(
+            (
+                file_path,
+                record_count,
+                self._executor.submit(file_size_and_checksum, file_path),
+            )
+        )
+
+    def close(self) -> None:
+        """Wait for the checksums and write the manifest atomically."""
+        manifest_dir = os.path.dirname(
+            os.path.abspath(self._manifest_file_path)
+        )
+
+        try:
+            shards = []
+
+            for file_path, record_count, future in self._shards:
+                size, checksum = future.result()
+
+                shards.append(
+                    {
+                        "path": os.path.relpath(
+                            os.path.abspath(file_path), manifest_dir
+                        ),
+                        "size": size,
+                        "records": record_count,
+                        "sha256": checksum,
+                    }
+                )
+
+        finally:
+            self._executor.shutdown()
+
+        manifest = self._attributes | {"shards": shards}
+
+        # 一時ファイルに書き込んでから置き換える
+        tmp_file_path = f"{self._manifest_file_path}.tmp"
+
+        with open(tmp_file_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        os.replace(tmp_file_path, self._manifest_file_path)
+
+    def abort(self) -> None:
+        """Stop computing the checksums without writing the manifest."""
+        self._executor.shutdown(cancel_futures=True)
+
+    def __enter__(self) -> ShardManifest:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        # 変換が失敗した場合は不完全なファイルの一覧を書き込まない
+        if exc_type is None:
+            self.close()
+
+        else:
+            self.abort()
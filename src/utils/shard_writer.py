@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import os
+import re
+from typing import IO, Callable, Iterable
+
+
+def utf8_size(s: str) -> int:
+    """Returns the size of a string encoded in UTF-8."""
+    return len(s) if s.isascii() else len(s.encode("utf-8"))
+
+
+class TextShardWriter:
+    """Streams records to text files of limited size.
+
+    Each file starts with header, holds records separated by separator and
+    ends with footer, so that each file is a complete document. A file is
+    opened with the first record written to it, and each record is written
+    as soon as it arrives, so that only the record being written is held in
+    memory.
+
+    The size of each file is counted from the bytes written to it, and a
+    record that would make the file larger than max_file_size is written to
+    the next file. A file is larger than max_file_size only if it holds a
+    single record that does not fit in an empty file.
+
+    The files of a previous output are removed when the writer is created,
+    so that the files left after writing are only the ones of this output,
+    even if the previous output was split into more files. They are the
+    files listed in the manifest of the previous output if it is given, or
+    otherwise the files with the same prefix and extension numbered from
+    `_001` up to the first missing number, so that other files with similar
+    names are kept.
+    """
+
+    def __init__(
+        self,
+        file_path_prefix: str,
+        file_extension: str,
+        max_file_size: int,
+        open_file: Callable[[str], IO[str]],
+        header: str = "",
+        separator: str = "",
+        footer: str = "",
+        shard_written: Callable[[str, int], None] | None = None,
+        previous_shard_paths: Iterable[str] | None = None,
+    ) -> None:
+        """
+        Args:
+            file_path_prefix (str): Prefix for the output files, which are
+                named `<file_path_prefix>_001<file_extension>` and so on.
+            file_extension (str): Extension of the output files.
+            max_file_size (int): Maximum size of each file in bytes
+                (before compression, if open_file compresses the file).
+            open_file (Callable[[str], IO[str]]): Function that opens
+                an output file for writing.
+            header (str): Text written at the start of each file. It can be
+                changed with the header attribute until the first file
+                is opened.
+            separator (str): Text written between two records.
+            footer (str): Text written at the end of each file.
+            shard_written (Callable[[str, int], None] | None): Function called
+                with the path and the number of records of each written file.
+            previous_shard_paths (Iterable[str] | None): Paths to the files
+                of the previous output listed in its manifest, or None if
+                there is no manifest.
+        """
+        self._file_path_prefix = file_path_prefix
+        self._file_extension = file_extension
+        self._max_file_size = max_file_size
+        self._open_file = open_file
+        self._shard_written = shard_written
+
+        self.header = header
+        self._separator = separator
+        self._footer = footer
+
+        self._separator_size = utf8_size(separator)
+        self._footer_size = utf8_size(footer)
+
+        self._file_index = 1
+        self._file: IO[str] | None = None
+        self._file_path = ""
+        self._record_count = 0
+        self._current_size = 0
+
+        self._remove_previous_shards(previous_shard_paths)
+
+    def _shard_file_path(self, file_index: int) -> str:
+        """Returns the path to the file with the given number."""
+        return (
+            f"{self._file_path_prefix}_{file_index:03}" + self._file_extension
+        )
+
+    def _remove_previous_shards(
+        self, previous_shard_paths: Iterable[str] | None
+    ) -> None:
+        """Removes the files of a previous output."""
+        if previous_shard_paths is None:
+            # 一覧がない場合は連番の途切れるまでを前回の出力とする
+            file_index = 1
+
+            while os.path.isfile(self._shard_file_path(file_index)):
+                os.remove(self._shard_file_path(file_index))
+
+                file_index += 1
+
+            return
+
+        shard_dir = os.path.dirname(os.path.abspath(self._file_path_prefix))
+
+        # 圧縮形式が異なる場合も含め、同じ名前の連番のファイルのみ削除する
+        shard_pattern = re.compile(
+            re.escape(os.path.basename(self._file_path_prefix))
+            + r"_[0-9]{3,}(\.[A-Za-z0-9]+)+"
+        )
+
+        for file_path in previous_shard_paths:
+            file_path = os.path.abspath(file_path)
+
+            if (
+                os.path.dirname(file_path) == shard_dir
+                and shard_pattern.fullmatch(os.path.basename(file_path))
+                and os.path.isfile(file_path)
+            ):
+                os.remove(file_path)
+
+    def write(self, record: str) -> None:
+        """
+        Write a record to the current file, or to the next file
+        if the current file would exceed the maximum size.
+
+        Args:
+            record (str): The serialized record.
+        """
+        record_size = utf8_size(record)
+
+        if (
+            self._file is not None
+            and self._current_size
+            + self._separator_size
+            + record_size
+            + self._footer_size
+            > self._max_file_size
+        ):
+            self._close_shard()
+
+        if self._file is None:
+            self._open_shard()
+
+            self._file.write(record)
+            self._current_size = utf8_size(self.header) + record_size
+
+        else:
+            self._file.write(self._separator + record)
+            self._current_size += self._separator_size + record_size
+
+        self._record_count += 1
+
+    def write_items(self, records: Iterable[str]) -> None:
+        """
+        Write records to the files.
+
+        Args:
+            records (Iterable[str]): The serialized records.
+        """
+        for record in records:
+            self.write(record)
+
+    def _open_shard(self) -> None:
+        """Opens the next file and writes the header."""
+        self._file_path = self._shard_file_path(self._file_index)
+
+        self._file = self._open_file(self._file_path)
+        self._file.write(self.header)
+
+    def _close_shard(self) -> None:
+        """Writes the footer and closes the current file."""
+        if self._file is None:
+            return
+
+        self._file.write(self._footer)
+        self._file.close()
+        self._file = None
+
+        if self._shard_written is not None:
+            self._shard_written(self._file_path, self._record_count)
+
+        self._record_count = 0
+        self._current_size = 0
+        self._file_index += 1
+
+    def close(self) -> None:
+        """Close the last file."""
+        self._close_shard()
+
+    def abort(self) -> None:
+        """Close and remove the file being written, which is incomplete."""
+        if self._file is None:
+            return
+
+        self._file.close()
+        self._file = None
+
+        os.remove(self._file_path)
+
+    def __enter__(self) -> TextShardWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        # 変換が失敗した場合は書き込み途中のファイルを残さない
+        if exc_type is None:
+            self.close()
+
+        else:
+            self.abort()
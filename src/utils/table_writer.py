@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Iterable
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # 表形式で出力しない場合は不要
+    pyarrow = None
+
+if __name__ == "__main__":
+    from custom_exception import UnsupportedTableFormatException
+else:
+    from .custom_exception import UnsupportedTableFormatException
+
+# 選択できる表形式と出力ファイルの拡張子
+TABLE_FORMAT_EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+# 相互作用の表の列 (各行のタプルの順)
+INTERACTION_TABLE_COLUMNS = (
+    "id",
+    "participants",
+    "data_source",
+    "references",
+    "confidence",
+    "taxonomy",
+)
+
+
+def check_table_format(table_format: str) -> None:
+    """
+    Check that a table format is available.
+
+    Args:
+        table_format (str): Table format ("parquet" or "arrow").
+
+    Raises:
+        UnsupportedTableFormatException: If the format is unknown, or the
+            pyarrow package is not installed.
+    """
+    if table_format not in TABLE_FORMAT_EXTENSIONS:
+        raise UnsupportedTableFormatException(
+            f"Unknown table format: {table_format}"
+        )
+
+    if pyarrow is None:
+        raise UnsupportedTableFormatException(
+            "The pyarrow package is required for the table output."
+        )
+
+
+def interaction_table_schema() -> pyarrow.Schema:
+    """
+    Get the schema of the table of interactions.
+
+    Returns:
+        pyarrow.Schema: The schema, with the columns in the order
+        of INTERACTION_TABLE_COLUMNS.
+    """
+    list_of_strings = pyarrow.list_(pyarrow.string())
+
+    return pyarrow.schema(
+        [
+            ("id", pyarrow.string()),
+            ("participants", list_of_strings),
+            ("data_source", list_of_strings),
+            ("references", list_of_strings),
+            ("confidence", pyarrow.float64()),
+            ("taxonomy", pyarrow.string()),
+        ]
+    )
+
+
+class InteractionTableWriter:
+    """Writes the table of interactions as Parquet or Arrow IPC in batches.
+
+    The rows are buffered until batch_size rows are written, and each batch
+    is written as a row group of Parquet, or a record batch of Arrow IPC,
+    so that only one batch is held in memory.
+    """
+
+    def __init__(
+        self, file_path: str, table_format: str, batch_size: int
+    ) -> None:
+        """
+        Args:
+            file_path (str): Path to the output file.
+            table_format (str): Table format ("parquet" or "arrow").
+            batch_size (int): Number of rows written together as one batch.
+        """
+        check_table_format(table_format)
+
+        self._file_path = file_path
+        self._batch_size = max(batch_size, 1)
+        self._schema = interaction_table_schema()
+
+        if table_format == "parquet":
+            self._writer = pyarrow.parquet.ParquetWriter(
+                file_path, self._schema
+            )
+
+        else:
+            self._writer = pyarrow.ipc.new_file(file_path, self._schema)
+
+        self._rows: list[tuple[Any, ...]] = []
+
+    def write_rows(self, rows: Iterable[tuple[Any, ...]]) -> None:
+        """
+        Write rows to the table.
+
+        Args:
+            rows (Iterable[tuple[Any, ...]]): The values of each row,
+                in the order of INTERACTION_TABLE_COLUMNS.
+        """
+        self._rows.extend(rows)
+
+        while len(self._rows) >= self._batch_size:
+            self._write_batch(self._rows[: self._batch_size])
+
+            del self._rows[: self._batch_size]
+
+    def _write_batch(self, rows: list[tuple[Any, ...]]) -> None:
+        """Writes rows as one batch."""
+        columns = list(zip(*rows))
+
+        batch = pyarrow.RecordBatch.from_arrays(
+            [
+                pyarrow.array(values, type=field.type)
+                for values, field in zip(columns, self._schema)
+            ],
+            schema=self._schema,
+        )
+
+        self._writer.write_batch(batch)
+
+    def close(self) -> None:
+        """Write the remaining rows and close the file."""
+        if self._rows:
+            self._write_batch(self._rows)
+
+            self._rows = []
+
+        self._writer.close()
+
+    def abort(self) -> None:
+        """Close and remove the file, which is incomplete."""
+        self._writer.close()
+
+        os.remove(self._file_path)
+
+    def __enter__(self) -> InteractionTableWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        # 変換が失敗した場合は書き込み途中のファイルを残さない
+        if exc_type is None:
+            self.close()
+
+        else:
+            self.abort()
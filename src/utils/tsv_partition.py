@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import mmap
+import os
+from typing import Iterator
+
+
+def iter_byte_ranges(
+    file_path: str, start: int, chunk_bytes: int
+) -> Iterator[tuple[int, int]]:
+    """Split a file into newline-aligned byte ranges using mmap.
+
+    Each range starts at the beginning of a line and ends just after a
+    newline (or at the end of the file), so that a range can be parsed
+    independently of the others.
+
+    Args:
+        file_path (str): Path to the file to split.
+        start (int): Byte offset where the first range starts.
+        chunk_bytes (int): Approximate size of each range in bytes.
+
+    Yields:
+        tuple[int, int]: The start (inclusive) and end (exclusive)
+        byte offsets of a range.
+    """
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+
+        if start >= size:
+            return
+
+        chunk_bytes = max(chunk_bytes, 1)
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            while start < size:
+                # 目安のサイズに達した位置以降の最初の改行で区切る
+                newline_pos = mm.find(
+                    b"\n", min(start + chunk_bytes, size) - 1
+                )
+
+                end = size if newline_pos == -1 else newline_pos + 1
+
+                yield start, end
+
+                start = end
+
+
+def read_byte_range(file_path: str, start: int, end: int) -> bytes:
+    """Read a byte range of a file using mmap.
+
+    Args:
+        file_path (str): Path to the file to read.
+        start (int): Start byte offset (inclusive).
+        end (int): End byte offset (exclusive).
+
+    Returns:
+        bytes: The contents of the range.
+    """
+    with open(file_path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm[start:end]
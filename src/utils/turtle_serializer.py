@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Iterable
+
+if __name__ == "__main__":
+    from jsonld_emitter import _ABSOLUTE_IRI_PATTERN, _GEN_DELIMS
+    from rdf_serializer import (
+        RDF_TYPE,
+        XSD_BOOLEAN,
+        XSD_DOUBLE,
+        XSD_INTEGER,
+        XSD_STRING,
+        RdfLiteral,
+        RdfTerm,
+        rdf_term_str,
+    )
+else:
+    from .jsonld_emitter import _ABSOLUTE_IRI_PATTERN, _GEN_DELIMS
+    from .rdf_serializer import (
+        RDF_TYPE,
+        XSD_BOOLEAN,
+        XSD_DOUBLE,
+        XSD_INTEGER,
+        XSD_STRING,
+        RdfLiteral,
+        RdfTerm,
+        rdf_term_str,
+    )
+
+# Turtleのprefix名とローカル名として書ける文字列 (エスケープが不要なもの)
+_PREFIX_NAME_PATTERN = re.compile(
+    r"^[A-Za-z]([A-Za-z0-9_\-.]*[A-Za-z0-9_\-])?$"
+)
+_LOCAL_NAME_PATTERN = re.compile(
+    r"^([A-Za-z0-9_]([A-Za-z0-9_\-.]*[A-Za-z0-9_\-])?)?$"
+)
+
+# 型を省略して書けるリテラルの字句形式
+_INTEGER_PATTERN = re.compile(r"^[+-]?[0-9]+$")
+_DOUBLE_PATTERN = re.compile(
+    r"^[+-]?([0-9]+\.[0-9]*|\.[0-9]+|[0-9]+)[eE][+-]?[0-9]+$"
+)
+
+# 短縮したIRIのキャッシュの最大数
+_IRI_CACHE_SIZE = 65536
+
+
+def context_prefixes(context: dict[str, Any]) -> dict[str, str]:
+    """
+    Get the prefixes defined in a JSON-LD context that can be
+    written as Turtle prefixes.
+
+    Args:
+        context (dict[str, Any]): The JSON-LD context (value of `@context`).
+
+    Returns:
+        dict[str, str]: The namespace IRI of each prefix, in context order.
+    """
+    return {
+        term: iri
+        for term, iri in context.items()
+        if isinstance(iri, str)
+        and _PREFIX_NAME_PATTERN.match(term)
+        and _ABSOLUTE_IRI_PATTERN.match(iri)
+        and iri.endswith(_GEN_DELIMS)
+    }
+
+
+class TurtleSerializer:
+    """Writes RDF triples as Turtle, abbreviating IRIs with prefixes.
+
+    The triples of a record are written as one block per subject, with the
+    objects of the same predicate separated by commas. A blank node that
+    is the object of a single triple of a named subject is written inline
+    as `[ ... ]`, so the record of an interaction is a single block.
+
+    Each block is independent of the others apart from the prefixes, so the
+    output can be split between blocks into files that start with header.
+    """
+
+    def __init__(self, prefixes: dict[str, str]) -> None:
+        """
+        Args:
+            prefixes (dict[str, str]): The namespace IRI of each prefix.
+        """
+        self.prefixes = dict(prefixes)
+
+        # 同じ名前空間に複数のprefixがある場合は先のものを使用する
+        self._namespaces: dict[str, str] = {}
+
+        for prefix, iri in self.prefixes.items():
+            self._namespaces.setdefault(iri, prefix)
+
+        self.header = (
+            "".join(
+                f"@prefix {prefix}: {rdf_term_str(iri)} .\n"
+                for prefix, iri in self.prefixes.items()
+            )
+            + "\n"
+        )
+
+        self._iri_cache: dict[str, str] = {}
+
+    def iri_str(self, iri: str) -> str:
+        """
+        Write an IRI as a prefixed name, or as an IRI reference if no prefix
+        matches it.
+
+        Args:
+            iri (str): The IRI.
+
+        Returns:
+            str: The IRI in Turtle syntax.
+        """
+        cached = self._iri_cache.get(iri)
+
+        if cached is not None:
+            return cached
+
+        # 最後の"/"または"#"までを名前空間とする
+        split = max(iri.rfind("/"), iri.rfind("#")) + 1
+
+        prefix = self._namespaces.get(iri[:split])
+        local_name = iri[split:]
+
+        if prefix is not None and _LOCAL_NAME_PATTERN.match(local_name):
+            iri_str = f"{prefix}:{local_name}"
+
+        else:
+            iri_str = rdf_term_str(iri)
+
+        if len(self._iri_cache) >= _IRI_CACHE_SIZE:
+            self._iri_cache.clear()
+
+        self._iri_cache[iri] = iri_str
+
+        return iri_str
+
+    def term_str(self, term: RdfTerm) -> str:
+        """
+        Write an IRI, a blank node label or a literal in Turtle syntax.
+
+        Args:
+            term (RdfTerm): The term.
+
+        Returns:
+            str: The term in Turtle syntax.
+        """
+        if not isinstance(term, RdfLiteral):
+            return term if term.startswith("_:") else self.iri_str(term)
+
+        lexical, datatype = term
+
+        if datatype == XSD_STRING:
+            return rdf_term_str(term)
+
+        # 数値と真偽値は型を省略した表記で書く
+        if (
+            (datatype == XSD_INTEGER and _INTEGER_PATTERN.match(lexical))
+            or (datatype == XSD_DOUBLE and _DOUBLE_PATTERN.match(lexical))
+            or (datatype == XSD_BOOLEAN and lexical in ("true", "false"))
+        ):
+            return lexical
+
+        return (
+            rdf_term_str(RdfLiteral(lexical)) + "^^" + self.iri_str(datatype)
+        )
+
+    def subject_blocks_str(
+        self, triples: Iterable[tuple[str, str, RdfTerm]]
+    ) -> str:
+        """
+        Write the triples of a record as blocks of Turtle.
+
+        Duplicate triples are written once.
+
+        Args:
+            triples (Iterable[tuple[str, str, RdfTerm]]): The subject,
+                predicate and object of each triple.
+
+        Returns:
+            str: The blocks, each followed by an empty line.
+        """
+        # 主語 -> 述語 -> 目的語
+        subjects: dict[str, dict[str, list[RdfTerm]]] = {}
+
+        # 空白ノード -> 目的語として参照する主語
+        references: dict[str, list[str]] = {}
+
+        for subject, predicate, obj in triples:
+            objects = subjects.setdefault(subject, {}).setdefault(
+                predicate, []
+            )
+
+            if obj in objects:
+                continue
+
+            objects.append(obj)
+
+            if isinstance(obj, str) and obj.startswith("_:"):
+                references.setdefault(obj, []).append(subject)
+
+        # 名前のある主語から1回だけ参照される空白ノードは[]で書く
+        inline_nodes = {
+            node
+            for node, referrers in references.items()
+            if len(referrers) == 1 and not referrers[0].startswith("_:")
+        }
+
+        blocks = [
+            self._predicate_objects_str(
+                self.term_str(subject), properties, subjects, inline_nodes
+            )
+            + " .\n\n"
+            for subject, properties in subjects.items()
+            if subject not in inline_nodes
+        ]
+
+        return "".join(blocks)
+
+    def _predicate_objects_str(
+        self,
+        subject_str: str,
+        properties: dict[str, list[RdfTerm]],
+        subjects: dict[str, dict[str, list[RdfTerm]]],
+        inline_nodes: set[str],
+    ) -> str:
+        """Writes a subject block without the final period."""
+        predicate_strs = []
+
+        # rdf:typeは"a"として先頭に書く
+        for predicate in sorted(properties, key=lambda p: p != RDF_TYPE):
+            object_strs = [
+                (
+                    self._inline_node_str(subjects.get(obj, {}))
+                    if obj in inline_nodes
+                    else self.term_str(obj)
+                )
+                for obj in properties[predicate]
+            ]
+
+            predicate_strs.append(
+                ("a" if predicate == RDF_TYPE else self.iri_str(predicate))
+                + " "
+                + ", ".join(object_strs)
+            )
+
+        return subject_str + " " + " ;\n    ".join(predicate_strs)
+
+    def _inline_node_str(self, properties: dict[str, list[RdfTerm]]) -> str:
+        """Writes a blank node inline as `[ ... ]`."""
+        if not properties:
+            return "[]"
+
+        return (
+            "[ "
+            + " ; ".join(
+                ("a" if predicate == RDF_TYPE else self.iri_str(predicate))
+                + " "
+                + ", ".join(self.term_str(obj) for obj in objects)
+                for predicate, objects in properties.items()
+            )
+            + " ]"
+        )
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import hashlib
+import http.server
+import threading
+import time
+from typing import Callable, Iterator
+
+import pytest
+
+
+class LocalFileServer:
+    """Threaded local HTTP server that serves files from memory.
+
+    It supports Range requests with If-Range on the ETag of each file, and
+    can drop the connection partway through a response. It records the
+    requests it receives, the number of requests served at the same time
+    and the client connections, so that tests can check how the files are
+    downloaded.
+    """
+
+    def __init__(
+        self, chunk_size: int = 16 * 1024, chunk_delay: float = 0.0
+    ) -> None:
+        self.files: dict[str, bytes] = {}
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+
+        # 指定した番号(0始まり)のリクエストはdrop_afterバイト送信後に切断する
+        self.drop_requests: set[int] = set()
+        self.drop_after = 0
+        # 切断する前に応答を止める秒数
+        self.stall = 0.0
+
+        self.requests: list[tuple[str, dict[str, str]]] = []
+        self.connections: set[tuple[str, int]] = set()
+        self.active_requests = 0
+        self.max_active_requests = 0
+
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            # 接続を再利用できるようにする
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                server._handle(self)
+
+            def log_message(self, format, *args) -> None:
+                pass
+
+        self._httpd = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0), Handler
+        )
+        self._httpd.daemon_threads = True
+
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, daemon=True
+        )
+
+    def url(self, name: str) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_port}/{name}"
+
+    @staticmethod
+    def etag(body: bytes) -> str:
+        return f'"{hashlib.sha1(body).hexdigest()}"'
+
+    def _handle(self, handler: http.server.BaseHTTPRequestHandler) -> None:
+        name = handler.path.lstrip("/")
+
+        with self._lock:
+            index = len(self.requests)
+            self.requests.append((name, dict(handler.headers)))
+            self.connections.add(handler.client_address)
+            self.active_requests += 1
+            self.max_active_requests = max(
+                self.max_active_requests, self.active_requests
+            )
+
+        try:
+            if name not in self.files:
+                handler.send_response(404)
+                handler.send_header("Content-Length", "0")
+                handler.end_headers()
+
+                return
+
+            body = self.files[name]
+            etag = self.etag(body)
+
+            byte_range = self._requested_range(handler, etag, len(body))
+
+            if byte_range is None:
+                start, end = 0, len(body)
+
+                handler.send_response(200)
+
+            elif byte_range[0] >= len(body):
+                handler.send_response(416)
+                handler.send_header("Content-Range", f"bytes */{len(body)}")
+                handler.send_header("Content-Length", "0")
+                handler.end_headers()
+
+                return
+
+            else:
+                start, end = byte_range
+
+                handler.send_response(206)
+                handler.send_header(
+                    "Content-Range", f"bytes {start}-{end - 1}/{len(body)}"
+                )
+
+            handler.send_header("ETag", etag)
+            handler.send_header("Accept-Ranges", "bytes")
+            handler.send_header("Content-Length", str(end - start))
+            handler.end_headers()
+
+            if index in self.drop_requests:
+                # 途中まで送信して接続を切る
+                self._send_body(
+                    handler, body[start : min(start + self.drop_after, end)]
+                )
+
+                time.sleep(self.stall)
+
+                handler.close_connection = True
+
+                return
+
+            self._send_body(handler, body[start:end])
+
+        except (BrokenPipeError, ConnectionResetError):
+            # クライアントが応答の途中で接続を閉じた場合
+            handler.close_connection = True
+
+        finally:
+            with self._lock:
+                self.active_requests -= 1
+
+    @staticmethod
+    def _requested_range(
+        handler: http.server.BaseHTTPRequestHandler, etag: str, size: int
+    ) -> tuple[int, int] | None:
+        """Returns the requested byte range, or None for the whole file."""
+        range_header = handler.headers.get("Range")
+        if_range = handler.headers.get("If-Range")
+
+        # ファイルが変更されていた場合は全体を返す
+        if range_header is None or (if_range is not None and if_range != etag):
+            return None
+
+        first, last = range_header.removeprefix("bytes=").split("-")
+
+        return int(first), (min(int(last) + 1, size) if last else size)
+
+    def _send_body(
+        self, handler: http.server.BaseHTTPRequestHandler, body: bytes
+    ) -> None:
+        for start in range(0, len(body), self.chunk_size):
+            handler.wfile.write(body[start : start + self.chunk_size])
+            handler.wfile.flush()
+
+            if self.chunk_delay:
+                time.sleep(self.chunk_delay)
+
+    def __enter__(self) -> LocalFileServer:
+        self._thread.start()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def file_server() -> Iterator[LocalFileServer]:
+    with LocalFileServer() as server:
+        yield server
+
+
+# ConsensusPathDBのTSVファイルのヘッダ
+CPDB_HEADER_LINES = [
+    "#  ConsensusPathDB-human Version 35 (www.consensuspathdb.org)",
+    "#  source_databases\tinteraction_publications"
+    + "\tinteraction_participants__uniprot_entry"
+    + "\tinteraction_participants__uniprot_id"
+    + "\tinteraction_participants__genename\tinteraction_confidence",
+]
+
+# 変換結果を比較するための行
+CPDB_ROWS = [
+    "IntAct,HPRD,Spike\t25583183\tYNG5B_HUMAN,Y1A2R_HUMAN"
+    + "\tO87483,P14009\tG3,G4\t0.969",
+    "InnateDB-Curated\t39808886,38801728,26415027"
+    + "\t59OWO_HUMAN,3SB09_HUMAN,GLSHV_HUMAN"
+    + "\tP64304,P81932,Q59113\tG51,G48,G63\t0.169",
+    "Reactome\t11111111\tAB12_HUMAN\tQ12345\tG1\tNA",
+    "BioGRID,MINT\t22222222,33333333\tCD34_HUMAN,EF56_HUMAN"
+    + "\tP11111,P22222\tG2,G3\t0.5,0.7",
+    "PDB\t44444444\tGH78_HUMAN,IJ90_HUMAN\tO11111,O22222\tG4,G5\t",
+]
+
+
+@pytest.fixture
+def write_tsv(tmp_path) -> Callable[..., str]:
+    """Returns a function that writes a TSV file in the format of
+    ConsensusPathDB and returns its path."""
+
+    def write(
+        rows: list[str], file_name: str = "ConsensusPathDB_human_PPI"
+    ) -> str:
+        file_path = tmp_path / file_name
+        file_path.write_text("\n".join(CPDB_HEADER_LINES + rows) + "\n")
+
+        return str(file_path)
+
+    return write
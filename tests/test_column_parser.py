@@ -0,0 +1,105 @@
+from typing import Any
+
+import pytest
+
+from utils.column_parser import ColumnParser, infer_column_type
+
+
+def parse_field(field: str) -> str | int | float | list[Any] | None:
+    """parse_field of cpdb2jsonld before ColumnParser was introduced."""
+    if "," in field:
+        return [parse_field(sub_field) for sub_field in field.split(",")]
+
+    if field == "NA":
+        return None
+
+    try:
+        return int(field)
+
+    except ValueError:
+        try:
+            return float(field)
+
+        except ValueError:
+            return field
+
+
+FIELDS = [
+    "NA",
+    "",
+    "na",
+    "1e3",
+    "1E-3",
+    "1e",
+    "e3",
+    "-0",
+    "-0.0",
+    "+0",
+    "inf",
+    "-inf",
+    "Infinity",
+    "nan",
+    "NaN",
+    "007",
+    "00.50",
+    "0x10",
+    "1_000",
+    " 12 ",
+    "1.5",
+    ".5",
+    "5.",
+    "--1",
+    "12345678901234567890",
+    "１２",
+    "١.٥",
+    "abc",
+    "P12345",
+    "YNG5B_HUMAN",
+    "0.969,0.5",
+    "1,2.5,NA",
+    "1,,2",
+    ",",
+    "NA,NA",
+    "A,1e3,inf",
+]
+
+
+@pytest.mark.parametrize("column_type", ["auto", "int", "float", "string"])
+@pytest.mark.parametrize("field", FIELDS)
+def test_inferred_types_match_parse_field(column_type, field):
+    # 型・値ともに一致する(NaNは自身と等しくならないためreprで比較する)
+    assert repr(ColumnParser(column_type)(field)) == repr(parse_field(field))
+
+
+@pytest.mark.parametrize(
+    "fields, expected",
+    [
+        (["1", "-0", "007", "NA"], "int"),
+        (["1", "1e3"], "float"),
+        (["0.5,1", "inf"], "float"),
+        (["1", "P12345"], "string"),
+        (["NA", "NA,NA"], "auto"),
+        ([], "auto"),
+    ],
+)
+def test_infer_column_type(fields, expected):
+    assert infer_column_type(fields) == expected
+
+
+@pytest.mark.parametrize(
+    "column_type, field, expected",
+    [
+        ("string", "007", "007"),
+        ("string", "1e3,2", ["1e3", "2"]),
+        ("string", "NA", None),
+        ("iri", "123", "123"),
+        ("float", "1", 1.0),
+        ("float", "-0", -0.0),
+        ("float", "x,2", ["x", 2.0]),
+        ("int", "1e3", 1000.0),
+    ],
+)
+def test_declared_types(column_type, field, expected):
+    value = ColumnParser(column_type, declared=True)(field)
+
+    assert repr(value) == repr(expected)
@@ -0,0 +1,89 @@
+import gzip
+import os
+import random
+
+import cpdb2jsonld
+
+
+def test_exec_flow_downloads_concurrently_with_one_session(
+    file_server, tmp_path, monkeypatch
+):
+    # 同時実行が重なるよう少しずつ送信する
+    file_server.chunk_size = 4 * 1024
+    file_server.chunk_delay = 0.01
+
+    rng = random.Random(0)
+
+    contents = {
+        f"ConsensusPathDB_human_PPI_{i}.gz": rng.randbytes(64 * 1024)
+        for i in range(6)
+    }
+
+    for name, content in contents.items():
+        file_server.files[name] = gzip.compress(content)
+
+    urls_file = tmp_path / "urls.txt"
+    urls_file.write_text("\n".join(file_server.url(name) for name in contents))
+
+    sessions = []
+    create_http_session = cpdb2jsonld.create_http_session
+
+    def spy_create_http_session(max_connections):
+        session = create_http_session(max_connections)
+        sessions.append(session)
+
+        return session
+
+    download_sessions = []
+    tsv_download = cpdb2jsonld.tsv_download
+
+    def spy_tsv_download(
+        url, data_dir, skip_download, decompress, session, *args
+    ):
+        download_sessions.append(session)
+
+        return tsv_download(
+            url, data_dir, skip_download, decompress, session, *args
+        )
+
+    converted = []
+
+    monkeypatch.setattr(
+        cpdb2jsonld, "create_http_session", spy_create_http_session
+    )
+    monkeypatch.setattr(cpdb2jsonld, "tsv_download", spy_tsv_download)
+    monkeypatch.setattr(
+        cpdb2jsonld,
+        "tsv2jsonld",
+        lambda tsv_file_path, output_file_path, **kwargs: converted.append(
+            tsv_file_path
+        ),
+    )
+
+    max_downloads = 2
+
+    cpdb2jsonld.exec_flow(
+        input_urls_file=str(urls_file),
+        output_dir=str(tmp_path / "out"),
+        hide_progress=True,
+        max_downloads=max_downloads,
+    )
+
+    # 全ファイルがダウンロード・展開され、入力順に変換される
+    assert converted == [
+        str(tmp_path / "out" / os.path.splitext(name)[0]) for name in contents
+    ]
+
+    for name, content in contents.items():
+        assert (
+            tmp_path / "out" / os.path.splitext(name)[0]
+        ).read_bytes() == content
+
+    # 同時ダウンロード数の上限を守りつつ並行して取得する
+    assert 1 < file_server.max_active_requests <= max_downloads
+
+    # 1つのセッションを全ダウンロードで共有し、接続を再利用する
+    assert len(sessions) == 1
+    assert len(download_sessions) == len(contents)
+    assert all(session is sessions[0] for session in download_sessions)
+    assert len(file_server.connections) <= max_downloads
@@ -0,0 +1,87 @@
+import pytest
+
+import cpdb2jsonld
+import settings
+
+ROWS = [
+    f"IntAct,HPRD\t{10000000 + i}\tA{i:03d}_HUMAN,B{i:03d}_HUMAN"
+    + f"\tP{i:05d},Q{i:05d}\tG{i},H{i}\t0.{i:03d}"
+    for i in range(20)
+]
+
+
+def convert(tsv_file_path, output_file_path, **kwargs):
+    cpdb2jsonld.convert_tsv_file(
+        tsv_file_path,
+        output_file_path,
+        hide_progress=True,
+        jsonld_output=True,
+        chunk_size=4,
+        **kwargs,
+    )
+
+
+def read_outputs(output_dir):
+    return {
+        str(file_path.relative_to(output_dir)): file_path.read_bytes()
+        for file_path in output_dir.rglob("*")
+        if file_path.is_file()
+        and not file_path.name.endswith(settings.INCREMENTAL_INDEX_SUFFIX)
+    }
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_incremental_conversion_matches_full_run(
+    write_tsv, tmp_path, monkeypatch, workers
+):
+    output_file_path = str(tmp_path / "incremental" / "human.jsonl")
+
+    convert(
+        write_tsv(ROWS), output_file_path, workers=workers, incremental=True
+    )
+
+    # 行の変更・削除・重複・追加
+    edited_row = ROWS[3].replace("0.003", "0.5")
+    appended_rows = [
+        "Reactome\t20000000\tC001_HUMAN\tQ99999\tG99\tNA",
+        "MINT\t20000001,20000002\tC002_HUMAN,C003_HUMAN"
+        + "\tP99998,P99997\tG98,G97\t0.9",
+    ]
+
+    rows = (
+        ROWS[:3]
+        + [edited_row]
+        + ROWS[4:10]
+        + ROWS[11:]
+        + [ROWS[5]]
+        + appended_rows
+    )
+
+    tsv_file_path = write_tsv(rows)
+
+    converted_lines = []
+    convert_chunks = cpdb2jsonld.convert_chunks
+
+    def spy_convert_chunks(line_chunks, *args, **kwargs):
+        def iter_line_chunks():
+            for lines in line_chunks:
+                converted_lines.extend(lines)
+
+                yield lines
+
+        return convert_chunks(iter_line_chunks(), *args, **kwargs)
+
+    monkeypatch.setattr(cpdb2jsonld, "convert_chunks", spy_convert_chunks)
+
+    convert(tsv_file_path, output_file_path, workers=workers, incremental=True)
+
+    # 変更・追加された行のみ変換する
+    assert [line.rstrip("\n") for line in converted_lines] == [
+        edited_row
+    ] + appended_rows
+
+    convert(tsv_file_path, str(tmp_path / "full" / "human.jsonl"))
+
+    assert read_outputs(tmp_path / "incremental") == read_outputs(
+        tmp_path / "full"
+    )
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from utils.json_serializer import JsonSerializer, OrjsonSerializer, orjson
+
+SERIALIZERS = [
+    pytest.param(JsonSerializer, id="json"),
+    pytest.param(
+        OrjsonSerializer,
+        id="orjson",
+        marks=pytest.mark.skipif(
+            orjson is None, reason="orjson is not installed"
+        ),
+    ),
+]
+
+VALUES = {
+    "non_ascii": {"é": "日本語 é ß \U0001f600", "label": "naïve"},
+    "control_characters": ["\x00\x01\x1f\x7f", '"quoted" \\ / \n\r\t\b\f'],
+    "line_separators": {"text": "line\u2028separator\u2029paragraph"},
+    "nan_and_infinity": [
+        float("nan"),
+        float("inf"),
+        -float("inf"),
+        {"x": float("nan")},
+    ],
+    "exponent_floats": [
+        1e-05,
+        1e-07,
+        5e-324,
+        -2.5e-10,
+        1e16,
+        1.5e300,
+        0.0001,
+        1e15,
+    ],
+    "big_integers": [
+        2**64,
+        2**100,
+        -(2**63) - 1,
+        -(2**64),
+        2**63 - 1,
+        -(2**63),
+    ],
+    "int_keys": {2: "two", 1: "one", 10: {"nested": True}},
+    "float_keys": {2.5: "a", 1.5: "b", 1e-07: "c"},
+    "bool_keys": {True: 1, False: [None]},
+    "none_key": {None: {"a": 1}},
+    "nested_dicts": {
+        "b": {"d": {"f": [1, {"h": None, "g": 1e-07}], "e": "é"}, "c": []},
+        "a": {"": {}, "z": {"y": {"x": 2**64}}},
+        "@id": "cpdb:A-B",
+    },
+    "empty": [{}, [], ""],
+}
+
+
+@pytest.mark.parametrize("serializer_class", SERIALIZERS)
+@pytest.mark.parametrize("value", VALUES.values(), ids=VALUES.keys())
+def test_dumps_line(serializer_class, value):
+    assert serializer_class().dumps_line(value) == json.dumps(
+        value, sort_keys=True
+    )
+
+
+@pytest.mark.parametrize("serializer_class", SERIALIZERS)
+@pytest.mark.parametrize("value", VALUES.values(), ids=VALUES.keys())
+@pytest.mark.parametrize("sort_keys", [False, True])
+@pytest.mark.parametrize("compact", [False, True])
+def test_dumps_document(serializer_class, value, sort_keys, compact):
+    expected = json.dumps(
+        value,
+        ensure_ascii=False,
+        indent=None if compact else 2,
+        separators=(",", ":") if compact else None,
+        sort_keys=sort_keys,
+    )
+
+    assert (
+        serializer_class().dumps_document(value, sort_keys, compact)
+        == expected
+    )
+
+
+@pytest.mark.parametrize("serializer_class", SERIALIZERS)
+@pytest.mark.parametrize("value", VALUES.values(), ids=VALUES.keys())
+@pytest.mark.parametrize("ensure_ascii", [False, True])
+def test_loads(serializer_class, value, ensure_ascii):
+    json_str = json.dumps(value, ensure_ascii=ensure_ascii)
+
+    loaded = serializer_class().loads(json_str)
+
+    # NaNは自身と等しくならないため、書き直した文字列で型と値を比較する
+    assert json.dumps(loaded) == json.dumps(json.loads(json_str))
@@ -0,0 +1,56 @@
+import cpdb2jsonld
+from conftest import CPDB_ROWS
+
+# コンパイル済みエミッタでは変換できず、pyldで変換される行
+# (数値でないconfidenceは相対IRIとなり、pyldのbase解決に依存する)
+FALLBACK_ROW = "IntAct\t55555555\tKL12_HUMAN\tQ55555\tG6\tunknown"
+
+
+def convert(tsv_file_path, output_file_path, use_pyld):
+    cpdb2jsonld.convert_tsv_file(
+        tsv_file_path,
+        output_file_path,
+        hide_progress=True,
+        jsonld_output=True,
+        use_pyld=use_pyld,
+    )
+
+    with open(output_file_path, "rb") as f:
+        return f.read()
+
+
+def test_emitter_output_matches_pyld(write_tsv, tmp_path, monkeypatch):
+    tsv_file_path = write_tsv(CPDB_ROWS + [FALLBACK_ROW])
+
+    fallback_records = []
+    convert_to_jsonld = cpdb2jsonld.convert_to_jsonld
+
+    def spy_convert_to_jsonld(json_record, context):
+        fallback_records.append(json_record["@id"])
+
+        return convert_to_jsonld(json_record, context)
+
+    monkeypatch.setattr(
+        cpdb2jsonld, "convert_to_jsonld", spy_convert_to_jsonld
+    )
+
+    emitter_output = convert(
+        tsv_file_path, str(tmp_path / "emitter" / "human.jsonl"), False
+    )
+
+    # エミッタで変換できない行のみpyldで変換する
+    assert fallback_records == ["cpdb:KL12_HUMAN"]
+
+    pyld_output = convert(
+        tsv_file_path, str(tmp_path / "pyld" / "human.jsonl"), True
+    )
+
+    assert emitter_output == pyld_output
+    assert len(emitter_output.splitlines()) == len(CPDB_ROWS) + 1
+
+    # JSON-LDファイルも一致する
+    assert (
+        tmp_path / "emitter" / "human_jsonld" / "human.jsonld_001.jsonld"
+    ).read_bytes() == (
+        tmp_path / "pyld" / "human_jsonld" / "human.jsonld_001.jsonld"
+    ).read_bytes()
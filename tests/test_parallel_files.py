@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+
+import cpdb2jsonld
+
+
+@pytest.mark.parametrize(
+    "file_sizes, total_workers, expected",
+    [
+        ([300, 200, 100], 6, [3, 2, 1]),
+        ([900, 50, 50], 4, [2, 1, 1]),
+        ([300, 200, 100], 2, [1, 1, 1]),
+        ([0, 0], 3, [2, 1]),
+    ],
+)
+def test_allocate_workers(file_sizes, total_workers, expected):
+    assert cpdb2jsonld.allocate_workers(file_sizes, total_workers) == expected
+
+
+@pytest.mark.parametrize(
+    "allocations, total_workers, expected",
+    [
+        ([3, 2, 1], 6, 3),
+        ([1, 1, 1], 2, 2),
+        ([1, 1, 1], 1, 1),
+        ([4], 2, 1),
+    ],
+)
+def test_max_concurrent_jobs(allocations, total_workers, expected):
+    assert (
+        cpdb2jsonld.max_concurrent_jobs(allocations, total_workers) == expected
+    )
+
+
+@pytest.mark.parametrize("total_workers", [1, 2, 4, 8])
+def test_convert_files_in_parallel_respects_total_workers(
+    tmp_path, monkeypatch, total_workers
+):
+    conversion_jobs = []
+
+    for i, size in enumerate([4000, 3000, 2000, 1000]):
+        input_file_path = tmp_path / f"input_{i}.tsv"
+        input_file_path.write_bytes(b"x" * size)
+
+        conversion_jobs.append(
+            (str(input_file_path), str(tmp_path / f"out_{i}"))
+        )
+
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+    used_workers = 0
+    max_used_workers = 0
+    converted = []
+
+    def fake_convert_tsv_file(
+        input_file_path, output_file_path, workers, **kwargs
+    ):
+        nonlocal running, max_running, used_workers, max_used_workers
+
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+            used_workers += workers
+            max_used_workers = max(max_used_workers, used_workers)
+
+        time.sleep(0.05)
+
+        with lock:
+            running -= 1
+            used_workers -= workers
+            converted.append(input_file_path)
+
+    monkeypatch.setattr(cpdb2jsonld, "convert_tsv_file", fake_convert_tsv_file)
+
+    cpdb2jsonld.convert_files_in_parallel(
+        conversion_jobs, total_workers=total_workers, hide_progress=True
+    )
+
+    # 全ファイルを変換し、同時に使うプロセス数はtotal_workersを超えない
+    assert sorted(converted) == sorted(job[0] for job in conversion_jobs)
+    assert max_used_workers <= total_workers
+    assert max_running == min(total_workers, len(conversion_jobs))
@@ -0,0 +1,71 @@
+import pytest
+
+import cpdb2jsonld
+from conftest import CPDB_ROWS
+
+# IRIに空白を含むためコンパイル済みエミッタでは変換できず、pyldで変換される行
+FALLBACK_ROW = "Foo Bar\t55555555\tKL12_HUMAN\tQ55555\tG6\t1"
+
+
+def convert(tsv_file_path, output_file_path, output_format, use_pyld):
+    cpdb2jsonld.convert_tsv_file(
+        tsv_file_path,
+        output_file_path,
+        hide_progress=True,
+        use_pyld=use_pyld,
+        output_format=output_format,
+    )
+
+    with open(output_file_path, "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize(
+    "output_format, extension", [("ntriples", ".nt"), ("nquads", ".nq")]
+)
+def test_direct_rdf_output_matches_pyld(
+    write_tsv, tmp_path, monkeypatch, output_format, extension
+):
+    tsv_file_path = write_tsv(CPDB_ROWS + [FALLBACK_ROW])
+
+    fallback_nodes = []
+    convert_to_rdf_triples = cpdb2jsonld.convert_to_rdf_triples
+
+    def spy_convert_to_rdf_triples(node, context, blank_node_prefix):
+        fallback_nodes.append(node["@id"])
+
+        return convert_to_rdf_triples(node, context, blank_node_prefix)
+
+    monkeypatch.setattr(
+        cpdb2jsonld, "convert_to_rdf_triples", spy_convert_to_rdf_triples
+    )
+
+    direct_output = convert(
+        tsv_file_path,
+        str(tmp_path / "direct" / f"human{extension}"),
+        output_format,
+        False,
+    )
+
+    # エミッタで変換できない行のみpyldで変換する
+    assert fallback_nodes == ["cpdb:KL12_HUMAN"]
+
+    # --use-pyldではpyldのto_rdf()で全ての行を変換する
+    pyld_output = convert(
+        tsv_file_path,
+        str(tmp_path / "pyld" / f"human{extension}"),
+        output_format,
+        True,
+    )
+
+    assert len(fallback_nodes) == len(CPDB_ROWS) + 2
+
+    # トリプルの順序のみ異なり、空白ノードのラベルも含めて一致する
+    direct_lines = direct_output.splitlines()
+
+    assert sorted(direct_lines) == sorted(pyld_output.splitlines())
+    assert len(set(direct_lines)) == len(direct_lines)
+
+    if output_format == "nquads":
+        # data_sourceごとの名前付きグラフに出力する
+        assert b" <http://identifiers.org/intact> .\n" in direct_output
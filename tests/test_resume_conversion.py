@@ -0,0 +1,111 @@
+import os
+
+import pytest
+
+import cpdb2jsonld
+import settings
+
+# 複数のチャンク・バイト範囲に分かれる行
+ROWS = [
+    f"IntAct,HPRD\t{10000000 + i}\tA{i:03d}_HUMAN,B{i:03d}_HUMAN"
+    + f"\tP{i:05d},Q{i:05d}\tG{i},H{i}\t0.{i:03d}"
+    for i in range(40)
+]
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def checkpoint_every_chunk(monkeypatch):
+    monkeypatch.setattr(settings, "CHECKPOINT_INTERVAL", 0)
+
+
+def convert(tsv_file_path, output_file_path, **kwargs):
+    cpdb2jsonld.convert_tsv_file(
+        tsv_file_path,
+        output_file_path,
+        hide_progress=True,
+        jsonld_output=True,
+        chunk_size=4,
+        chunk_bytes=300,
+        **kwargs,
+    )
+
+
+def read_outputs(output_dir):
+    return {
+        str(file_path.relative_to(output_dir)): file_path.read_bytes()
+        for file_path in output_dir.rglob("*")
+        if file_path.is_file()
+    }
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        pytest.param({}, id="plain"),
+        pytest.param({"mmap": True}, id="mmap"),
+        pytest.param({"workers": 2}, id="workers"),
+    ],
+)
+def test_resumed_conversion_matches_full_run(
+    write_tsv, tmp_path, monkeypatch, options
+):
+    tsv_file_path = write_tsv(ROWS)
+
+    convert(tsv_file_path, str(tmp_path / "full" / "human.jsonl"), **options)
+
+    output_file_path = str(tmp_path / "resumed" / "human.jsonl")
+
+    write_converted_chunk = cpdb2jsonld.write_converted_chunk
+    written_chunks = 0
+
+    def interrupted_write_converted_chunk(*args):
+        nonlocal written_chunks
+
+        write_converted_chunk(*args)
+        written_chunks += 1
+
+        # チェックポイントより後の出力を書き込んだ状態で中断する
+        if written_chunks == 3:
+            raise Interrupted()
+
+    with monkeypatch.context() as m:
+        m.setattr(
+            cpdb2jsonld,
+            "write_converted_chunk",
+            interrupted_write_converted_chunk,
+        )
+
+        with pytest.raises(Interrupted):
+            convert(tsv_file_path, output_file_path, resume=True, **options)
+
+    checkpoint_file_path = output_file_path + settings.CHECKPOINT_SUFFIX
+
+    assert os.path.exists(checkpoint_file_path)
+
+    converted_lines = []
+    lines_to_jsonld_lines_str = cpdb2jsonld.lines_to_jsonld_lines_str
+
+    def spy_lines_to_jsonld_lines_str(input_lines, plan):
+        output = lines_to_jsonld_lines_str(input_lines, plan)
+        converted_lines.extend(output.splitlines())
+
+        return output
+
+    monkeypatch.setattr(
+        cpdb2jsonld, "lines_to_jsonld_lines_str", spy_lines_to_jsonld_lines_str
+    )
+
+    convert(tsv_file_path, output_file_path, resume=True, **options)
+
+    assert read_outputs(tmp_path / "resumed") == read_outputs(
+        tmp_path / "full"
+    )
+    assert not os.path.exists(checkpoint_file_path)
+
+    # ワーカープロセスで変換した行は数えられない
+    if "workers" not in options:
+        assert 0 < len(converted_lines) < len(ROWS)
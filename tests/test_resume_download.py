@@ -0,0 +1,188 @@
+import os
+import random
+import time
+
+import pytest
+
+import cpdb2jsonld
+import settings
+
+FILE_NAME = "ConsensusPathDB_human_PPI.gz"
+
+
+@pytest.fixture
+def content():
+    return random.Random(0).randbytes(200 * 1024)
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    # 切断前に受信したデータが書き込まれるよう小さく読み込む
+    monkeypatch.setattr(settings, "DOWNLOAD_CHUNK_SIZE", 4 * 1024)
+
+
+def write_partial_download(file_path, data, etag, size):
+    part_file_path = f"{file_path}.part"
+
+    with open(part_file_path, "wb") as f:
+        f.write(data)
+
+    cpdb2jsonld.save_partial_download(
+        part_file_path,
+        {"etag": etag, "last_modified": None, "content_length": size},
+        False,
+    )
+
+
+def assert_download_completed(file_path, content):
+    with open(file_path, "rb") as f:
+        assert f.read() == content
+
+    assert not os.path.exists(f"{file_path}.part")
+    assert not os.path.exists(f"{file_path}.part.json")
+
+
+def test_resume_partial_download(file_server, tmp_path, content):
+    file_server.files[FILE_NAME] = content
+
+    file_path = str(tmp_path / FILE_NAME)
+
+    write_partial_download(
+        file_path, content[:70000], file_server.etag(content), len(content)
+    )
+
+    assert cpdb2jsonld.download_file(file_server.url(FILE_NAME), file_path)
+
+    # 途中までのファイルの続きのみを取得する
+    [(_, headers)] = file_server.requests
+
+    assert headers["Range"] == "bytes=70000-"
+    assert headers["If-Range"] == file_server.etag(content)
+
+    assert_download_completed(file_path, content)
+
+
+def test_resume_after_dropped_connection(file_server, tmp_path, content):
+    file_server.files[FILE_NAME] = content
+    file_server.drop_requests = {0}
+    file_server.drop_after = 50000
+
+    file_path = str(tmp_path / FILE_NAME)
+
+    assert cpdb2jsonld.download_file(file_server.url(FILE_NAME), file_path)
+
+    # 切断された位置から再開する
+    assert len(file_server.requests) == 2
+    assert "Range" not in file_server.requests[0][1]
+
+    resumed_from = int(
+        file_server.requests[1][1]["Range"].removeprefix("bytes=").rstrip("-")
+    )
+
+    assert 0 < resumed_from <= 50000
+
+    assert_download_completed(file_path, content)
+
+
+def test_resume_after_timeout(file_server, tmp_path, content, monkeypatch):
+    monkeypatch.setattr(settings, "DOWNLOAD_TIMEOUT", (5, 0.2))
+
+    file_server.files[FILE_NAME] = content
+    file_server.drop_requests = {0}
+    file_server.drop_after = 50000
+    file_server.stall = 30.0
+
+    file_path = str(tmp_path / FILE_NAME)
+
+    started = time.monotonic()
+
+    assert cpdb2jsonld.download_file(file_server.url(FILE_NAME), file_path)
+
+    # 接続が切られるのを待たずに、応答が止まった位置から再開する
+    assert time.monotonic() - started < 10
+    assert len(file_server.requests) == 2
+    assert "Range" in file_server.requests[1][1]
+
+    assert_download_completed(file_path, content)
+
+
+def test_restart_when_remote_file_changed(file_server, tmp_path, content):
+    old_content = content[::-1]
+
+    file_server.files[FILE_NAME] = content
+
+    file_path = str(tmp_path / FILE_NAME)
+
+    write_partial_download(
+        file_path,
+        old_content[:70000],
+        file_server.etag(old_content),
+        len(content),
+    )
+
+    assert cpdb2jsonld.download_file(file_server.url(FILE_NAME), file_path)
+
+    # If-Rangeが一致しないため全体が200で返され、最初から書き直す
+    [(_, headers)] = file_server.requests
+
+    assert headers["If-Range"] == file_server.etag(old_content)
+
+    assert_download_completed(file_path, content)
+
+
+def test_complete_on_range_not_satisfiable(file_server, tmp_path, content):
+    file_server.files[FILE_NAME] = content
+
+    file_path = str(tmp_path / FILE_NAME)
+
+    write_partial_download(
+        file_path, content, file_server.etag(content), len(content)
+    )
+
+    cache = cpdb2jsonld.DownloadMetadataCache(str(tmp_path / "cache.json"))
+
+    assert cpdb2jsonld.download_file(
+        file_server.url(FILE_NAME), file_path, download_cache=cache
+    )
+
+    # 末尾まで取得済みのため416が返され、そのまま完了とする
+    [(_, headers)] = file_server.requests
+
+    assert headers["Range"] == f"bytes={len(content)}-"
+
+    assert_download_completed(file_path, content)
+
+    assert cache.get(file_server.url(FILE_NAME))["etag"] == file_server.etag(
+        content
+    )
+
+
+@pytest.mark.parametrize("segments", [2, 3, 4])
+def test_segmented_download(
+    file_server, tmp_path, content, monkeypatch, segments
+):
+    monkeypatch.setattr(settings, "DOWNLOAD_SEGMENT_MIN_SIZE", 1024)
+
+    file_server.files[FILE_NAME] = content
+
+    # 分割された範囲の1つを途中で切断する
+    file_server.drop_requests = {1}
+    file_server.drop_after = 10000
+
+    file_path = str(tmp_path / FILE_NAME)
+
+    with cpdb2jsonld.create_http_session(segments) as session:
+        assert cpdb2jsonld.download_file(
+            file_server.url(FILE_NAME), file_path, session, segments=segments
+        )
+
+    # 最初の要求の後、各範囲をIf-Range付きで要求する
+    range_requests = [headers for _, headers in file_server.requests[1:]]
+
+    assert len(range_requests) == segments + 1
+    assert all(
+        headers["If-Range"] == file_server.etag(content)
+        for headers in range_requests
+    )
+
+    assert_download_completed(file_path, content)
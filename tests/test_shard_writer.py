@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+import cpdb2jsonld
+from conftest import CPDB_ROWS
+from utils.shard_manifest import ShardManifest, read_shard_paths
+from utils.shard_writer import TextShardWriter
+
+
+def write_shards(tmp_path, records, max_file_size):
+    manifest_file_path = str(tmp_path / "out.manifest.json")
+
+    # 前回の一覧は新しい一覧を開くと削除されるため先に読み込む
+    previous_shard_paths = read_shard_paths(manifest_file_path)
+
+    with ShardManifest(manifest_file_path) as manifest:
+        with TextShardWriter(
+            str(tmp_path / "out"),
+            ".nt",
+            max_file_size,
+            lambda file_path: open(file_path, "w"),
+            shard_written=manifest.add_shard,
+            previous_shard_paths=previous_shard_paths,
+        ) as writer:
+            writer.write_items(records)
+
+    with open(manifest_file_path) as f:
+        return json.load(f)
+
+
+def test_previous_shards_in_manifest_are_removed(tmp_path):
+    # 前回の出力は今回より多くのファイルに分割されていた
+    write_shards(tmp_path, [f"line {i}\n" for i in range(10)], 14)
+
+    assert len(list(tmp_path.glob("out_*.nt"))) == 5
+
+    (tmp_path / "out_1000.nt").write_text("not listed\n")
+    (tmp_path / "other_001.nt").write_text("other\n")
+    (tmp_path / "out_001.ttl").write_text("other format\n")
+
+    manifest = write_shards(tmp_path, [f"line {i}\n" for i in range(4)], 14)
+
+    # 今回のファイルのみが残り、一覧にも今回のファイルのみが記載される
+    assert sorted(path.name for path in tmp_path.glob("out_0*.nt")) == [
+        "out_001.nt",
+        "out_002.nt",
+    ]
+    assert [shard["path"] for shard in manifest["shards"]] == [
+        "out_001.nt",
+        "out_002.nt",
+    ]
+    assert [shard["records"] for shard in manifest["shards"]] == [2, 2]
+
+    # 前回の一覧にないファイルは削除しない
+    assert (tmp_path / "out_1000.nt").exists()
+    assert (tmp_path / "other_001.nt").exists()
+    assert (tmp_path / "out_001.ttl").exists()
+
+
+def test_previous_shards_without_manifest_are_removed(tmp_path):
+    for i in [1, 2, 3, 4, 6]:
+        (tmp_path / f"out_{i:03}.nt").write_text("previous\n")
+
+    (tmp_path / "out_2023.nt").write_text("other\n")
+
+    with TextShardWriter(
+        str(tmp_path / "out"),
+        ".nt",
+        14,
+        lambda file_path: open(file_path, "w"),
+    ) as writer:
+        writer.write_items([f"line {i}\n" for i in range(4)])
+
+    # 連番の途切れるまでを前回の出力として削除する
+    assert sorted(path.name for path in tmp_path.glob("out_*.nt")) == [
+        "out_001.nt",
+        "out_002.nt",
+        "out_006.nt",
+        "out_2023.nt",
+    ]
+    assert (tmp_path / "out_001.nt").read_text() == "line 0\nline 1\n"
+
+
+@pytest.mark.parametrize("manifest", [False, True])
+def test_sharded_conversion_keeps_unrelated_files(
+    write_tsv, tmp_path, manifest
+):
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+
+    # 分割ファイルと似た名前の利用者のファイル
+    (output_dir / "cpdb_2023.jsonl").write_text("user data\n")
+
+    for rows in [CPDB_ROWS, CPDB_ROWS[:2]]:
+        cpdb2jsonld.convert_tsv_file(
+            write_tsv(rows),
+            str(output_dir / "cpdb.jsonl"),
+            hide_progress=True,
+            max_file_size=1,
+            manifest=manifest,
+        )
+
+    assert sorted(path.name for path in output_dir.glob("cpdb_*.jsonl")) == [
+        "cpdb_001.jsonl",
+        "cpdb_002.jsonl",
+        "cpdb_2023.jsonl",
+    ]
+    assert (output_dir / "cpdb_2023.jsonl").read_text() == "user data\n"
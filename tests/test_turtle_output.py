@@ -0,0 +1,43 @@
+from rdflib import Graph
+from rdflib.compare import isomorphic
+
+import cpdb2jsonld
+from conftest import CPDB_ROWS
+
+# prefix名で書けないローカル名 (括弧や末尾の"."を含む)
+ESCAPED_ROW = "DIP.\t5555-5555.\tKL(1)_HUMAN,MN.2_HUMAN\tQ(5),P5.\tG6,G7\t1e3"
+
+
+def convert(tsv_file_path, output_file_path, output_format):
+    cpdb2jsonld.convert_tsv_file(
+        tsv_file_path,
+        output_file_path,
+        hide_progress=True,
+        output_format=output_format,
+    )
+
+    with open(output_file_path, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_turtle_output_matches_ntriples(write_tsv, tmp_path):
+    tsv_file_path = write_tsv(CPDB_ROWS + [ESCAPED_ROW])
+
+    turtle = convert(tsv_file_path, str(tmp_path / "human.ttl"), "turtle")
+    ntriples = convert(tsv_file_path, str(tmp_path / "human.nt"), "ntriples")
+
+    # evidenceの空白ノードは主語のブロック内に[ ]で書く
+    assert "[" in turtle
+    assert "_:" not in turtle
+
+    # prefixが一致してもローカル名として書けないIRIはIRI参照で書く
+    assert "<http://med2rdf.org/dataset/cpdb/KL(1)_HUMAN-MN.2_HUMAN>" in turtle
+    assert "<http://identifiers.org/uniprot/Q(5)>" in turtle
+    assert "<http://identifiers.org/uniprot/P5.>" in turtle
+    assert "<http://rdf.ncbi.nlm.nih.gov/pubmed/5555-5555.>" in turtle
+
+    turtle_graph = Graph().parse(data=turtle, format="turtle")
+    ntriples_graph = Graph().parse(data=ntriples, format="nt")
+
+    assert len(turtle_graph) == len(ntriples_graph)
+    assert isomorphic(turtle_graph, ntriples_graph)